@@ -21,6 +21,26 @@ celery_app.conf.update(
     task_track_started=True,
     result_extended=True,
     worker_prefetch_multiplier=1,
+    beat_schedule={
+        # re-query stale cached data, see queries/cache_refresh.py
+        "cache-refresh": {
+            "task": "queries.cache_refresh.cache_refresh",
+            "schedule": float(os.getenv("CACHE_REFRESH_INTERVAL", "3600")),  # seconds
+            "options": {"queue": "data"},
+        },
+        # keep the cache within its size budget, see queries/cache_evict.py
+        "cache-evict": {
+            "task": "queries.cache_evict.cache_evict",
+            "schedule": float(os.getenv("CACHE_EVICT_INTERVAL", "3600")),  # seconds
+            "options": {"queue": "data"},
+        },
+        # collect popular repos' data ahead of users' requests, see queries/cache_prewarm.py
+        "cache-prewarm": {
+            "task": "queries.cache_prewarm.cache_prewarm",
+            "schedule": float(os.getenv("CACHE_PREWARM_INTERVAL", "900")),  # seconds
+            "options": {"queue": "data"},
+        },
+    },
 )
 
 celery_manager = CeleryManager(celery_app=celery_app)
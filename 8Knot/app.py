@@ -48,6 +48,9 @@ augur.multiselect_startup()
 
 """IMPORT AFTER GLOBAL VARIABLES SET"""
 import pages.index.index_callbacks as index_callbacks
+import queries.cache_refresh
+import queries.cache_evict
+import queries.cache_prewarm
 
 
 """SET STYLING FOR APPLICATION"""
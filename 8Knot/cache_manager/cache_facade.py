@@ -20,102 +20,685 @@ typically have available.
 We're not experts in the field of ORMs and DB drivers, and would be
 happy to be proven wrong about the apparent performance tradeoff.
 """
+import os
+import time
 import logging
+import select
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
 from uuid import uuid4
+from typing import Callable
 import psycopg2 as pg
 from psycopg2.extras import execute_values
 from psycopg2 import sql as pg_sql
+from psycopg2.extensions import encodings as pg_encodings, TRANSACTION_STATUS_IDLE
+from psycopg2.pool import PoolError
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import redis
 
 # requires relative import syntax "import .cx_common" because
 # other files importing cache_facade need to know how to resolve
 # .cx_common- interpreter is invoked at a higher level, so relative
 # import required.
-from .cx_common import db_cx_string, env_augur_schema, cache_cx_string
+from .cx_common import (
+    db_cx_string,
+    env_augur_schema,
+    cache_cx_string,
+    env_ingest_mode,
+    env_read_mode,
+    env_pool_max,
+    env_pool_timeout,
+    env_pool_ping_after,
+    env_frame_cache_bytes,
+    env_hot_tier,
+    env_hot_max_bytes,
+    env_hot_ttl,
+    env_hot_max_blob_bytes,
+    env_grouped_extraction,
+)
+from .frame_cache import FrameCache
+from .cache_manager import CacheManager
+from .rollups import ROLLUPS, ROLLUP_SOURCES
+from .extracts import EXTRACTS, EXTRACT_GROUPS
+from .eviction import lock_entries
 
 
-def cache_query_results(
+class _ConnectionPool:
+    """
+    Process-local pool of connections to the cache database.
+
+    Connections are created lazily up to {maxconn}. When all connections
+    are checked out, callers wait up to {timeout} seconds for one to be returned.
+
+    Connections are health-checked on checkout (closed connections are
+    discarded; connections idle for longer than {ping_after} seconds are
+    pinged) and on return (broken or mid-transaction connections are
+    rolled back or discarded).
+
+    Fork-safe: Celery prefork workers inherit the parent's pool. A child
+    must never use or close the parent's sockets, so after a fork the
+    inherited connections are set aside and the child starts empty.
+    """
+
+    def __init__(self, dsn: str, maxconn: int, timeout: float, ping_after: float):
+        self._dsn = dsn
+        self._maxconn = maxconn
+        self._timeout = timeout
+        self._ping_after = ping_after
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        # (connection, time it was returned to the pool)
+        self._idle: list[tuple] = []
+        self._n_open = 0
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+            "creations": 0,
+            "discards": 0,
+        }
+
+    def _after_fork(self):
+        """
+        Called in the child process after a fork. Connections inherited from
+        the parent are kept referenced but never used, because garbage collecting
+        them would send a terminate message on the parent's sockets.
+        """
+        _inherited_connections.extend(c for c, _ in self._idle)
+        self._reset()
+
+    def _check_pid(self):
+        # fallback for forks that don't run at-fork handlers.
+        if os.getpid() != self._pid:
+            self._after_fork()
+
+    def _connect(self):
+        conn = pg.connect(self._dsn)
+        self._stats["creations"] += 1
+        return conn
+
+    def _discard(self, conn):
+        self._stats["discards"] += 1
+        self._n_open -= 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _healthy(self, conn, idle_since: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self._ping_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except pg.Error:
+            return False
+
+    def getconn(self):
+        """
+        Checks a connection out of the pool, waiting for one to be
+        returned if {maxconn} are already in use.
+
+        Raises:
+            psycopg2.pool.PoolError: if no connection becomes available within {timeout}.
+        """
+        self._check_pid()
+        wait_start = None
+        with self._cond:
+            self._stats["checkouts"] += 1
+
+        while True:
+            conn = None
+            with self._cond:
+                while not self._idle and self._n_open >= self._maxconn:
+                    if wait_start is None:
+                        wait_start = time.monotonic()
+                        self._stats["waits"] += 1
+                    remaining = self._timeout - (time.monotonic() - wait_start)
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        self._stats["timeouts"] += 1
+                        raise PoolError(f"no cache connection available after {self._timeout}s")
+
+                if wait_start is not None:
+                    self._stats["wait_seconds"] += time.monotonic() - wait_start
+                    wait_start = None
+
+                if self._idle:
+                    # reuse the most recently returned connection first.
+                    conn, idle_since = self._idle.pop()
+                else:
+                    # reserve the slot before connecting so the lock isn't
+                    # held during the TCP + auth handshake.
+                    self._n_open += 1
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._cond:
+                        self._n_open -= 1
+                        self._cond.notify()
+                    raise
+
+            # health check outside of the lock, it might touch the network.
+            if self._healthy(conn, idle_since):
+                return conn
+
+            with self._cond:
+                self._discard(conn)
+                self._cond.notify()
+
+    def putconn(self, conn):
+        """
+        Returns a connection to the pool. Connections that are broken, or
+        that can't be rolled back to an idle state, are closed instead.
+        """
+        if os.getpid() != self._pid:
+            # checked out before a fork, belongs to the parent.
+            return
+
+        healthy = not conn.closed
+        if healthy and conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except pg.Error:
+                healthy = False
+
+        with self._cond:
+            if healthy:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._discard(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """
+        Context manager with the same transaction semantics as
+        "with psycopg2.connect(...) as conn": commits on success,
+        rolls back on exception. The connection goes back to the pool
+        instead of being left open.
+        """
+        conn = self.getconn()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.putconn(conn)
+
+    def stats(self) -> dict:
+        """
+        Snapshot of pool counters, for sizing CACHE_POOL_MAX.
+        """
+        self._check_pid()
+        with self._cond:
+            return {
+                **self._stats,
+                "open": self._n_open,
+                "idle": len(self._idle),
+                "in_use": self._n_open - len(self._idle),
+                "max": self._maxconn,
+            }
+
+
+# connections inherited across a fork. Never used, only kept alive. See _ConnectionPool._after_fork.
+_inherited_connections = []
+
+# minimum time between writes of a bookkeeping row's last_accessed time.
+_TOUCH_INTERVAL = timedelta(minutes=5)
+
+# recently retrieved DataFrames, shared by every retrieve_from_cache call in this process.
+_frame_cache = FrameCache(max_bytes=env_frame_cache_bytes)
+
+# Redis hot tier of per-(tablename, repo) Arrow blobs, shared by every process. None if disabled.
+_hot_tier = (
+    CacheManager(max_bytes=env_hot_max_bytes, ttl=env_hot_ttl, max_blob_bytes=env_hot_max_blob_bytes)
+    if env_hot_tier
+    else None
+)
+
+# pool of connections to the cache db shared by every function in this module.
+_cache_pool = _ConnectionPool(
+    dsn=cache_cx_string,
+    maxconn=env_pool_max,
+    timeout=env_pool_timeout,
+    ping_after=env_pool_ping_after,
+)
+os.register_at_fork(after_in_child=_cache_pool._after_fork)
+
+
+def cache_pool_stats() -> dict:
+    """
+    Returns counters for this process' cache connection pool:
+    checkouts, waits (checkouts that had to wait for a free connection),
+    wait_seconds, timeouts, creations, discards, and open/idle/in_use counts.
+    """
+    return _cache_pool.stats()
+
+
+class _CountingReader:
+    """
+    File-like wrapper around the read-end of the COPY pipe.
+    Counts the bytes that pass through so that the streaming
+    ingest mode can report its throughput.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self.nbytes = 0
+
+    def read(self, size=-1):
+        b = self._f.read(size)
+        self.nbytes += len(b)
+        return b
+
+    def readline(self, size=-1):
+        b = self._f.readline(size)
+        self.nbytes += len(b)
+        return b
+
+
+class _CopyOutPipe:
+    """
+    Runs a "COPY ... TO STDOUT" statement on {conn} in a helper thread
+    and exposes its output as the read-end of an OS pipe.
+
+    Used as a context manager. On exit the read-end is closed, the
+    helper thread is joined, and an error raised by the COPY is re-raised
+    if the body of the block didn't already fail.
+    """
+
+    def __init__(self, conn, copy_sql, name: str):
+        self._conn = conn
+        self._copy_sql = copy_sql
+        self._errors = []
+        read_fd, write_fd = os.pipe()
+        self._reader = os.fdopen(read_fd, "rb")
+        self._writer = os.fdopen(write_fd, "wb")
+        self._thread = threading.Thread(target=self._produce, name=name, daemon=True)
+
+    def _produce(self):
+        try:
+            with self._conn.cursor() as cur:
+                cur.copy_expert(self._copy_sql, self._writer)
+        except BaseException as e:
+            self._errors.append(e)
+        finally:
+            # closing write-end signals EOF to the reading side.
+            try:
+                self._writer.close()
+            except OSError:
+                # read-end already closed by a failed reader.
+                pass
+
+    def __enter__(self):
+        self._thread.start()
+        return self._reader
+
+    def __exit__(self, exc_type, exc, tb):
+        # if the reader failed early, closing the read-end unblocks
+        # the producer with a broken pipe instead of a hang.
+        self._reader.close()
+        self._thread.join()
+
+        if exc_type is None and self._errors:
+            # EOF was reached because the COPY failed, data read is incomplete.
+            raise self._errors[0]
+        return False
+
+
+def _stream_rows_copy(augur_conn, cache_conn, query: str, vars: tuple[tuple], target_table: str) -> tuple[int, int]:
+    """Streams the results of {query} from Augur into {target_table} with
+    COPY (query) TO STDOUT -> COPY target_table FROM STDIN.
+
+    Bytes are handed from one connection to the other through an OS pipe,
+    so rows are never materialized as Python objects. The Augur side runs in
+    a helper thread, the cache side runs in the calling thread.
+
+    Args:
+        augur_conn (psycopg2.connection): connection to primary database
+        cache_conn (psycopg2.connection): connection to cache database
+        query (str): sql query as a string
+        vars (tuple(tuple)): variables substituted into query
+        target_table (str): table in cache that rows are copied into
+
+    Raises:
+        Exception: any error on either side of the pipe. Caller's transaction
+                    on the cache should be rolled back.
+
+    Returns:
+        tuple[int, int]: (number of rows copied, number of bytes copied)
+    """
+    # COPY doesn't accept bound parameters, so the repolist is injected client-side.
+    # newline before closing paren in case query ends with a '--' comment.
+    with augur_conn.cursor() as augur_cur:
+        bound_query = augur_cur.mogrify(query, vars).decode(pg_encodings[augur_conn.encoding])
+    copy_out = f"COPY ({bound_query}\n) TO STDOUT"
+
+    # ref: https://www.psycopg.org/docs/sql.html
+    copy_in = pg_sql.SQL("COPY {tbl_name} FROM STDIN").format(tbl_name=pg_sql.Identifier(target_table))
+
+    with _CopyOutPipe(augur_conn, copy_out, name=f"{target_table}-copy-out") as reader:
+        counting_reader = _CountingReader(reader)
+        with cache_conn.cursor() as cache_cur:
+            cache_cur.copy_expert(copy_in, counting_reader)
+            rows = cache_cur.rowcount
+
+    return rows, counting_reader.nbytes
+
+
+def _stream_rows_values(
+    augur_conn,
+    cache_conn,
+    query: str,
+    vars: tuple[tuple],
+    target_table: str,
+    server_pagination: int,
+    client_pagination: int,
+) -> int:
+    """Runs {query} on Augur with a named server-side cursor and writes pages of
+    rows into {target_table} with execute_values INSERTs.
+
+    Original ingest path, kept as fallback if COPY streaming isn't possible.
+
+    Returns:
+        int: number of rows written
+    """
+    rows_written = 0
+    with augur_conn.cursor(name=f"{target_table}-{uuid4()}") as augur_cur:
+        # set number of rows we want from primary db at a time
+        augur_cur.itersize = server_pagination
+
+        logging.warning(f"{target_table} -- CQR EXECUTING QUERY")
+
+        # execute query
+        augur_cur.execute(query, vars)
+
+        logging.warning(f"{target_table} -- CQR COMPOSING SQL")
+        # compose SQL w/ table name
+        # ref: https://www.psycopg.org/docs/sql.html
+        composed_query = pg_sql.SQL(
+            "INSERT INTO {tbl_name} VALUES %s ON CONFLICT DO NOTHING".format(tbl_name=target_table)
+        ).as_string(cache_conn)
+
+        # iterate through pages of rows from server.
+        logging.warning(f"{target_table} -- CQR FETCHING AND STORING ROWS")
+        while rows := augur_cur.fetchmany(client_pagination):
+            if not rows:
+                # we're out of rows
+                break
+
+            # write available rows to cache.
+            with cache_conn.cursor() as cache_cur:
+                execute_values(
+                    cur=cache_cur,
+                    sql=composed_query,
+                    argslist=rows,
+                    page_size=client_pagination,
+                )
+            rows_written += len(rows)
+
+    return rows_written
+
+
+def _cache_query_results_in_transaction(
     db_connection_string: str,
     query: str,
     vars: tuple[tuple],
     target_table: str,
     bookkeeping_data: tuple[dict],
+    stream_mode: str,
     server_pagination=2000,
     client_pagination=2000,
+    delete_query: pg_sql.Composable | None = None,
+    delete_vars: tuple | None = None,
+    watermark_column: str | None = None,
 ) -> None:
-    """Runs {query} against primary database specified by {db_connection_string} with variables {vars}.
-    Retrieves results from db with paginations {server_pagination} and {client_pagination}.
+    """
+    Moves results of {query} into {target_table} and writes bookkeeping
+    data in a single cache transaction, using the {stream_mode} ingest path.
 
-    Args:
-        db_connection_string (str): _description_
-        query (str): _description_
-        vars (tuple(tuple)): _description_
-        target_table (str): _description_
-        bookkeeping_data (tuple(dict)): _description_
-        server_pagination (int, optional): _description_. Defaults to 2000.
-        client_pagination (int, optional): _description_. Defaults to 2000.
+    If {delete_query} is given, it's run first so that the rows it removes
+    are replaced by the results of {query} in the same transaction.
     """
-    logging.warning(f"{target_table} -- CQR CACHE_QUERY_RESULTS BEGIN")
     with pg.connect(
         db_connection_string,
         options=f"-c search_path={env_augur_schema}",
     ) as augur_conn:
-        with augur_conn.cursor(name=f"{target_table}-{uuid4()}") as augur_cur:
-            # set number of rows we want from primary db at a time
-            augur_cur.itersize = server_pagination
-
-            logging.warning(f"{target_table} -- CQR EXECUTING QUERY")
-
-            # execute query
-            augur_cur.execute(query, vars)
-
-            logging.warning(f"{target_table} -- CQR STARTING TRANSACTION")
-            # connect to cache
-            with pg.connect(cache_cx_string) as cache_conn:
-                logging.warning(f"{target_table} -- CQR COMPOSING SQL")
-                # compose SQL w/ table name
-                # ref: https://www.psycopg.org/docs/sql.html
-                composed_query = pg_sql.SQL(
-                    "INSERT INTO {tbl_name} VALUES %s ON CONFLICT DO NOTHING".format(tbl_name=target_table)
-                ).as_string(cache_conn)
-
-                # iterate through pages of rows from server.
-                logging.warning(f"{target_table} -- CQR FETCHING AND STORING ROWS")
-                while rows := augur_cur.fetchmany(client_pagination):
-                    if not rows:
-                        # we're out of rows
-                        break
-
-                    # write available rows to cache.
-                    with cache_conn.cursor() as cache_cur:
-                        execute_values(
-                            cur=cache_cur,
-                            sql=composed_query,
-                            argslist=rows,
-                            page_size=client_pagination,
-                        )
-
-                # after all data has successfully been written to cache from the primary db,
-                # insert record of existence for each (cache_func, repo_id) pair.
-                logging.warning(f"{target_table} -- CQR UPDATING BOOKKEEPING")
+        logging.warning(f"{target_table} -- CQR STARTING TRANSACTION")
+        # connect to cache
+        with _cache_pool.connection() as cache_conn:
+            repos = [b["repo_id"] for b in bookkeeping_data]
+            with cache_conn.cursor() as cache_cur:
+                # eviction waits for this transaction before deleting these repos' rows.
+                lock_entries(cache_cur, target_table, repos)
+
+            if delete_query is not None:
                 with cache_conn.cursor() as cache_cur:
-                    execute_values(
-                        cur=cache_cur,
-                        sql="""
-                        INSERT INTO cache_bookkeeping (cache_func, repo_id)
-                        VALUES %s
-                        """,
-                        template="(%(cache_func)s, %(repo_id)s)",
-                        argslist=bookkeeping_data,
+                    # a refresh replaces the rows of cached repos. if some were evicted while
+                    # Augur was queried, fail so that the retry collects them from scratch.
+                    cache_cur.execute(
+                        "SELECT count(*) FROM cache_bookkeeping WHERE cache_func = %s AND repo_id IN %s",
+                        (target_table, tuple(repos)),
                     )
+                    (n_cached,) = cache_cur.fetchone()
+                    if n_cached < len(set(repos)):
+                        raise RuntimeError(f"{target_table} -- CQR REPOS EVICTED DURING REFRESH")
+
+                    cache_cur.execute(delete_query, delete_vars)
+                    logging.warning(f"{target_table} -- CQR DELETED {cache_cur.rowcount} STALE ROWS")
+
+            start = time.perf_counter()
+            nbytes = None
+            if stream_mode == "copy":
+                logging.warning(f"{target_table} -- CQR STREAMING ROWS WITH COPY")
+                nrows, nbytes = _stream_rows_copy(augur_conn, cache_conn, query, vars, target_table)
+            else:
+                nrows = _stream_rows_values(
+                    augur_conn,
+                    cache_conn,
+                    query,
+                    vars,
+                    target_table,
+                    server_pagination,
+                    client_pagination,
+                )
+            elapsed = max(time.perf_counter() - start, 1e-9)
 
-                logging.warning(f"{target_table} -- CQR COMMITTING TRANSACTION")
-                # TODO: end of context block, on success, should commit. On failure, should rollback. Need to write test for this.
+            if nbytes is not None:
+                logging.warning(
+                    f"{target_table} -- CQR {stream_mode.upper()} INGESTED {nrows} ROWS, {nbytes} BYTES "
+                    f"IN {elapsed:.2f}s "
+                    f"({nrows / elapsed:.0f} rows/s, {nbytes / elapsed / 1e6:.2f} MB/s)"
+                )
+            else:
+                logging.warning(
+                    f"{target_table} -- CQR {stream_mode.upper()} INGESTED {nrows} ROWS IN {elapsed:.2f}s "
+                    f"({nrows / elapsed:.0f} rows/s)"
+                )
+
+            # after all data has successfully been written to cache from the primary db,
+            # insert or refresh the record of existence for each (cache_func, repo_id) pair.
+            logging.warning(f"{target_table} -- CQR UPDATING BOOKKEEPING")
+            _write_bookkeeping(cache_conn, target_table, bookkeeping_data, watermark_column)
+
+            logging.warning(f"{target_table} -- CQR COMMITTING TRANSACTION")
+            # end of context block commits on success and rolls back on exception.
 
         # don't need to commit on primary db
         logging.warning(f"{target_table} -- CQR SUCCESS")
 
 
+def _write_bookkeeping(
+    cache_conn, target_table: str, bookkeeping_data: tuple[dict], watermark_column: str | None = None
+) -> None:
+    """
+    Inserts or refreshes the cache_bookkeeping record of each (cache_func, repo_id)
+    in {bookkeeping_data}, whose rows were just written to {target_table}, and
+    notifies READY_CHANNEL when the caller's transaction commits.
+    """
+    # the watermark is the newest event now cached for the repo.
+    if watermark_column is not None:
+        watermark = pg_sql.SQL("(SELECT max(t.{col}) FROM {tbl_name} t WHERE t.repo_id = b.repo_id)").format(
+            col=pg_sql.Identifier(watermark_column), tbl_name=pg_sql.Identifier(target_table)
+        )
+    else:
+        watermark = pg_sql.SQL("NULL::timestamptz")
+
+    # the number of rows cached for each repo, used to estimate its size for eviction.
+    n_rows = pg_sql.SQL("(SELECT count(*) FROM {tbl_name} t WHERE t.repo_id = b.repo_id)").format(
+        tbl_name=pg_sql.Identifier(target_table)
+    )
+
+    with cache_conn.cursor() as cache_cur:
+        execute_values(
+            cur=cache_cur,
+            sql=pg_sql.SQL(
+                """
+                INSERT INTO cache_bookkeeping (cache_func, repo_id, watermark, n_rows)
+                SELECT b.cache_func, b.repo_id, {watermark}, {n_rows}
+                FROM (VALUES %s) AS b (cache_func, repo_id)
+                ON CONFLICT (cache_func, repo_id) DO UPDATE
+                SET
+                    ts_cached = EXCLUDED.ts_cached,
+                    watermark = EXCLUDED.watermark,
+                    n_rows = EXCLUDED.n_rows
+                """
+            )
+            .format(watermark=watermark, n_rows=n_rows)
+            .as_string(cache_conn),
+            template="(%(cache_func)s, %(repo_id)s)",
+            argslist=bookkeeping_data,
+        )
+
+        # wake up callbacks waiting on this data. delivered when the transaction commits.
+        for cache_func in {b["cache_func"] for b in bookkeeping_data}:
+            cache_cur.execute("SELECT pg_notify(%s, %s)", (READY_CHANNEL, cache_func))
+
+
+def cache_query_results(
+    db_connection_string: str,
+    query: str,
+    vars: tuple[tuple],
+    target_table: str,
+    bookkeeping_data: tuple[dict],
+    server_pagination=2000,
+    client_pagination=2000,
+    ingest_mode: str = env_ingest_mode,
+    delete_query: pg_sql.Composable | None = None,
+    delete_vars: tuple | None = None,
+    watermark_column: str | None = None,
+) -> None:
+    """Runs {query} against primary database specified by {db_connection_string} with variables {vars}.
+
+    In "copy" mode, results are streamed from the primary database into the cache with
+    COPY TO STDOUT / COPY FROM STDIN. If that fails, or in "values" mode, results are
+    retrieved from db with paginations {server_pagination} and {client_pagination}
+    and inserted with execute_values.
+
+    Args:
+        db_connection_string (str): psycopg2 connection string for primary database
+        query (str): sql query as a string
+        vars (tuple(tuple)): variables substituted into query
+        target_table (str): table in cache that results are written to
+        bookkeeping_data (tuple(dict)): (cache_func, repo_id) records written on success
+        server_pagination (int, optional): rows per server-side fetch in "values" mode. Defaults to 2000.
+        client_pagination (int, optional): rows per insert in "values" mode. Defaults to 2000.
+        ingest_mode (str, optional): "copy" or "values". Defaults to CACHE_INGEST_MODE env, "copy".
+        delete_query (Composable, optional): statement run on the cache before results are written,
+                                                removing the rows they replace. Defaults to None.
+        delete_vars (tuple, optional): variables substituted into delete_query. Defaults to None.
+        watermark_column (str, optional): column of target_table whose per-repo max is
+                                            recorded as the bookkeeping watermark. Defaults to None.
+    """
+    logging.warning(f"{target_table} -- CQR CACHE_QUERY_RESULTS BEGIN")
+
+    if ingest_mode == "copy":
+        try:
+            _cache_query_results_in_transaction(
+                db_connection_string,
+                query,
+                vars,
+                target_table,
+                bookkeeping_data,
+                stream_mode="copy",
+                delete_query=delete_query,
+                delete_vars=delete_vars,
+                watermark_column=watermark_column,
+            )
+            return
+        except Exception as e:
+            # cache transaction was rolled back, nothing partial was written.
+            logging.error(f"{target_table} -- CQR COPY STREAM FAILED, FALLING BACK TO VALUES: {e}")
+
+    _cache_query_results_in_transaction(
+        db_connection_string,
+        query,
+        vars,
+        target_table,
+        bookkeeping_data,
+        stream_mode="values",
+        server_pagination=server_pagination,
+        client_pagination=client_pagination,
+        delete_query=delete_query,
+        delete_vars=delete_vars,
+        watermark_column=watermark_column,
+    )
+
+
+# row estimate for repos that Augur has no repo_info counts for.
+_DEFAULT_REPO_ROWS = 1000
+
+
+def estimate_repo_rows(repolist: list[int]) -> dict[int, int]:
+    """
+    Estimates how many rows collecting each repo produces, as the sum of its
+    commit, issue and pull request counts in Augur's latest repo_info.
+
+    Returns:
+        dict[int, int]: repo_id -> estimated rows. Repos without counts
+                        are estimated at _DEFAULT_REPO_ROWS.
+    """
+    estimates = dict.fromkeys(repolist, _DEFAULT_REPO_ROWS)
+    try:
+        augur_conn = pg.connect(db_cx_string, options=f"-c search_path={env_augur_schema}")
+        try:
+            with augur_conn.cursor() as augur_cur:
+                augur_cur.execute(
+                    """
+                    SELECT DISTINCT ON (ri.repo_id)
+                        ri.repo_id,
+                        coalesce(ri.commit_count, 0) + coalesce(ri.issues_count, 0) + coalesce(ri.pull_request_count, 0)
+                    FROM repo_info ri
+                    WHERE ri.repo_id IN %s
+                    ORDER BY ri.repo_id, ri.data_collection_date DESC
+                    """,
+                    (tuple(repolist),),
+                )
+                for repo_id, rows in augur_cur.fetchall():
+                    estimates[repo_id] = max(int(rows), 1)
+        finally:
+            augur_conn.close()
+    except pg.Error as e:
+        # estimates only affect how work is split, fall back to defaults.
+        logging.error(f"REPO ROW ESTIMATES UNAVAILABLE: {e}")
+
+    return estimates
+
+
 def get_uncached(func_name: str, repolist: list[int]) -> list[int]:  # or None
     """
     Checks bookkeeping data to find, for a given querying function, which
@@ -123,7 +706,7 @@ def get_uncached(func_name: str, repolist: list[int]) -> list[int]:  # or None
 
     Returns a list of repos that AREN'T resident in cache.
     """
-    with pg.connect(cache_cx_string) as cache_conn:
+    with _cache_pool.connection() as cache_conn:
         with cache_conn.cursor() as cache_cur:
             composed_query = pg_sql.SQL(
                 """
@@ -152,9 +735,271 @@ def get_uncached(func_name: str, repolist: list[int]) -> list[int]:  # or None
             return not_cached
 
 
-def caching_wrapper(func_name: str, query: str, repolist: list[int], n_repolist_uses=1) -> None:
-    """Combines steps of (1) identifying which repos aren't already cached and
-    (2) querying + caching repos those repos.
+def get_uncached_many(func_names: list[str], repolist: list[int]) -> dict[str, list[int]]:
+    """
+    Like get_uncached, for several querying functions at once:
+    looks up every (func_name, repo) pair in one round trip.
+
+    Returns a dict of func_name -> list of repos that AREN'T resident in cache,
+    with an entry for every func_name.
+    """
+    if not func_names or not repolist:
+        return {f: [] for f in func_names}
+
+    with _cache_pool.connection() as cache_conn:
+        return _uncached_many(cache_conn, func_names, repolist)
+
+
+def _uncached_many(cache_conn, func_names: list[str], repolist: list[int]) -> dict[str, list[int]]:
+    """
+    get_uncached_many on the caller's connection, e.g. inside its transaction.
+    """
+    not_cached: dict[str, list[int]] = {f: [] for f in func_names}
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute(
+            """
+            SELECT f.cache_func, r.repo_id
+            FROM unnest(%s::text[]) AS f (cache_func)
+            CROSS JOIN unnest(%s::int[]) AS r (repo_id)
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM cache_bookkeeping cb
+                WHERE cb.cache_func = f.cache_func AND cb.repo_id = r.repo_id
+            )
+            """,
+            (list(func_names), list(set(repolist))),
+        )
+        for func_name, repo_id in cache_cur.fetchall():
+            not_cached[func_name].append(repo_id)
+
+    return not_cached
+
+
+def get_stale(func_name: str, ttl: timedelta, repolist: list[int] | None = None) -> list[int]:
+    """
+    Checks bookkeeping data to find, for a given querying function, which
+    repos were cached more than {ttl} ago.
+
+    Only repos in {repolist} are checked if it's given, otherwise all
+    repos cached for {func_name} are.
+
+    Returns a list of repos whose cached data is stale.
+    """
+    query = (
+        "SELECT cb.repo_id FROM cache_bookkeeping cb WHERE cb.cache_func = %s AND cb.ts_cached < LOCALTIMESTAMP - %s"
+    )
+    vars = (func_name, ttl)
+    if repolist is not None:
+        query += " AND cb.repo_id IN %s"
+        vars += (tuple(repolist),)
+
+    with _cache_pool.connection() as cache_conn:
+        with cache_conn.cursor() as cache_cur:
+            cache_cur.execute(query, vars)
+            return [r for (r,) in cache_cur.fetchall()]
+
+
+# channel that cache_query_results notifies when new data is committed to the cache.
+# the payload is the cache_func name.
+READY_CHANNEL = "cache_ready"
+
+# while the listener is connected, waiters still re-check bookkeeping this often
+# in case a notification was missed.
+_READY_RECHECK_SECONDS = 5.0
+
+# while the listener is disconnected, waiters fall back to polling bookkeeping this often.
+_READY_POLL_SECONDS = 0.5
+
+
+class _ReadinessListener:
+    """
+    Process-local LISTEN connection on READY_CHANNEL, shared by every
+    thread waiting in wait_until_cached.
+
+    A background thread receives notifications and bumps a per-cache_func
+    counter, waking up any waiters. Waiters then re-check bookkeeping for
+    their own repos. Like _ConnectionPool, it starts fresh after a fork.
+    """
+
+    def __init__(self, dsn: str):
+        self._dsn = dsn
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._connected = False
+        # cache_func -> number of notifications received for it.
+        self._counters: dict[str, int] = {}
+        # bumped when the connection drops, since notifications may have been missed.
+        self._epoch = 0
+
+    def _ensure_started(self):
+        if os.getpid() != self._pid:
+            self._reset()
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="cache-ready-listener", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            conn = None
+            try:
+                conn = pg.connect(self._dsn)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(pg_sql.SQL("LISTEN {chan}").format(chan=pg_sql.Identifier(READY_CHANNEL)))
+
+                with self._cond:
+                    self._connected = True
+
+                while True:
+                    # wait for the socket to be readable, then collect notifications.
+                    if select.select([conn], [], [], _READY_RECHECK_SECONDS) == ([], [], []):
+                        continue
+                    conn.poll()
+                    with self._cond:
+                        while conn.notifies:
+                            n = conn.notifies.pop(0)
+                            self._counters[n.payload] = self._counters.get(n.payload, 0) + 1
+                        self._cond.notify_all()
+
+            except Exception as e:
+                logging.error(f"CACHE READINESS LISTENER - CONNECTION LOST: {e}")
+                with self._cond:
+                    self._connected = False
+                    self._epoch += 1
+                    self._cond.notify_all()
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                time.sleep(1.0)
+
+    def token(self, func_name: str) -> tuple[int, int]:
+        """
+        Current notification state for {func_name}. Take the token before
+        checking bookkeeping so that a notification arriving in between isn't lost.
+        """
+        self._ensure_started()
+        with self._cond:
+            return self._epoch, self._counters.get(func_name, 0)
+
+    def wait(self, func_name: str, token: tuple[int, int], timeout: float) -> None:
+        """
+        Blocks until a notification for {func_name} arrives after {token}
+        was taken, or {timeout} seconds pass.
+        """
+        with self._cond:
+            if not self._connected:
+                timeout = min(timeout, _READY_POLL_SECONDS)
+            self._cond.wait_for(
+                lambda: (self._epoch, self._counters.get(func_name, 0)) != token,
+                timeout=timeout,
+            )
+
+
+_readiness_listener = _ReadinessListener(cache_cx_string)
+
+
+def wait_until_cached(func_name: str, repolist: list[int], timeout: float | None = None) -> list[int]:
+    """
+    Blocks until every repo in {repolist} is recorded in bookkeeping for {func_name},
+    or {timeout} seconds pass. Replaces polling get_uncached in a sleep loop.
+
+    Query tasks NOTIFY on READY_CHANNEL when they commit new data, so waiters wake
+    up as soon as data lands instead of on the next poll.
+
+    Args:
+        func_name (str): literal name of querying function
+        repolist (list[int]): repos that need to be cached
+        timeout (float | None, optional): seconds to wait. Defaults to None, wait forever.
+
+    Returns:
+        list[int]: repos that still aren't cached. Empty if all are ready.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    logged = False
+
+    while True:
+        token = _readiness_listener.token(func_name)
+
+        not_cached = get_uncached(func_name=func_name, repolist=repolist)
+        if not not_cached:
+            return []
+
+        if not logged:
+            logging.warning(f"{func_name} - WAITING ON DATA TO BECOME AVAILABLE")
+            logged = True
+
+        wait_for = _READY_RECHECK_SECONDS
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                logging.warning(f"{func_name} - TIMED OUT WAITING ON {len(not_cached)} REPOS")
+                return not_cached
+            wait_for = min(wait_for, remaining)
+
+        _readiness_listener.wait(func_name, token, wait_for)
+
+
+class RefreshPolicy:
+    """
+    How long a query's cached results stay fresh, and how they're
+    refreshed once they're stale. Each module in 'queries/' declares one
+    as REFRESH_POLICY and passes it to caching_wrapper. queries/cache_refresh.py
+    periodically refreshes the stale repos of every query in
+    index_callbacks.QUERIES with its module's REFRESH_POLICY.
+
+    Attributes
+    ----------
+        ttl (timedelta): cached results older than this are refreshed.
+
+        mode (str):
+            "replace" deletes a stale repo's rows and queries all of them again.
+            Use it when cached rows can change, e.g. an issue's closed_at.
+
+            "append" only queries rows whose {time_column} is newer than the repo's
+            watermark, less {lookback}, and replaces the cached rows in that window.
+            Use it for append-only event data.
+
+        time_column (str): cache table column that orders rows in time. Required for "append".
+
+        lookback (timedelta): how far before the watermark "append" re-reads,
+                                to pick up events that reach Augur late.
+    """
+
+    def __init__(
+        self,
+        ttl: timedelta,
+        mode: str = "replace",
+        time_column: str | None = None,
+        lookback: timedelta = timedelta(days=7),
+    ):
+        if mode not in ("replace", "append"):
+            raise ValueError(f"unknown refresh mode: {mode}")
+        if mode == "append" and time_column is None:
+            raise ValueError("append refresh requires a time_column")
+
+        self.ttl = ttl
+        self.mode = mode
+        self.time_column = time_column
+        self.lookback = lookback
+
+
+def caching_wrapper(
+    func_name: str,
+    query: str,
+    repolist: list[int],
+    n_repolist_uses=1,
+    refresh_policy: RefreshPolicy | None = None,
+) -> None:
+    """Combines steps of (1) identifying which repos aren't already cached or are stale,
+    (2) querying + caching repos those repos, (3) rebuilding their rollups, see rollups.py,
+    and (4) writing them to the hot tier.
 
     Args:
         func_name (str): literal name of querying function for bookkeeping
@@ -162,6 +1007,8 @@ def caching_wrapper(func_name: str, query: str, repolist: list[int], n_repolist_
         repolist (list[int]): list of repos requested by user.
         n_repolist_uses (int): if the repolist is used more than once in the query, simply inject it again.
                                 TODO: remove this hack and parameterize queries by name
+        refresh_policy (RefreshPolicy, optional): when and how cached repos are refreshed.
+                                                    If None, cached repos are never refreshed.
 
     Raises:
         Exception: If a step fails, will print exception and re-raise.
@@ -171,27 +1018,70 @@ def caching_wrapper(func_name: str, query: str, repolist: list[int], n_repolist_
     """
     try:
         # STEP 1: Which repos need to be queried for?
-        #           some might already be in cache.
-        uncached_repos: list[int] | None = get_uncached(func_name=func_name, repolist=repolist)
-        if not uncached_repos:
+        #           some might already be in cache, some of those might be stale.
+        uncached_repos: list[int] = get_uncached(func_name=func_name, repolist=repolist)
+        stale_repos: list[int] = []
+        if refresh_policy is not None:
+            stale_repos = get_stale(func_name=func_name, ttl=refresh_policy.ttl, repolist=repolist)
+
+        if not uncached_repos and not stale_repos:
             logging.warning(f"{func_name} COLLECTION - ALL REQUESTED REPOS IN CACHE")
             return 0
-        else:
-            logging.warning(f"{func_name} COLLECTION - CACHING {len(uncached_repos)} NEW REPOS")
 
-            # inject the repolist multiple times because the SQL uses it more
-            # than once and the wildcard %s are ordered.
-            uncached_repos: tuple[tuple] = tuple([tuple(uncached_repos) for _ in range(n_repolist_uses)])
+        watermark_column = refresh_policy.time_column if refresh_policy is not None else None
 
         # STEP 2: Query for those repos
-        logging.warning(f"{func_name} COLLECTION - EXECUTING CACHING QUERY")
-        cache_query_results(
-            db_connection_string=db_cx_string,
-            query=query,
-            vars=uncached_repos,
-            target_table=func_name,
-            bookkeeping_data=tuple({"cache_func": func_name, "repo_id": r} for r in repolist),
-        )
+        #           queries that share their Augur source with others collect new repos
+        #           for all of them at once, see extracts.py.
+        not_collected = uncached_repos
+        if uncached_repos and env_grouped_extraction and func_name in EXTRACT_GROUPS:
+            not_collected = _collect_with_group(func_name, uncached_repos)
+
+        if not_collected:
+            logging.warning(f"{func_name} COLLECTION - CACHING {len(not_collected)} NEW REPOS")
+            cache_query_results(
+                db_connection_string=db_cx_string,
+                query=query,
+                # inject the repolist multiple times because the SQL uses it more
+                # than once and the wildcard %s are ordered.
+                vars=tuple([tuple(not_collected) for _ in range(n_repolist_uses)]),
+                target_table=func_name,
+                bookkeeping_data=tuple({"cache_func": func_name, "repo_id": r} for r in not_collected),
+                watermark_column=watermark_column,
+            )
+
+        if stale_repos:
+            logging.warning(
+                f"{func_name} COLLECTION - REFRESHING {len(stale_repos)} STALE REPOS ({refresh_policy.mode})"
+            )
+            vars = tuple([tuple(stale_repos) for _ in range(n_repolist_uses)])
+            if refresh_policy.mode == "append":
+                query, vars, delete_query, delete_vars = _tail_refresh(
+                    func_name, query, vars, stale_repos, refresh_policy
+                )
+            else:
+                delete_query = pg_sql.SQL("DELETE FROM {tbl_name} WHERE repo_id IN %s").format(
+                    tbl_name=pg_sql.Identifier(func_name)
+                )
+                delete_vars = (tuple(stale_repos),)
+
+            cache_query_results(
+                db_connection_string=db_cx_string,
+                query=query,
+                vars=vars,
+                target_table=func_name,
+                bookkeeping_data=tuple({"cache_func": func_name, "repo_id": r} for r in stale_repos),
+                delete_query=delete_query,
+                delete_vars=delete_vars,
+                watermark_column=watermark_column,
+            )
+
+        # STEP 3: Rebuild the rollups of the new data
+        _build_rollups(func_name, list(ROLLUPS.get(func_name, {})), uncached_repos + stale_repos)
+
+        # STEP 4: Write the new data to the hot tier for the first read
+        for tablename in [func_name, *ROLLUPS.get(func_name, {})]:
+            warm_hot_tier(tablename, uncached_repos + stale_repos)
     except Exception as e:
         logging.critical(f"{func_name}_POSTGRES ERROR: {e}")
 
@@ -199,9 +1089,312 @@ def caching_wrapper(func_name: str, query: str, repolist: list[int], n_repolist_
         raise Exception(e)
 
 
+def _build_rollups(source: str, rollups: list[str], repolist: list[int]) -> None:
+    """
+    Rebuilds {rollups} of {source} for {repolist} from source's cached rows,
+    see rollups.py. All of the rollups' rows and bookkeeping are replaced
+    in one transaction.
+    """
+    if not rollups or not repolist:
+        return
+
+    with _cache_pool.connection() as cache_conn:
+        with cache_conn.cursor() as cache_cur:
+            # eviction waits for this transaction before deleting the rollups' rows.
+            for rollup in sorted(rollups):
+                lock_entries(cache_cur, rollup, repolist)
+
+            for rollup in rollups:
+                tbl_name = pg_sql.Identifier(rollup)
+
+                # callbacks and workers can rebuild the same rollup at the same time,
+                # without this one's DELETE wouldn't see the other's uncommitted rows.
+                cache_cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (rollup,))
+
+                cache_cur.execute(
+                    pg_sql.SQL("DELETE FROM {tbl_name} WHERE repo_id IN %s").format(tbl_name=tbl_name),
+                    (tuple(repolist),),
+                )
+                cache_cur.execute(
+                    pg_sql.SQL("INSERT INTO {tbl_name} {select}").format(
+                        tbl_name=tbl_name, select=pg_sql.SQL(ROLLUPS[source][rollup])
+                    ),
+                    (tuple(repolist),),
+                )
+                cache_cur.execute(
+                    pg_sql.SQL(
+                        """
+                        INSERT INTO cache_bookkeeping (cache_func, repo_id, n_rows)
+                        SELECT %s, r.repo_id, (SELECT count(*) FROM {tbl_name} t WHERE t.repo_id = r.repo_id)
+                        FROM unnest(%s::int[]) AS r (repo_id)
+                        ON CONFLICT (cache_func, repo_id) DO UPDATE
+                        SET ts_cached = EXCLUDED.ts_cached, n_rows = EXCLUDED.n_rows
+                        """
+                    ).format(tbl_name=tbl_name),
+                    (rollup, list(repolist)),
+                )
+                cache_cur.execute("SELECT pg_notify(%s, %s)", (READY_CHANNEL, rollup))
+
+    logging.warning(f"{source} ROLLUPS - BUILT {rollups} FOR {len(repolist)} REPOS")
+
+
+def ensure_rollup(rollup: str, repolist: list[int]) -> None:
+    """
+    Builds {rollup} for the repos in {repolist} whose source data is cached
+    but whose rollup isn't, e.g. because it was evicted. Call after waiting
+    for the source data with wait_until_cached, before reading the rollup.
+    """
+    missing = get_uncached(func_name=rollup, repolist=repolist)
+    if not missing:
+        return
+
+    source = ROLLUP_SOURCES[rollup]
+    buildable = sorted(set(missing) - set(get_uncached(func_name=source, repolist=missing)))
+    _build_rollups(source, [rollup], buildable)
+
+
+def _stage_extract(augur_conn, cache_conn, table: str, spec: dict, vars: tuple) -> int:
+    """
+    Streams the results of an extract's base or lookup {spec} on Augur
+    into the temporary table {table} on the cache, dropped when the
+    caller's transaction ends. See extracts.py.
+
+    Returns:
+        int: number of rows staged
+    """
+    tbl_name = pg_sql.Identifier(table)
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute(
+            pg_sql.SQL("CREATE TEMP TABLE {tbl_name} ({columns}) ON COMMIT DROP").format(
+                tbl_name=tbl_name, columns=pg_sql.SQL(spec["columns"])
+            )
+        )
+
+    if env_ingest_mode == "copy":
+        nrows, _ = _stream_rows_copy(augur_conn, cache_conn, spec["query"], vars, table)
+    else:
+        nrows = _stream_rows_values(augur_conn, cache_conn, spec["query"], vars, table, 2000, 2000)
+
+    # temporary tables aren't analyzed automatically, the members' joins need row estimates.
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute(pg_sql.SQL("ANALYZE {tbl_name}").format(tbl_name=tbl_name))
+
+    return nrows
+
+
+def _extract_group(group: str, repolist: list[int]) -> dict[str, list[int]]:
+    """
+    Caches {repolist} for every member of extract {group} that hasn't cached them,
+    scanning the group's Augur source once, see extracts.py. All of the members'
+    rows and bookkeeping are written in one transaction.
+
+    Returns:
+        dict[str, list[int]]: member -> repos cached for it
+    """
+    spec = EXTRACTS[group]
+
+    with pg.connect(
+        db_cx_string,
+        options=f"-c search_path={env_augur_schema}",
+    ) as augur_conn:
+        with _cache_pool.connection() as cache_conn:
+            # members of the group collecting the same repos wait for the first one,
+            # then find the repos cached below.
+            with cache_conn.cursor() as cache_cur:
+                cache_cur.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext(%s), r) FROM unnest(%s::int[]) AS r",
+                    (f"extract:{group}", sorted(set(repolist))),
+                )
+
+            needed = {m: r for m, r in _uncached_many(cache_conn, list(spec["members"]), repolist).items() if r}
+            if not needed:
+                return {}
+
+            repos = sorted(set().union(*needed.values()))
+            logging.warning(f"{group} EXTRACT - {len(repos)} REPOS FOR {sorted(needed)}")
+
+            start = time.perf_counter()
+            base = f"extract_{group}"
+            nrows = _stage_extract(augur_conn, cache_conn, base, spec["base"], (tuple(repos),))
+            logging.warning(f"{group} EXTRACT - STAGED {nrows} BASE ROWS")
+
+            for lookup, lookup_spec in spec["lookups"].items():
+                users = [m for m in needed if lookup in spec["members"][m]["lookups"]]
+                if not users:
+                    continue
+
+                # keys of the base rows of the repos that the lookup's users are collecting.
+                with cache_conn.cursor() as cache_cur:
+                    cache_cur.execute(
+                        pg_sql.SQL(
+                            "SELECT array_agg(DISTINCT b.{key}::text) FROM {base} b WHERE b.repo_id IN %s"
+                        ).format(key=pg_sql.Identifier(lookup_spec["key"]), base=pg_sql.Identifier(base)),
+                        (tuple(set().union(*[needed[m] for m in users])),),
+                    )
+                    keys = cache_cur.fetchone()[0] or []
+
+                nrows = _stage_extract(augur_conn, cache_conn, f"extract_{lookup}", lookup_spec, (keys,))
+                logging.warning(f"{group} EXTRACT - STAGED {nrows} {lookup} ROWS FOR {len(keys)} KEYS")
+
+            # eviction waits for this transaction before deleting the members' rows.
+            with cache_conn.cursor() as cache_cur:
+                for member in sorted(needed):
+                    lock_entries(cache_cur, member, needed[member])
+
+            for member, member_repos in needed.items():
+                member_spec = spec["members"][member]
+                with cache_conn.cursor() as cache_cur:
+                    cache_cur.execute(
+                        pg_sql.SQL("INSERT INTO {tbl_name} {select}").format(
+                            tbl_name=pg_sql.Identifier(member), select=pg_sql.SQL(member_spec["select"])
+                        ),
+                        (tuple(member_repos),),
+                    )
+                    logging.warning(f"{group} EXTRACT - {member} CACHED {cache_cur.rowcount} ROWS")
+
+                _write_bookkeeping(
+                    cache_conn,
+                    member,
+                    tuple({"cache_func": member, "repo_id": r} for r in member_repos),
+                    member_spec["watermark_column"],
+                )
+
+            logging.warning(f"{group} EXTRACT - DONE IN {time.perf_counter() - start:.2f}s")
+
+    return needed
+
+
+def _collect_with_group(func_name: str, repolist: list[int]) -> list[int]:
+    """
+    Caches {repolist} for {func_name} and the other members of its extract group
+    with one scan of their shared Augur source, see extracts.py. The other members'
+    new repos get their rollups and hot tier blobs too.
+
+    If the extraction fails, nothing is written and func_name collects alone.
+
+    Returns:
+        list[int]: repos in repolist that still aren't cached for func_name
+    """
+    group = EXTRACT_GROUPS[func_name]
+    try:
+        extracted = _extract_group(group, repolist)
+    except Exception as e:
+        logging.error(f"{func_name} COLLECTION - {group} EXTRACT FAILED, COLLECTING ALONE: {e}")
+        return get_uncached(func_name=func_name, repolist=repolist)
+
+    for member, repos in extracted.items():
+        if member == func_name:
+            continue
+        _build_rollups(member, list(ROLLUPS.get(member, {})), repos)
+        for tablename in [member, *ROLLUPS.get(member, {})]:
+            warm_hot_tier(tablename, repos)
+
+    return get_uncached(func_name=func_name, repolist=repolist)
+
+
+def _tail_refresh(
+    func_name: str,
+    query: str,
+    vars: tuple[tuple],
+    repolist: list[int],
+    refresh_policy: RefreshPolicy,
+) -> tuple[pg_sql.Composed, tuple, pg_sql.Composed, tuple]:
+    """
+    Builds the statements for an "append" refresh of {repolist}: a query that
+    only returns rows at or after each repo's watermark less the policy's
+    lookback, and a delete of the cached rows in that same window.
+
+    Repos without a watermark are re-read in full.
+
+    Returns:
+        tuple: (query, vars, delete_query, delete_vars)
+    """
+    with _cache_pool.connection() as cache_conn:
+        with cache_conn.cursor() as cache_cur:
+            # the query's columns are renamed to the cache table's, positionally,
+            # so that the time column can be referenced by its cache name.
+            cache_cur.execute(
+                pg_sql.SQL("SELECT * FROM {tbl_name} LIMIT 0").format(tbl_name=pg_sql.Identifier(func_name))
+            )
+            columns = [desc.name for desc in cache_cur.description]
+
+            cache_cur.execute(
+                """
+                SELECT cb.repo_id, cb.watermark
+                FROM cache_bookkeeping cb
+                WHERE cb.cache_func = %s AND cb.repo_id IN %s
+                """,
+                (func_name, tuple(repolist)),
+            )
+            watermarks = dict(cache_cur.fetchall())
+
+    since = []
+    for r in repolist:
+        w = watermarks.get(r)
+        since += [r, w - refresh_policy.lookback if w is not None else "-infinity"]
+    since_values = pg_sql.SQL(", ").join([pg_sql.SQL("(%s, %s::timestamptz)")] * len(repolist))
+
+    time_col = pg_sql.Identifier(refresh_policy.time_column)
+
+    # newline before closing paren in case query ends with a '--' comment.
+    tail_query = pg_sql.SQL(
+        """
+        SELECT q.*
+        FROM ({query}
+        ) AS q ({columns})
+        JOIN (VALUES {since}) AS w (repo_id, since) ON q.repo_id = w.repo_id
+        WHERE q.{time_col} >= w.since
+        """
+    ).format(
+        query=pg_sql.SQL(query),
+        columns=pg_sql.SQL(", ").join(pg_sql.Identifier(c) for c in columns),
+        since=since_values,
+        time_col=time_col,
+    )
+
+    delete_query = pg_sql.SQL(
+        """
+        DELETE FROM {tbl_name} t
+        USING (VALUES {since}) AS w (repo_id, since)
+        WHERE t.repo_id = w.repo_id AND t.{time_col} >= w.since AND t.repo_id IN %s
+        """
+    ).format(tbl_name=pg_sql.Identifier(func_name), since=since_values, time_col=time_col)
+
+    # the literal repo_id list lets postgres skip partitions that hold none of these repos.
+    return tail_query, vars + tuple(since), delete_query, tuple(since) + (tuple(repolist),)
+
+
+_PG_OID_TIMESTAMPTZ = 1184
+
+# postgres type OID -> arrow type used to parse that column out of CSV.
+# chosen so that .to_pandas() gives the same dtypes that
+# pd.DataFrame(cursor.fetchall()) would: ints are widened to int64
+# (float64 if NULLs present), floats to float64, timestamps to ns precision.
+# ref: SELECT oid, typname FROM pg_type;
+_PG_OID_TO_ARROW = {
+    16: pa.bool_(),  # bool
+    20: pa.int64(),  # int8
+    21: pa.int64(),  # int2
+    23: pa.int64(),  # int4
+    25: pa.string(),  # text
+    700: pa.float64(),  # float4
+    701: pa.float64(),  # float8
+    1042: pa.string(),  # bpchar
+    1043: pa.string(),  # varchar
+    1082: pa.date32(),  # date
+    1114: pa.timestamp("ns"),  # timestamp
+    _PG_OID_TIMESTAMPTZ: pa.timestamp("ns", tz="UTC"),  # timestamptz
+}
+
+
 def retrieve_from_cache(
     tablename: str,
     repolist: list[int],
+    columns: list[str] | None = None,
+    date_column: str | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    read_mode: str = env_read_mode,
 ) -> pd.DataFrame:
     """
     For a given table in cache, get all results
@@ -209,28 +1402,428 @@ def retrieve_from_cache(
 
     Results are retrieved by a DataFrame, so column names
     may need to be overridden by calling function.
+
+    Only the listed columns are read if columns is given. If start_date
+    or end_date is given, only rows with start_date <= date_column <= end_date
+    are read. These filters run in the cache db, so rows and columns that
+    a visualization would drop anyway are never transferred.
+
+    Recently retrieved DataFrames are kept in an in-process LRU cache,
+    keyed by the bookkeeping version of the requested repos. Repeat reads
+    of unchanged data only cost one bookkeeping lookup.
+
+    If the Redis hot tier is enabled, each repo's data is read from its
+    Arrow blob there, see cache_manager.py, and the columns and date range
+    are selected from it. Postgres is only read for repos that aren't in the
+    hot tier, with the same pushdown as without it. Their blobs are written
+    if the whole of their data was read, otherwise by warm_hot_tier.
+
+    In "copy" mode, rows are streamed with COPY ... TO STDOUT (FORMAT csv)
+    into pyarrow's CSV reader, which builds typed columns directly. This
+    avoids holding both a list of row tuples and the DataFrame in memory.
+    "fetchall" is the original cursor-based path. Both return the same
+    column names and dtypes.
     """
+    if (start_date is not None or end_date is not None) and date_column is None:
+        raise ValueError("date_column is required to filter by start_date or end_date")
 
-    # GET ALL DATA FROM POSTGRES CACHE
-    df = None
-    with pg.connect(cache_cx_string) as cache_conn:
-        with cache_conn.cursor() as cache_cur:
-            cache_cur.execute(
-                """
-                SELECT *
-                FROM {tablename} t
-                WHERE t.repo_id IN %s;
-                """.format(
-                    tablename=tablename
-                ),
-                (tuple(repolist),),
-            )
+    select, select_vars = _select_from_cache(tablename, repolist, columns, date_column, start_date, end_date)
+    read_spec = (tuple(columns) if columns else None, date_column, start_date, end_date)
 
-            logging.warning(f"{tablename} - LOADING DATA FROM CACHE")
-            df = pd.DataFrame(
-                cache_cur.fetchall(),
-                # get df column names from the database columns
-                columns=[desc[0] for desc in cache_cur.description],
-            )
-            logging.warning(f"{tablename} - DATA LOADED - {df.shape} rows,cols")
+    # GET ALL DATA FROM POSTGRES CACHE
+    with _cache_pool.connection() as cache_conn:
+        _touch_bookkeeping(cache_conn, tablename, repolist)
+        versions = _bookkeeping_versions(cache_conn, tablename, repolist)
+        key = (tablename, frozenset(repolist), read_spec, frozenset(versions.items()))
+        df = _frame_cache.get(key)
+        if df is not None:
+            logging.warning(f"{tablename} - DATA LOADED FROM MEMORY - {df.shape} rows,cols")
             return df
+
+        if _hot_tier is not None and versions:
+            df = _retrieve_hot(cache_conn, tablename, versions, read_spec)
+            if df is not None:
+                logging.warning(f"{tablename} - DATA LOADED - {df.shape} rows,cols")
+                return _frame_cache.put(key, df)
+
+        logging.warning(f"{tablename} - LOADING DATA FROM CACHE")
+        if read_mode == "copy":
+            df = _retrieve_copy(cache_conn, tablename, select, select_vars)
+        else:
+            df = _retrieve_fetchall(cache_conn, select, select_vars)
+        logging.warning(f"{tablename} - DATA LOADED - {df.shape} rows,cols")
+        return _frame_cache.put(key, df)
+
+
+def retrieve_derived(
+    tablename: str,
+    repolist: list[int],
+    derivation: str,
+    build: Callable[[pd.DataFrame], pd.DataFrame],
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Returns build(retrieve_from_cache(tablename, repolist, columns)).
+
+    The result is kept in the in-process LRU cache next to the data it's
+    built from, keyed by the same bookkeeping version, so a visualization
+    whose inputs only change how the derived DataFrame is used doesn't
+    rebuild it. It's rebuilt once the repos' cached data changes.
+
+    derivation names build and everything besides the data that its result
+    depends on, e.g. whether bots are filtered out.
+    """
+    read_spec = ("derived", derivation, tuple(columns) if columns else None)
+
+    with _cache_pool.connection() as cache_conn:
+        _touch_bookkeeping(cache_conn, tablename, repolist)
+        versions = _bookkeeping_versions(cache_conn, tablename, repolist)
+    key = (tablename, frozenset(repolist), read_spec, frozenset(versions.items()))
+
+    df = _frame_cache.get(key)
+    if df is not None:
+        logging.warning(f"{tablename} - {derivation} LOADED FROM MEMORY - {df.shape} rows,cols")
+        return df
+
+    df = build(retrieve_from_cache(tablename, repolist, columns=columns))
+    return _frame_cache.put(key, df)
+
+
+def _select_from_cache(
+    tablename: str,
+    repolist: list[int],
+    columns: list[str] | None,
+    date_column: str | None,
+    start_date: str | None,
+    end_date: str | None,
+) -> tuple[pg_sql.Composed, tuple]:
+    """
+    Builds the SELECT for retrieve_from_cache and its query vars.
+    """
+    if columns:
+        projection = pg_sql.SQL(", ").join(pg_sql.Identifier(c) for c in columns)
+    else:
+        projection = pg_sql.SQL("*")
+
+    predicates = [pg_sql.SQL("repo_id IN %s")]
+    select_vars = [tuple(repolist)]
+    if start_date is not None:
+        predicates.append(pg_sql.SQL("{col} >= %s").format(col=pg_sql.Identifier(date_column)))
+        select_vars.append(start_date)
+    if end_date is not None:
+        predicates.append(pg_sql.SQL("{col} <= %s").format(col=pg_sql.Identifier(date_column)))
+        select_vars.append(end_date)
+
+    select = pg_sql.SQL("SELECT {projection} FROM {tbl_name} WHERE {predicates}").format(
+        projection=projection,
+        tbl_name=pg_sql.Identifier(tablename),
+        predicates=pg_sql.SQL(" AND ").join(predicates),
+    )
+    return select, tuple(select_vars)
+
+
+def _touch_bookkeeping(cache_conn, tablename: str, repolist: list[int]) -> None:
+    """
+    Records that (tablename, repo) data was read, so that eviction
+    removes the repos that haven't been read for the longest first.
+
+    Rows touched within the last _TOUCH_INTERVAL aren't written again,
+    so repeated reads of the same repos don't each cost a write.
+    """
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute(
+            """
+            UPDATE cache_bookkeeping cb
+            SET last_accessed = LOCALTIMESTAMP
+            WHERE cb.cache_func = %s AND cb.repo_id IN %s AND cb.last_accessed < LOCALTIMESTAMP - %s
+            """,
+            (tablename, tuple(repolist), _TOUCH_INTERVAL),
+        )
+
+
+def _bookkeeping_versions(cache_conn, tablename: str, repolist: list[int]) -> dict:
+    """
+    Finds the version of each cached repo's data for tablename, the time it
+    was cached. Changes whenever the repo is cached, refreshed, or removed.
+
+    Returns:
+        dict: repo_id -> ts_cached, for the repos in repolist that are cached
+    """
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute(
+            """
+            SELECT cb.repo_id, cb.ts_cached
+            FROM cache_bookkeeping cb
+            WHERE cb.cache_func = %s AND cb.repo_id IN %s
+            """,
+            (tablename, tuple(repolist)),
+        )
+        return dict(cache_cur.fetchall())
+
+
+def _retrieve_hot(cache_conn, tablename: str, versions: dict, read_spec: tuple) -> pd.DataFrame | None:
+    """
+    Hot tier read path- reads each repo's data from its Arrow blob in Redis
+    and selects read_spec's columns and date range from it. Repos without a
+    blob for their current version are read from Postgres with read_spec's
+    columns and date range pushed down.
+
+    Blobs hold every row and column of a repo, so they're only written here
+    when the whole of the repos' data is read. Otherwise they're written
+    by warm_hot_tier once the repos are collected.
+
+    Returns None if the hot tier can't be used, so that the caller reads
+    from Postgres.
+    """
+    try:
+        tables = _hot_tier.getm(tablename, versions)
+    except redis.exceptions.RedisError as e:
+        logging.error(f"{tablename} - HOT TIER UNAVAILABLE: {e}")
+        return None
+
+    missing = [r for r in versions if r not in tables]
+    logging.warning(f"{tablename} - {len(tables)} REPOS FROM HOT TIER, {len(missing)} FROM CACHE")
+
+    try:
+        # zero-copy, the result's chunks are the per-repo tables.
+        selected = [_select_from_table(pa.concat_tables(tables.values()), *read_spec)] if tables else []
+    except pa.ArrowInvalid as e:
+        # the table's columns changed since some blobs were written.
+        logging.error(f"{tablename} - HOT TIER SCHEMA MISMATCH, LOADING FROM CACHE: {e}")
+        return None
+
+    if missing and all(spec is None for spec in read_spec):
+        cold = _read_repos(cache_conn, tablename, missing)
+        _write_hot(tablename, {r: (versions[r], cold[r]) for r in missing})
+        selected.extend(cold.values())
+    elif missing:
+        columns, date_column, start_date, end_date = read_spec
+        select, select_vars = _select_from_cache(
+            tablename, missing, list(columns) if columns else None, date_column, start_date, end_date
+        )
+        selected.append(_read_copy_table(cache_conn, tablename, select, select_vars))
+
+    try:
+        table = pa.concat_tables(selected)
+    except pa.ArrowInvalid as e:
+        logging.error(f"{tablename} - HOT TIER SCHEMA MISMATCH, LOADING FROM CACHE: {e}")
+        return None
+
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _read_repos(cache_conn, tablename: str, repolist: list[int]) -> dict[int, pa.Table]:
+    """
+    Reads all of the cached data of tablename for repolist from Postgres.
+
+    Returns:
+        dict[int, pa.Table]: repo_id -> that repo's rows, for every repo in repolist
+    """
+    select, select_vars = _select_from_cache(tablename, repolist, None, None, None, None)
+    table = _read_copy_table(cache_conn, tablename, select, select_vars).sort_by("repo_id")
+
+    # slices of the sorted table, zero-copy.
+    repo_ids = table["repo_id"].to_numpy()
+    bounds = np.searchsorted(repo_ids, repolist, side="left"), np.searchsorted(repo_ids, repolist, side="right")
+    return {r: table.slice(lo, hi - lo) for r, lo, hi in zip(repolist, *bounds)}
+
+
+def _write_hot(tablename: str, tables: dict) -> None:
+    """
+    Writes repos' tables to the hot tier. Failures are logged, not raised,
+    the data is still in Postgres.
+
+    Args:
+        tables (dict): repo_id -> (version, pa.Table)
+    """
+    try:
+        _hot_tier.setm(tablename, tables)
+    except redis.exceptions.RedisError as e:
+        logging.error(f"{tablename} - HOT TIER WRITE FAILED: {e}")
+
+
+def _select_from_table(
+    table: pa.Table,
+    columns: tuple | None,
+    date_column: str | None,
+    start_date: str | None,
+    end_date: str | None,
+) -> pa.Table:
+    """
+    Like _select_from_cache, for data that's already been read: keeps the rows
+    with start_date <= date_column <= end_date, then the columns.
+    """
+    mask = None
+    for value, compare in ((start_date, pc.greater_equal), (end_date, pc.less_equal)):
+        if value is None:
+            continue
+        column = table[date_column]
+        condition = compare(column, _scalar_like(column.type, value))
+        mask = condition if mask is None else pc.and_(mask, condition)
+
+    if mask is not None:
+        # rows where date_column is NULL are dropped, as in SQL.
+        table = table.filter(mask)
+    if columns:
+        table = table.select(list(columns))
+    return table
+
+
+def _scalar_like(arrow_type: pa.DataType, value) -> pa.Scalar:
+    """
+    Converts value to arrow_type the way postgres would cast a literal
+    compared with a column of that type. Cache connections run in UTC.
+    """
+    if pa.types.is_timestamp(arrow_type):
+        ts = pd.Timestamp(value)
+        if arrow_type.tz is not None:
+            ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+        elif ts.tzinfo is not None:
+            ts = ts.tz_convert("UTC").tz_localize(None)
+        return pa.scalar(ts, type=arrow_type)
+    if pa.types.is_date(arrow_type):
+        return pa.scalar(pd.Timestamp(value).date(), type=arrow_type)
+    return pa.scalar(value).cast(arrow_type)
+
+
+def warm_hot_tier(tablename: str, repolist: list[int]) -> None:
+    """
+    Writes the hot tier blobs of repolist's current cached data for tablename,
+    so that the first read after the repos are collected doesn't go to Postgres.
+    Does nothing if the hot tier is disabled.
+    """
+    if _hot_tier is None or not repolist:
+        return
+
+    with _cache_pool.connection() as cache_conn:
+        versions = _bookkeeping_versions(cache_conn, tablename, repolist)
+        if not versions:
+            return
+        tables = _read_repos(cache_conn, tablename, list(versions))
+
+    _write_hot(tablename, {r: (versions[r], tables[r]) for r in versions})
+
+
+def drop_hot_tier(tablename: str, versions: dict) -> None:
+    """
+    Removes the hot tier blobs of the repos' versions of tablename, e.g. once
+    the repos are evicted. Failures are logged, not raised, the blobs can't be
+    read once their repos' bookkeeping is gone and they expire after their TTL.
+    Does nothing if the hot tier is disabled.
+
+    Args:
+        versions (dict): repo_id -> version of its cached data, its bookkeeping ts_cached
+    """
+    if _hot_tier is None or not versions:
+        return
+
+    try:
+        _hot_tier.deletem(tablename, versions)
+    except redis.exceptions.RedisError as e:
+        logging.error(f"{tablename} - HOT TIER DELETE FAILED: {e}")
+
+
+def hot_tier_stats() -> dict | None:
+    """
+    Returns counters for the Redis hot tier: this process' hits, misses,
+    hit_ratio, writes, skipped blobs and evictions, and the total bytes of
+    blobs in Redis and max_bytes. None if the hot tier is disabled.
+    """
+    if _hot_tier is None:
+        return None
+    return _hot_tier.stats()
+
+
+def frame_cache_stats() -> dict:
+    """
+    Returns counters for this process' in-memory DataFrame cache:
+    hits, misses, evictions, entries, bytes and max_bytes.
+    """
+    return _frame_cache.stats()
+
+
+def _retrieve_fetchall(cache_conn, select: pg_sql.Composed, select_vars: tuple) -> pd.DataFrame:
+    """
+    Original read path- fetch all matching rows as tuples,
+    then build a DataFrame from them.
+    """
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute(select, select_vars)
+        rows = cache_cur.fetchall()
+
+        # no rows to infer dtypes from, use the ones the COPY path reads the columns as.
+        if not rows:
+            return _empty_table(cache_cur.description).to_pandas()
+
+        df = pd.DataFrame(
+            rows,
+            # get df column names from the database columns
+            columns=[desc[0] for desc in cache_cur.description],
+        )
+
+        # timestamptz values come back with psycopg2's fixed-offset tzinfo,
+        # normalize to the same datetime64[ns, UTC] columns the COPY path produces.
+        for desc in cache_cur.description:
+            if desc.type_code == _PG_OID_TIMESTAMPTZ:
+                df[desc.name] = pd.to_datetime(df[desc.name], utc=True)
+
+        return df
+
+
+def _retrieve_copy(cache_conn, tablename: str, select: pg_sql.Composed, select_vars: tuple) -> pd.DataFrame:
+    """
+    Columnar read path- COPY matching rows out of the cache as CSV
+    and parse them with pyarrow into typed column buffers.
+    """
+    table = _read_copy_table(cache_conn, tablename, select, select_vars)
+
+    # release arrow buffers as each column is converted to keep peak memory low.
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _read_copy_table(cache_conn, tablename: str, select: pg_sql.Composed, select_vars: tuple) -> pa.Table:
+    """
+    Reads the rows of select into an arrow Table with COPY, see _retrieve_copy.
+    """
+    with cache_conn.cursor() as cache_cur:
+        # column names and types without reading any rows.
+        cache_cur.execute(pg_sql.SQL("{select} LIMIT 0").format(select=select), select_vars)
+        description = cache_cur.description
+        columns = [desc.name for desc in description]
+        column_types = {desc.name: _PG_OID_TO_ARROW.get(desc.type_code, pa.string()) for desc in description}
+
+        copy_out = pg_sql.SQL("COPY ({select}) TO STDOUT WITH (FORMAT csv, NULL '\\N')").format(
+            select=pg_sql.SQL(cache_cur.mogrify(select, select_vars).decode(pg_encodings[cache_conn.encoding]))
+        )
+
+    with _CopyOutPipe(cache_conn, copy_out, name=f"{tablename}-copy-read") as reader:
+        # COPY writes nothing if no rows match, which pyarrow's CSV reader rejects as an empty file.
+        if not reader.peek(1):
+            return _empty_table(description)
+
+        table = pa_csv.open_csv(
+            reader,
+            read_options=pa_csv.ReadOptions(column_names=columns),
+            # text columns like file paths could contain newlines, postgres quotes them.
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=column_types,
+                # postgres quotes a literal '\N' string, so only unquoted '\N' is NULL.
+                null_values=["\\N"],
+                strings_can_be_null=True,
+                quoted_strings_can_be_null=False,
+                true_values=["t"],
+                false_values=["f"],
+            ),
+        ).read_all()
+
+    return table
+
+
+def _empty_table(description) -> pa.Table:
+    """
+    Table without rows, with the columns of a cursor's description typed as the COPY path reads them.
+    """
+    return pa.schema(
+        [(desc.name, _PG_OID_TO_ARROW.get(desc.type_code, pa.string())) for desc in description]
+    ).empty_table()
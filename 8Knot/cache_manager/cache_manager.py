@@ -1,229 +1,288 @@
+"""
+Hot tier of the cache.
+
+The Postgres cache (cold tier) holds every (func, repo) that's been
+collected, and every read from it costs a query and a CSV parse.
+CacheManager keeps recently read (func, repo) data in Redis as Arrow IPC
+blobs, so repeat reads are a single MGET and the decoded blobs are
+concatenated without copying. Each table's blobs are compressed with
+its codec, see codecs.py.
+
+Blobs are keyed by the repo's cached version (its cache_bookkeeping.ts_cached),
+so a refreshed or recollected repo is never served from an old blob.
+Old blobs expire after their TTL, or are evicted, least recently read first,
+once the blobs' total size exceeds max_bytes. The blobs of repos evicted
+from the Postgres cache are removed with them, see eviction.py.
+
+Redis is shared with the celery broker and result backend, so the budget
+is enforced here instead of with Redis' maxmemory eviction, which could
+evict queued jobs and results.
+"""
 import redis
 import os
+import time
 import hashlib
-import pandas as pd
-import io
+import threading
+from .codecs import codec_for
+
+# bumped when the blob format changes, so old blobs are never decoded.
+# the codec's name is part of each key too.
+_FORMAT_VERSION = "arrow-ipc-2"
+
+_KEY_PREFIX = "8knot:hot:"
+# sorted set of blob keys, scored by the time they were last read or written.
+_LRU_KEY = _KEY_PREFIX + "lru"
+# hash of blob key -> blob size.
+_SIZES_KEY = _KEY_PREFIX + "sizes"
+# sum of blob sizes in _SIZES_KEY.
+_BYTES_KEY = _KEY_PREFIX + "bytes"
+
+# stores a blob and accounts for its size.
+# KEYS: blob key, _LRU_KEY, _SIZES_KEY, _BYTES_KEY. ARGV: blob, ttl, now.
+_PUT = """
+local old = tonumber(redis.call('HGET', KEYS[3], KEYS[1])) or 0
+local size = string.len(ARGV[1])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], KEYS[1])
+redis.call('HSET', KEYS[3], KEYS[1], size)
+return redis.call('INCRBY', KEYS[4], size - old)
+"""
+
+# removes the least recently used blobs, including ones that already expired.
+# KEYS: _LRU_KEY, _SIZES_KEY, _BYTES_KEY. ARGV: number of blobs.
+_POP = """
+local popped = redis.call('ZPOPMIN', KEYS[1], ARGV[1])
+local freed = 0
+for i = 1, #popped, 2 do
+    local key = popped[i]
+    freed = freed + (tonumber(redis.call('HGET', KEYS[2], key)) or 0)
+    redis.call('HDEL', KEYS[2], key)
+    redis.call('DEL', key)
+end
+local remaining = redis.call('DECRBY', KEYS[3], freed)
+return {#popped / 2, remaining}
+"""
+
+# removes the given blobs, e.g. of repos evicted from the cache.
+# KEYS: _LRU_KEY, _SIZES_KEY, _BYTES_KEY, then the blob keys.
+_DELETE = """
+local freed = 0
+local deleted = 0
+for i = 4, #KEYS do
+    freed = freed + (tonumber(redis.call('HGET', KEYS[2], KEYS[i])) or 0)
+    redis.call('HDEL', KEYS[2], KEYS[i])
+    redis.call('ZREM', KEYS[1], KEYS[i])
+    deleted = deleted + redis.call('DEL', KEYS[i])
+end
+redis.call('DECRBY', KEYS[3], freed)
+return deleted
+"""
+
+# blobs removed per _POP call while over budget.
+_POP_BATCH = 16
 
 
 class CacheManager:
     """
-    Manages access to Redis cache.
+    Manages the Redis hot tier of the cache.
 
     Attributes
     ----------
         _redis : (private) Redis object
+        max_bytes (int): budget for the total size of stored blobs
+        ttl (int): seconds a blob is kept after it's written
+        max_blob_bytes (int): blobs larger than this aren't stored
 
     Methods
     -------
-        _get_hash(func, repo) (private) :
-            Creates a unique hash for each job based on the job's calling
-            function and the list of repos that the function is being run with.
+        _get_hash(func, repo, version) (private) :
+            Creates a unique key for the data of (func, repo) at version.
 
-        set(func, repo, data) :
-            Sets data at key hash(func, repo).
+        setm(func, {repo: (version, table)}) :
+            Stores each table as a blob, then evicts least recently used
+            blobs until the blobs fit in max_bytes.
 
-        setm(func, [repo], [data]) :
-            Sets [data] at keys [hash(func, repo)] of [repo]
+        getm(func, {repo: version}) :
+            Returns {repo: table} for the repos whose blob at version is stored.
 
-        get(func, repo):
-            Returns data at key hash(func, repo), None if Nil.
-
-        getm(func, [repo]):
-            Returns data at keys [hash(func, repo)], None if Nil.
-            Uses r.mget([keys])
-
-        exists(func, repo):
-            Returns number of names that exist.
-
-        existsm(func, [repo]):
-            Returns number of names that exist.
+        deletem(func, {repo: version}) :
+            Removes the repos' blobs at version.
 
+        stats() :
+            Returns hit, miss, write, and eviction counters and the blobs' total size.
     """
 
-    def __init__(self, decode_value=False):
+    def __init__(
+        self,
+        max_bytes: int = 1024**3,
+        ttl: int = 86400,
+        max_blob_bytes: int = 64 * 1024**2,
+    ):
         # Redis cache for job queue and results cache
         self._redis = redis.StrictRedis(
             # openshift, compose will reconcile the 'redis' naming via the dns
             host=os.getenv("REDIS_SERVICE_HOST", "redis-cache"),
             port=os.getenv("REDIS_SERVICE_PORT", "6379"),
             password=os.getenv("REDIS_PASSWORD", ""),
-            decode_responses=decode_value,
         )
-
-    def _get_hash(self, func, repo):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_blob_bytes = max_blob_bytes
+
+        self._put = self._redis.register_script(_PUT)
+        self._pop = self._redis.register_script(_POP)
+        self._delete = self._redis.register_script(_DELETE)
+
+        # counters for this process.
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._skipped = 0
+        self._evictions = 0
+
+    def _get_hash(self, func, repo, version):
         """
         (private)
-        Creates an MD5-hash based on the string-bytes
-        of the passed function and the list of repos that
-        the function is going to be run on.
-
-        Hash is used as a key by which the status of and results from the
-        worker are accessed from the Queue.
+        Creates an MD5-hash based on the name of the query, the repo,
+        and the version of the repo's cached data.
 
         Args:
         -----
-            func (function): Function that worker picks up to run as job.
-            repo (str): Argument to function. Repo data downloaded for.
+            func (str): name of the query function, i.e. its cache table.
+            repo (int): repo_id of repo
+            version: version of the repo's cached data, its bookkeeping ts_cached.
 
         Returns:
         --------
-            _Hash: Unique key in Queue object to access job status and results.
+            str: key of the blob in Redis.
         """
 
         # use md5 instead of sha256 or better because
         # we're only ensuring limited collision avoidance, not
         # practicing good securiy protocol.
         hashfunc = hashlib.md5()
+        hashfunc.update(bytes(f"{_FORMAT_VERSION}:{codec_for(func).name}:{func}:{repo}:{version}", "utf-8"))
 
-        # use the called function's name
-        hashfunc.update(bytes(func.__name__, "utf-8"))
-
-        # and the repo list we're passing to it
-        hashfunc.update(bytes(str(repo), "utf-8"))
-        # grab the hex hash that's been generated.
-        h = hashfunc.hexdigest()
-
-        return h
-
-    def set(self, func, repo, data):
-        """Sets redis value as data at name=hash(func, repo)
-
-        Args:
-            func (function): Query function used
-            repo (int): repo_id of repo
-            data (list(dict)): rows of data in dictionary format.
+        return _KEY_PREFIX + hashfunc.hexdigest()
 
-        Returns:
-            boolean: confirmation of successful set operation.
+    def setm(self, func, tables):
         """
-
-        # set redis value at 'name=hash' to 'data'
-        ack = self._redis.set(name=self._get_hash(func=func, repo=repo), value=data)
-
-        return ack
-
-    def setm(self, func, repos, datas):
-        """Sets many redis value as data at name=hash(func, repo)
+        Stores each repo's table as a blob, then evicts least recently
+        used blobs until the blobs fit in max_bytes.
 
         Args:
-            func (function): Query function used
-            repo (list[int]): list of repo_ids of repos
-            data (list[list(dict)]): list of rows of data in dictionary format.
+            func (str): name of the query function
+            tables (dict[int, tuple]): repo_id -> (version, pa.Table)
 
         Returns:
-            list[boolean]: confirmations of successful set operations.
+            int: number of blobs stored
         """
-
-        # create hashes for each (func, repo_id) pair
-        hs = [self._get_hash(func, r) for r in repos]
-        ds = datas
-
-        # bulk-set keys to values in Redis
-        acks = self._redis.mset(dict(zip(hs, ds)))
-
-        # from redis docs: "(Return is) always OK since MSET can't fail."
-        return acks
-
-    def get(self, func, repo):
-        """Get redis value as data at name=hash(func, repo)
-
-        Args:
-            func (function): Query function used
-            repo (int): list of repo_id of repo
-
-        Returns:
-            boolean: confirmation of successful set operation.
+        codec = codec_for(func)
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=False)
+        stored = 0
+        skipped = 0
+        for repo, (version, table) in tables.items():
+            blob = codec.encode(table)
+            if len(blob) > self.max_blob_bytes:
+                skipped += 1
+                continue
+            self._put(
+                keys=[self._get_hash(func, repo, version), _LRU_KEY, _SIZES_KEY, _BYTES_KEY],
+                args=[blob, self.ttl, now],
+                client=pipe,
+            )
+            stored += 1
+
+        total = None
+        if stored:
+            total = pipe.execute()[-1]
+
+        with self._lock:
+            self._writes += stored
+            self._skipped += skipped
+
+        # evict least recently used blobs while over budget.
+        while total is not None and total > self.max_bytes:
+            n, total = self._pop(keys=[_LRU_KEY, _SIZES_KEY, _BYTES_KEY], args=[_POP_BATCH])
+            with self._lock:
+                self._evictions += n
+            if n == 0:
+                break
+
+        return stored
+
+    def getm(self, func, versions):
         """
-
-        # get redis value at "name=hash"
-        r = self._redis.get(name=self._get_hash(func, repo))
-
-        return r
-
-    def getm(self, func, repos):
-        """Gets many redis value as data at name=hash(func, repo)
+        Gets the blobs of many repos at their versions.
 
         Args:
-            func (function): Query function used
-            repo (list[int]): list of repo_ids of repos
+            func (str): name of the query function
+            versions (dict[int, object]): repo_id -> version of its cached data
 
         Returns:
-            (list[list(dict)]): list of rows of data in dictionary format.
+            dict[int, pa.Table]: repo_id -> table, for the repos whose blob is stored.
         """
+        repos = list(versions)
+        if not repos:
+            return {}
 
-        # create hashes for each (func, repo_id) pair
-        hs = [self._get_hash(func, r) for r in repos]
+        codec = codec_for(func)
+        keys = [self._get_hash(func, r, versions[r]) for r in repos]
+        blobs = self._redis.mget(keys)
 
-        # bulk-get values from keys in Redis
-        rs = self._redis.mget(hs)
+        tables = {}
+        hit_keys = {}
+        for repo, key, blob in zip(repos, keys, blobs):
+            if blob is not None:
+                tables[repo] = codec.decode(blob)
+                hit_keys[key] = time.time()
 
-        # return results
-        return rs
+        # record the read for least-recently-used eviction.
+        if hit_keys:
+            self._redis.zadd(_LRU_KEY, hit_keys, xx=True)
 
-    def exists(self, func, repo):
-        """Checks whether key is in Redis for hash(func, repo)
+        with self._lock:
+            self._hits += len(tables)
+            self._misses += len(repos) - len(tables)
 
-        Args:
-            func (function): Query function used
-            repo (int): repo_id of repo
+        return tables
 
-        Returns:
-            int: number of names that exist
+    def deletem(self, func, versions):
         """
-
-        # convert single value into a list
-        repo = [repo]
-
-        # pass to exists_many, processes as a list.
-        return self.existsm(func, repo)
-
-    def existsm(self, func, repos):
-        """Checks whether keys are in Redis for hash(func, repo)
+        Removes the blobs of many repos at their versions.
 
         Args:
-            func (function): Query function used
-            repo (list[int]): list of repo_ids of repos
+            func (str): name of the query function
+            versions (dict[int, object]): repo_id -> version of its cached data
 
         Returns:
-            int: number of names that exist
+            int: number of blobs removed
         """
+        if not versions:
+            return 0
 
-        # create hashes for each (func, repo_id) pair
-        hs = [self._get_hash(func, r) for r in repos]
-
-        # bulk-get values from keys in Redis
-        n = self._redis.exists(*hs)
-
-        # return results
-        return n
-
-    def grabm(self, func, repos):
-        """Checks to see if data is ready using 'existsm'
-        and builds aggregate DataFrame to return to callback.
-
-        Args:
-            func (function): Query function used
-            repo (list[int]): list of repo_ids of repos
+        keys = [self._get_hash(func, r, v) for r, v in versions.items()]
+        return self._delete(keys=[_LRU_KEY, _SIZES_KEY, _BYTES_KEY, *keys])
 
+    def stats(self):
+        """
         Returns:
-            pd.DataFrame | None: Data if all available.
+            dict: hits, misses, hit_ratio, writes, skipped (blobs over max_blob_bytes)
+                    and evictions for this process, bytes (total size of blobs) and max_bytes.
         """
-
-        num_repos = len(repos)
-        ready = self.existsm(func=func, repos=repos) == num_repos
-        if not ready:
-            return None
-
-        # get all results from cache
-        dfs_from_cache = self.getm(func=func, repos=repos)
-
-        pd_dfs = []
-        for bdf in dfs_from_cache:
-            bbuff = io.BytesIO(bdf)
-            bbuff.seek(0)
-            df = pd.read_feather(bbuff)
-            pd_dfs.append(df)
-
-        out_df = pd.concat(pd_dfs)
-
-        return out_df
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            counters = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / (hits + misses) if hits + misses else None,
+                "writes": self._writes,
+                "skipped": self._skipped,
+                "evictions": self._evictions,
+            }
+
+        counters["bytes"] = int(self._redis.get(_BYTES_KEY) or 0)
+        counters["max_bytes"] = self.max_bytes
+        return counters
@@ -0,0 +1,78 @@
+"""
+Compares the hot tier's blob codecs on data from the Postgres cache.
+
+For each codec, reports the size of each repo's blob, how much smaller
+it is than the uncompressed Arrow data, and how fast it's encoded and
+decoded, to help choose TABLE_CODECS in codecs.py.
+
+Usage, from the directory containing cache_manager/ with the app's
+environment variables set:
+    python -m cache_manager.codec_benchmark <tablename> <repo_id> [<repo_id> ...]
+"""
+import sys
+import time
+import pyarrow as pa
+from .codecs import CODECS
+from . import cache_facade as cf
+
+
+def benchmark(tables: list[pa.Table], codecs=CODECS, repeat: int = 5) -> list[dict]:
+    """
+    Encodes and decodes every table with every codec, {repeat} times,
+    keeping the fastest run.
+
+    Args:
+        tables (list[pa.Table]): per-repo tables, as stored in the hot tier
+        codecs (dict[str, ArrowCodec]): codecs to compare
+        repeat (int): runs per codec
+
+    Returns:
+        list[dict]: per codec- codec, bytes (all blobs), ratio (arrow bytes / blob bytes),
+                    encode_mb_s and decode_mb_s (throughput of arrow bytes)
+    """
+    arrow_bytes = sum(t.nbytes for t in tables)
+
+    results = []
+    for name, codec in codecs.items():
+        encode_s = decode_s = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            blobs = [codec.encode(t) for t in tables]
+            encode_s = min(encode_s, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for blob in blobs:
+                codec.decode(blob)
+            decode_s = min(decode_s, time.perf_counter() - start)
+
+        blob_bytes = sum(len(b) for b in blobs)
+        results.append(
+            {
+                "codec": name,
+                "bytes": blob_bytes,
+                "ratio": arrow_bytes / blob_bytes if blob_bytes else None,
+                "encode_mb_s": arrow_bytes / 1e6 / encode_s if encode_s else None,
+                "decode_mb_s": arrow_bytes / 1e6 / decode_s if decode_s else None,
+            }
+        )
+    return results
+
+
+def main(argv: list[str]) -> None:
+    if len(argv) < 2:
+        sys.exit(__doc__)
+
+    tablename, repolist = argv[0], [int(r) for r in argv[1:]]
+
+    with cf._cache_pool.connection() as cache_conn:
+        tables = list(cf._read_repos(cache_conn, tablename, repolist).values())
+
+    arrow_bytes = sum(t.nbytes for t in tables)
+    print(f"{tablename}: {len(tables)} repos, {sum(t.num_rows for t in tables)} rows, {arrow_bytes} arrow bytes")
+    print(f"{'codec':<12}{'bytes':>14}{'ratio':>9}{'encode MB/s':>14}{'decode MB/s':>14}")
+    for r in benchmark(tables):
+        print(f"{r['codec']:<12}{r['bytes']:>14}{r['ratio']:>9.2f}{r['encode_mb_s']:>14.1f}{r['decode_mb_s']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
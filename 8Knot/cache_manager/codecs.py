@@ -0,0 +1,105 @@
+"""
+Codecs for the blobs that per-(table, repo) data is stored as
+in the hot tier, see cache_manager.py.
+
+Every codec writes an Arrow IPC stream, so blobs decode straight into
+arrow Tables. They differ in whether the stream's buffers are compressed
+and whether repetitive text columns are dictionary-encoded first. Text-heavy
+tables, like file paths or lists of contributor ids, shrink severalfold
+with zstd, which fits more repos in the hot tier's memory budget.
+Other tables default to lz4, which is cheaper to decode.
+
+Decoding always returns the columns' original types, so a blob
+reads back the same as the data it was written from.
+
+To compare codecs on real cached data:
+    python -m cache_manager.codec_benchmark <tablename> <repo_id> [<repo_id> ...]
+"""
+import pyarrow as pa
+import pyarrow.compute as pc
+from .cx_common import env_hot_codec
+
+
+class ArrowCodec:
+    """
+    Encodes arrow Tables as Arrow IPC streams.
+
+    Attributes
+    ----------
+        name (str): identifies the codec, part of each blob's key.
+        compression (str | None): IPC buffer compression, "lz4" or "zstd".
+        dictionary (bool): dictionary-encode text columns whose values repeat.
+        max_distinct_ratio (float): text columns with at most this many distinct
+            values per row are dictionary-encoded.
+    """
+
+    def __init__(self, name: str, compression: str | None = None, dictionary: bool = False, max_distinct_ratio=0.5):
+        self.name = name
+        self.compression = compression
+        self.dictionary = dictionary
+        self.max_distinct_ratio = max_distinct_ratio
+        self._options = pa.ipc.IpcWriteOptions(compression=compression)
+
+    def _dictionary_encode(self, table: pa.Table) -> pa.Table:
+        for i, field in enumerate(table.schema):
+            if not (pa.types.is_string(field.type) or pa.types.is_large_string(field.type)):
+                continue
+            column = table.column(i)
+            if len(column) == 0 or pc.count_distinct(column).as_py() > self.max_distinct_ratio * len(column):
+                continue
+            table = table.set_column(i, field.name, column.dictionary_encode())
+        return table
+
+    def encode(self, table: pa.Table) -> bytes:
+        """
+        Returns:
+            bytes: table as a blob
+        """
+        if self.dictionary:
+            table = self._dictionary_encode(table)
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema, options=self._options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def decode(self, blob: bytes) -> pa.Table:
+        """
+        Returns:
+            pa.Table: the table that blob was encoded from
+        """
+        # uncompressed buffers point into blob, nothing is copied.
+        table = pa.ipc.open_stream(pa.py_buffer(blob)).read_all()
+
+        for i, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                table = table.set_column(
+                    i, pa.field(field.name, field.type.value_type), table.column(i).cast(field.type.value_type)
+                )
+        return table
+
+
+# codec name -> codec.
+CODECS = {
+    "raw": ArrowCodec("raw"),
+    "lz4": ArrowCodec("lz4", compression="lz4"),
+    "zstd": ArrowCodec("zstd", compression="zstd"),
+    "zstd-dict": ArrowCodec("zstd-dict", compression="zstd", dictionary=True),
+}
+
+# tables whose blobs use a codec other than CACHE_HOT_CODEC.
+# these are mostly long, repetitive text.
+TABLE_CODECS = {
+    "repo_files_query": "zstd-dict",
+    "affiliation_query": "zstd-dict",
+    "cntrb_per_file_query": "zstd-dict",
+    "pr_file_query": "zstd-dict",
+}
+
+
+def codec_for(tablename: str) -> ArrowCodec:
+    """
+    Returns:
+        ArrowCodec: the codec that tablename's blobs are written with
+    """
+    return CODECS[TABLE_CODECS.get(tablename, env_hot_codec)]
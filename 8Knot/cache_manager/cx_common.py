@@ -35,7 +35,9 @@ init_cx_string = "dbname={} user={} password={} host={} port={}".format(
 )
 
 # psycopg2 connection string for cache pg instance
-cache_cx_string = "dbname={} user={} password={} host={} port={}".format(
+# sessions run in UTC so that naive timestamps from Augur are stored
+# as UTC in timestamptz columns, and are read back with a +00 offset.
+cache_cx_string = "dbname={} user={} password={} host={} port={} options='-c TimeZone=UTC'".format(
     env_dbname, env_user, env_password, env_host, env_port
 )
 
@@ -47,3 +49,69 @@ db_cx_string = "dbname={} user={} password={} host={} port={}".format(
     env_augur_host,
     env_augur_port,
 )
+
+# how cache_facade.cache_query_results moves rows from augur into the cache.
+# "copy" streams COPY TO STDOUT -> COPY FROM STDIN without building python rows,
+# "values" is the original fetchmany + execute_values path.
+env_ingest_mode = os.getenv("CACHE_INGEST_MODE", "copy")
+
+# how cache_facade.retrieve_from_cache reads rows out of the cache.
+# "copy" streams COPY TO STDOUT (FORMAT csv) into pyarrow typed columns,
+# "fetchall" is the original cursor.fetchall() + pd.DataFrame path.
+env_read_mode = os.getenv("CACHE_READ_MODE", "copy")
+
+# sizing for the process-local pool of cache connections in cache_facade.
+# each web thread / celery worker process keeps at most CACHE_POOL_MAX connections open.
+env_pool_max = int(os.getenv("CACHE_POOL_MAX", "4"))
+# seconds to wait for a free connection before raising.
+env_pool_timeout = float(os.getenv("CACHE_POOL_TIMEOUT", "30"))
+# idle connections older than this many seconds are pinged before reuse.
+env_pool_ping_after = float(os.getenv("CACHE_POOL_PING_AFTER", "30"))
+
+# memory budget, in bytes, for DataFrames kept in-process by cache_facade.retrieve_from_cache.
+env_frame_cache_bytes = int(os.getenv("CACHE_FRAME_CACHE_BYTES", str(512 * 1024 * 1024)))
+
+# size budget, in bytes, for data in the cache db. cache_manager.eviction removes the
+# least recently read repos' data once the estimated size of cached data exceeds it.
+env_cache_max_bytes = int(os.getenv("CACHE_MAX_BYTES", str(16 * 1024**3)))
+# number of (cache_func, repo_id) entries evicted per transaction.
+env_evict_batch = int(os.getenv("CACHE_EVICT_BATCH", "50"))
+# data read more recently than this many seconds ago is never evicted.
+env_evict_min_idle = float(os.getenv("CACHE_EVICT_MIN_IDLE", "3600"))
+
+# large collections are split into shards that run as parallel query jobs, see queries/sharded_collection.py.
+# rows a single shard should collect, estimated from Augur's repo_info. 0 disables sharding.
+env_shard_rows = int(os.getenv("CACHE_SHARD_ROWS", "1000000"))
+# most shards one collection is split into.
+env_shard_max = int(os.getenv("CACHE_SHARD_MAX", "8"))
+
+# seconds a query job's claim on a (query, repo) collection lasts, see cache_manager/inflight.py.
+# longer than the celery task_time_limit so that running jobs keep their claims.
+env_inflight_lease = int(os.getenv("CACHE_INFLIGHT_LEASE", "3600"))
+
+# hot tier of the cache, Arrow blobs of recently read (query, repo) data in Redis. see cache_manager/cache_manager.py.
+env_hot_tier = os.getenv("CACHE_HOT_TIER", "True") == "True"
+# size budget, in bytes, for the blobs in Redis.
+env_hot_max_bytes = int(os.getenv("CACHE_HOT_MAX_BYTES", str(1024**3)))
+# seconds a blob is kept after it's written.
+env_hot_ttl = int(os.getenv("CACHE_HOT_TTL", "86400"))
+# (query, repo) data larger than this many bytes is only kept in Postgres.
+env_hot_max_blob_bytes = int(os.getenv("CACHE_HOT_MAX_BLOB_BYTES", str(64 * 1024**2)))
+# codec for blobs of tables that don't have their own in cache_manager/codecs.py TABLE_CODECS.
+env_hot_codec = os.getenv("CACHE_HOT_CODEC", "lz4")
+
+# the cache pre-warmer collects data ahead of users' requests, see queries/cache_prewarm.py.
+# comma-separated repo_ids and org names that are always kept warm.
+env_prewarm_repos = os.getenv("CACHE_PREWARM_REPOS", "")
+# repos users selected within this many days are kept warm too.
+env_prewarm_recent_days = float(os.getenv("CACHE_PREWARM_RECENT_DAYS", "7"))
+# most recently selected repos that are kept warm.
+env_prewarm_max_repos = int(os.getenv("CACHE_PREWARM_MAX_REPOS", "500"))
+# repos collected per pre-warm job.
+env_prewarm_batch = int(os.getenv("CACHE_PREWARM_BATCH", "50"))
+# pre-warm jobs are only scheduled while fewer jobs than this are waiting on the 'data' queue,
+# so that users' own collections aren't stuck behind them.
+env_prewarm_max_queued = int(os.getenv("CACHE_PREWARM_MAX_QUEUED", "4"))
+
+# queries that read the same Augur source collect new repos together, see cache_manager/extracts.py.
+env_grouped_extraction = os.getenv("CACHE_GROUPED_EXTRACTION", "True") == "True"
@@ -46,7 +46,10 @@ To add a new table to the cache, simply copy an existing table
 creation block from those below. Given that you're creating a table
 for a query in the 'queries/' folder, name the table the same name
 as the query function. Name the columns of the table, and give their
-types, and everything should work!
+types, and everything should work! Then add the table's name to
+EVENT_TIME_COLUMNS (if its rows are timestamped events) or REPO_TABLES
+so that it's indexed by repo_id. Tables pre-aggregated from another
+cached table are described in rollups.py.
 
 Here's a list of types that postgres defines:
 https://www.postgresql.org/docs/current/datatype.html
@@ -57,11 +60,35 @@ Generally, 'int' is good for integers,
 'text' is best for text strings.
     - why we aren't using 'varchar':
     https://wiki.postgresql.org/wiki/Don%27t_Do_This#Don.27t_use_varchar.28n.29_by_default
+'timestamptz' is best for timestamps. Cache connections run in UTC, so
+    naive timestamps from Augur are stored as UTC, and cache_facade hands
+    them back to visualizations as datetime64[ns, UTC] columns.
+
+SCHEMA_VERSIONING:
+
+Because tables are created with "IF NOT EXISTS", changing the definition
+of a table that already exists in someone's cache won't do anything on its own.
+If you change an existing table, bump CACHE_SCHEMA_VERSION and add a
+function to _MIGRATIONS that brings a table of the previous version up
+to date (typically with ALTER TABLE). Migrations run in order on startup,
+before the tables are created.
+
+PARTITIONING:
+
+If CACHE_PARTITIONS is set to a number greater than 0, the tables in
+EVENT_TIME_COLUMNS are hash partitioned on repo_id into that many
+partitions, so that reading or evicting a repo's rows only touches
+the partition that holds them. On startup, any of these tables whose
+partitioning doesn't match CACHE_PARTITIONS (including existing
+unpartitioned tables, or 0 to undo partitioning) is rebuilt with
+its rows copied over.
 """
 
+import os
 import logging
 import sys
 import psycopg2 as pg
+from psycopg2 import sql as pg_sql
 
 # doesn't use relative import syntax "import .cx_common" because
 # cx_common is a neighbor of script, thus is available in PYTHON_PATH
@@ -102,6 +129,220 @@ def _create_application_database() -> None:
     conn.close()
 
 
+# version of the cache schema defined in _create_application_tables.
+CACHE_SCHEMA_VERSION = 6
+
+
+def _migration_2(cur) -> None:
+    """
+    Version 1 -> 2.
+
+    Timestamps were stored as text; store them as timestamptz.
+    Narrow ids whose Augur type is an integer.
+    """
+    # text timestamps from Augur are UTC without an offset.
+    cur.execute("SET LOCAL TIME ZONE 'UTC'")
+
+    timestamp_cols = {
+        "commits_query": ["author_timestamp", "committer_timestamp"],
+        "issues_query": ["created_at", "closed_at"],
+        "prs_query": ["created_at", "closed_at", "merged_at"],
+        "affiliation_query": ["created_at"],
+        "contributors_query": ["created_at"],
+        "issue_assignee_query": ["created_at", "closed_at", "assign_date"],
+        "pr_assignee_query": ["created_at", "closed_at", "assign_date"],
+        "repo_files_query": ["rl_analysis_date"],
+        "repo_releases_query": ["release_created_at", "release_published_at", "release_updated_at"],
+        "pr_response_query": ["msg_timestamp", "pr_created_at", "pr_closed_at"],
+    }
+    id_cols = {
+        "issues_query": [("repo_id", "int")],
+        "issue_assignee_query": [("issue_id", "bigint")],
+    }
+
+    for table in sorted(timestamp_cols.keys() | id_cols.keys()):
+        # one ALTER per table so that each table is only rewritten once.
+        alters = [
+            pg_sql.SQL("ALTER COLUMN {col} TYPE timestamptz USING {col}::timestamptz").format(col=pg_sql.Identifier(c))
+            for c in timestamp_cols.get(table, [])
+        ] + [
+            pg_sql.SQL("ALTER COLUMN {col} TYPE {typ} USING {col}::{typ}").format(
+                col=pg_sql.Identifier(c), typ=pg_sql.SQL(t)
+            )
+            for c, t in id_cols.get(table, [])
+        ]
+        cur.execute(
+            pg_sql.SQL("ALTER TABLE IF EXISTS {tbl} {alters}").format(
+                tbl=pg_sql.Identifier(table), alters=pg_sql.SQL(", ").join(alters)
+            )
+        )
+        logging.warning(f"MIGRATED {table} TABLE TO VERSION 2")
+
+
+def _migration_3(cur) -> None:
+    """
+    Version 2 -> 3.
+
+    cache_bookkeeping gets a unique (cache_func, repo_id) index in
+    _create_application_indexes. Remove the duplicate rows that
+    accumulated before then, keeping the most recent one.
+    """
+    cur.execute(
+        """
+        DELETE FROM cache_bookkeeping a
+        USING cache_bookkeeping b
+        WHERE
+            a.cache_func = b.cache_func
+            AND a.repo_id = b.repo_id
+            AND (a.ts_cached, a.ctid) < (b.ts_cached, b.ctid)
+        """
+    )
+    logging.warning(f"MIGRATED cache_bookkeeping TABLE TO VERSION 3, REMOVED {cur.rowcount} DUPLICATES")
+
+
+def _migration_4(cur) -> None:
+    """
+    Version 3 -> 4.
+
+    cache_bookkeeping records a watermark, the newest event cached for
+    each (cache_func, repo_id), so that stale repos can be refreshed
+    incrementally. Existing rows have no watermark and are refreshed in full.
+    """
+    cur.execute("ALTER TABLE IF EXISTS cache_bookkeeping ADD COLUMN IF NOT EXISTS watermark timestamptz")
+    logging.warning("MIGRATED cache_bookkeeping TABLE TO VERSION 4")
+
+
+def _migration_5(cur) -> None:
+    """
+    Version 4 -> 5.
+
+    cache_bookkeeping records when each (cache_func, repo_id) was last read
+    and how many rows it has, so that eviction can find cold repos and
+    estimate how much space removing them frees. Row counts of data
+    cached before this version are filled in from the cache tables.
+    """
+    cur.execute(
+        """
+        ALTER TABLE IF EXISTS cache_bookkeeping
+        ADD COLUMN IF NOT EXISTS last_accessed timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        ADD COLUMN IF NOT EXISTS n_rows bigint
+        """
+    )
+
+    cur.execute("SELECT DISTINCT cache_func FROM cache_bookkeeping WHERE to_regclass(cache_func) IS NOT NULL")
+    for (table,) in cur.fetchall():
+        cur.execute(
+            pg_sql.SQL(
+                """
+                UPDATE cache_bookkeeping cb
+                SET n_rows = (SELECT count(*) FROM {tbl} t WHERE t.repo_id = cb.repo_id)
+                WHERE cb.cache_func = %s
+                """
+            ).format(tbl=pg_sql.Identifier(table)),
+            (table,),
+        )
+    logging.warning("MIGRATED cache_bookkeeping TABLE TO VERSION 5")
+
+
+def _migration_6(cur) -> None:
+    """
+    Version 5 -> 6.
+
+    cache_bookkeeping is keyed by (cache_func, repo_id). The unique index
+    that _create_application_indexes used to build becomes the primary key,
+    or the key is built if the cache is older than that index.
+    """
+    cur.execute("SELECT to_regclass('cache_bookkeeping')")
+    (bookkeeping,) = cur.fetchone()
+    if bookkeeping is None:
+        return
+
+    cur.execute("DELETE FROM cache_bookkeeping WHERE cache_func IS NULL OR repo_id IS NULL")
+    cur.execute(
+        """
+        ALTER TABLE cache_bookkeeping
+        ALTER COLUMN cache_func SET NOT NULL,
+        ALTER COLUMN repo_id SET NOT NULL
+        """
+    )
+
+    cur.execute("SELECT to_regclass('cache_bookkeeping_func_repo_idx')")
+    (index,) = cur.fetchone()
+    if index is not None:
+        cur.execute(
+            """
+            ALTER TABLE cache_bookkeeping
+            ADD CONSTRAINT cache_bookkeeping_pkey PRIMARY KEY USING INDEX cache_bookkeeping_func_repo_idx
+            """
+        )
+    else:
+        cur.execute(
+            "ALTER TABLE cache_bookkeeping ADD CONSTRAINT cache_bookkeeping_pkey PRIMARY KEY (cache_func, repo_id)"
+        )
+    logging.warning("MIGRATED cache_bookkeeping TABLE TO VERSION 6")
+
+
+# maps schema version -> function that upgrades tables from the previous version.
+_MIGRATIONS = {
+    2: _migration_2,
+    3: _migration_3,
+    4: _migration_4,
+    5: _migration_5,
+    6: _migration_6,
+}
+
+
+def _get_schema_version(cur) -> int:
+    """
+    Reads the schema version recorded in the cache.
+
+    Caches created before versioning existed don't have a record,
+    and are version 1. A fresh cache is already at the current version
+    because _create_application_tables will build every table from scratch.
+    """
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cache_schema_version(
+            version int NOT NULL
+        )
+        """
+    )
+    cur.execute("SELECT max(version) FROM cache_schema_version")
+    (version,) = cur.fetchone()
+
+    if version is None:
+        cur.execute("SELECT to_regclass('cache_bookkeeping')")
+        (bookkeeping,) = cur.fetchone()
+        version = 1 if bookkeeping is not None else CACHE_SCHEMA_VERSION
+
+    return version
+
+
+def _migrate_application_tables() -> None:
+    """
+    Brings existing tables in 'augur_cache' up to CACHE_SCHEMA_VERSION
+    by running each migration in order, then records the new version.
+
+    All migrations are committed together, or not at all.
+    """
+    conn = pg.connect(cache_cx_string)
+
+    with conn.cursor() as cur:
+        version = _get_schema_version(cur)
+        logging.warning(f"CACHE SCHEMA AT VERSION {version}, CURRENT IS {CACHE_SCHEMA_VERSION}")
+
+        for v in range(version + 1, CACHE_SCHEMA_VERSION + 1):
+            logging.warning(f"MIGRATING CACHE SCHEMA TO VERSION {v}")
+            _MIGRATIONS[v](cur)
+
+        cur.execute("DELETE FROM cache_schema_version")
+        cur.execute("INSERT INTO cache_schema_version (version) VALUES (%s)", (CACHE_SCHEMA_VERSION,))
+
+        conn.commit()
+
+    conn.close()
+
+
 def _create_application_tables() -> None:
     """
     Creates tables for cached data in 'augur_cache' database.
@@ -110,8 +351,6 @@ def _create_application_tables() -> None:
         - commits
         - cache_bookkeeping
     """
-    # TODO: timestamps being stored as strings- don't need to do that anymore.
-
     # connect to application database
     conn = pg.connect(cache_cx_string)
 
@@ -125,8 +364,8 @@ def _create_application_tables() -> None:
                 commit_hash text, -- this is the commit hash, so it's base64 hash.
                 author_email text,
                 author_date text,
-                author_timestamp text,
-                committer_timestamp text)
+                author_timestamp timestamptz,
+                committer_timestamp timestamptz)
             """
         )
         logging.warning("CREATED commits TABLE")
@@ -134,15 +373,15 @@ def _create_application_tables() -> None:
         cur.execute(
             """
             CREATE UNLOGGED TABLE IF NOT EXISTS issues_query(
-                repo_id bigint,
+                repo_id int,
                 repo_name text,
                 issue bigint,
                 issue_number bigint,
                 gh_issue bigint,
                 reporter_id text,
                 issue_closer text,
-                created_at text,
-                closed_at text
+                created_at timestamptz,
+                closed_at timestamptz
             )
             """
         )
@@ -156,9 +395,9 @@ def _create_application_tables() -> None:
                 pull_request_id int,
                 pr_src_number int,
                 cntrb_id text,
-                created_at text,
-                closed_at text,
-                merged_at text
+                created_at timestamptz,
+                closed_at timestamptz,
+                merged_at timestamptz
             )
             """
         )
@@ -168,7 +407,7 @@ def _create_application_tables() -> None:
             """
             CREATE UNLOGGED TABLE IF NOT EXISTS affiliation_query(
                 cntrb_id text,
-                created_at text,
+                created_at timestamptz,
                 repo_id int,
                 login text,
                 action text,
@@ -186,7 +425,7 @@ def _create_application_tables() -> None:
                 repo_id int,
                 repo_name text,
                 cntrb_id text,
-                created_at text,
+                created_at timestamptz,
                 login text,
                 action text,
                 rank int
@@ -198,11 +437,11 @@ def _create_application_tables() -> None:
         cur.execute(
             """
             CREATE UNLOGGED TABLE IF NOT EXISTS issue_assignee_query(
-                issue_id text,
+                issue_id bigint,
                 repo_id int,
-                created_at text,
-                closed_at text,
-                assign_date text,
+                created_at timestamptz,
+                closed_at timestamptz,
+                assign_date timestamptz,
                 assignment_action text,
                 assignee text
             )
@@ -215,9 +454,9 @@ def _create_application_tables() -> None:
             CREATE UNLOGGED TABLE IF NOT EXISTS pr_assignee_query(
                 pull_request_id int,
                 repo_id int,
-                created_at text,
-                closed_at text,
-                assign_date text,
+                created_at timestamptz,
+                closed_at timestamptz,
+                assign_date timestamptz,
                 assignment_action text,
                 assignee text
             )
@@ -237,6 +476,61 @@ def _create_application_tables() -> None:
         )
         logging.warning("CREATED cntrb_per_file_query TABLE")
 
+        # rollups of contributors_query, see rollups.py.
+        cur.execute(
+            """
+            CREATE UNLOGGED TABLE IF NOT EXISTS contributors_monthly_rollup(
+                repo_id int,
+                month timestamptz,
+                action text,
+                cntrb_id text,
+                n_events int
+            )
+            """
+        )
+        logging.warning("CREATED contributors_monthly_rollup TABLE")
+
+        cur.execute(
+            """
+            CREATE UNLOGGED TABLE IF NOT EXISTS contributors_span_rollup(
+                repo_id int,
+                cntrb_id text,
+                first_seen timestamptz,
+                last_seen timestamptz,
+                n_events int
+            )
+            """
+        )
+        logging.warning("CREATED contributors_span_rollup TABLE")
+
+        # rollup of prs_query, see rollups.py.
+        cur.execute(
+            """
+            CREATE UNLOGGED TABLE IF NOT EXISTS prs_open_events_rollup(
+                repo_id int,
+                ts timestamptz,
+                delta int,
+                created_at timestamptz,
+                n_open int
+            )
+            """
+        )
+        logging.warning("CREATED prs_open_events_rollup TABLE")
+
+        # rollup of issues_query, see rollups.py.
+        cur.execute(
+            """
+            CREATE UNLOGGED TABLE IF NOT EXISTS issues_open_events_rollup(
+                repo_id int,
+                ts timestamptz,
+                delta int,
+                created_at timestamptz,
+                n_open int
+            )
+            """
+        )
+        logging.warning("CREATED issues_open_events_rollup TABLE")
+
         cur.execute(
             """
             CREATE UNLOGGED TABLE IF NOT EXISTS pr_file_query(
@@ -254,7 +548,7 @@ def _create_application_tables() -> None:
                 repo_id int,
                 repo_name text,
                 repo_path text,
-                rl_analysis_date text,
+                rl_analysis_date timestamptz,
                 file_path text,
                 file_name text
             )
@@ -293,9 +587,9 @@ def _create_application_tables() -> None:
             CREATE UNLOGGED TABLE IF NOT EXISTS repo_releases_query(
                 repo_id int,
                 release_name text,
-                release_created_at text,
-                release_published_at text,
-                release_updated_at text
+                release_created_at timestamptz,
+                release_published_at timestamptz,
+                release_updated_at timestamptz
             )
             """
         )
@@ -337,10 +631,10 @@ def _create_application_tables() -> None:
                 pull_request_id int,
                 repo_id int,
                 cntrb_id text,
-                msg_timestamp text,
+                msg_timestamp timestamptz,
                 msg_cntrb_id text,
-                pr_created_at text,
-                pr_closed_at text
+                pr_created_at timestamptz,
+                pr_closed_at timestamptz
             )
             """
         )
@@ -349,9 +643,13 @@ def _create_application_tables() -> None:
         cur.execute(
             """
             CREATE UNLOGGED TABLE IF NOT EXISTS cache_bookkeeping(
-                cache_func text,
-                repo_id int,
-                ts_cached timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+                cache_func text NOT NULL,
+                repo_id int NOT NULL,
+                ts_cached timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                watermark timestamptz,
+                last_accessed timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                n_rows bigint,
+                CONSTRAINT cache_bookkeeping_pkey PRIMARY KEY (cache_func, repo_id)
             )
             """
         )
@@ -363,6 +661,182 @@ def _create_application_tables() -> None:
     logging.warning("ALL TABLES COMMITTED SUCCESSFULLY")
 
 
+# event tables -> column that orders their rows in time.
+# these tables get a (repo_id, <time column>) index that serves both
+# "repo_id IN" lookups and time-range filters, and are physically
+# clustered on it so that a repo's rows sit on neighboring pages.
+# all other tables get a plain repo_id index.
+EVENT_TIME_COLUMNS = {
+    "commits_query": "author_timestamp",
+    "issues_query": "created_at",
+    "prs_query": "created_at",
+    "affiliation_query": "created_at",
+    "contributors_query": "created_at",
+    "issue_assignee_query": "created_at",
+    "pr_assignee_query": "created_at",
+    "pr_response_query": "msg_timestamp",
+}
+
+# cached tables that only need a repo_id index.
+REPO_TABLES = [
+    "cntrb_per_file_query",
+    "pr_file_query",
+    "repo_files_query",
+    "repo_languages_query",
+    "package_version_query",
+    "repo_releases_query",
+    "ossf_score_query",
+    "repo_info_query",
+    "contributors_monthly_rollup",
+    "contributors_span_rollup",
+    "prs_open_events_rollup",
+    "issues_open_events_rollup",
+]
+
+
+def _partition_count(cur, table: str) -> int | None:
+    """
+    Returns:
+        int | None: number of partitions of {table}, 0 if it isn't partitioned, None if it doesn't exist.
+    """
+    cur.execute(
+        """
+        SELECT c.relkind, (SELECT count(*) FROM pg_inherits i WHERE i.inhparent = c.oid)
+        FROM pg_class c
+        WHERE c.oid = to_regclass(%s)
+        """,
+        (table,),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    relkind, n_partitions = row
+    return n_partitions if relkind == "p" else 0
+
+
+def _partition_application_tables() -> None:
+    """
+    Rebuilds each table in EVENT_TIME_COLUMNS whose partitioning doesn't
+    match CACHE_PARTITIONS: hash partitioned on repo_id into that many
+    UNLOGGED partitions, or a plain UNLOGGED table if it's 0.
+
+    Existing rows are copied into the rebuilt table. Each table is
+    rebuilt in its own transaction.
+    """
+    n = int(os.getenv("CACHE_PARTITIONS", "0"))
+
+    conn = pg.connect(cache_cx_string)
+
+    with conn.cursor() as cur:
+        for table in EVENT_TIME_COLUMNS:
+            current = _partition_count(cur, table)
+            if current is None or current == n:
+                continue
+
+            logging.warning(f"REPARTITIONING {table} TABLE FROM {current} TO {n} PARTITIONS")
+            tbl = pg_sql.Identifier(table)
+            old = pg_sql.Identifier(f"{table}_old")
+
+            cur.execute(pg_sql.SQL("ALTER TABLE {tbl} RENAME TO {old}").format(tbl=tbl, old=old))
+            if n > 0:
+                # the parent holds no rows, only its partitions are UNLOGGED.
+                cur.execute(
+                    pg_sql.SQL("CREATE TABLE {tbl} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY HASH (repo_id)").format(
+                        tbl=tbl, old=old
+                    )
+                )
+                for i in range(n):
+                    cur.execute(
+                        pg_sql.SQL(
+                            "CREATE UNLOGGED TABLE {part} PARTITION OF {tbl} FOR VALUES WITH (MODULUS %s, REMAINDER %s)"
+                        ).format(part=pg_sql.Identifier(f"{table}_p{i}_of_{n}"), tbl=tbl),
+                        (n, i),
+                    )
+            else:
+                cur.execute(
+                    pg_sql.SQL("CREATE UNLOGGED TABLE {tbl} (LIKE {old} INCLUDING DEFAULTS)").format(tbl=tbl, old=old)
+                )
+
+            cur.execute(pg_sql.SQL("INSERT INTO {tbl} SELECT * FROM {old}").format(tbl=tbl, old=old))
+            logging.warning(f"COPIED {cur.rowcount} ROWS INTO {table} TABLE")
+
+            # also drops the old table's partitions and indexes.
+            cur.execute(pg_sql.SQL("DROP TABLE {old}").format(old=old))
+
+            conn.commit()
+
+    conn.close()
+
+    logging.warning("ALL TABLES PARTITIONED SUCCESSFULLY")
+
+
+def _create_application_indexes() -> None:
+    """
+    Creates indexes for tables in 'augur_cache' database.
+
+    Indexes created:
+        - (repo_id, <time column>) on event tables, marked for CLUSTER
+            unless the table is partitioned
+        - repo_id on all other cache tables
+
+    If CACHE_CLUSTER_ON_INIT is "True", event tables are also re-ordered
+    on disk with CLUSTER. This takes an exclusive lock on each table, so
+    it's off by default.
+    """
+    conn = pg.connect(cache_cx_string)
+
+    with conn.cursor() as cur:
+        for table, time_col in EVENT_TIME_COLUMNS.items():
+            idx_name = f"{table}_repo_id_{time_col}_idx"
+            cur.execute(
+                pg_sql.SQL("CREATE INDEX IF NOT EXISTS {idx} ON {tbl} (repo_id, {col})").format(
+                    idx=pg_sql.Identifier(idx_name),
+                    tbl=pg_sql.Identifier(table),
+                    col=pg_sql.Identifier(time_col),
+                )
+            )
+            # only records which index CLUSTER should use, doesn't reorder anything.
+            # can't be recorded on partitioned tables.
+            if _partition_count(cur, table) == 0:
+                cur.execute(
+                    pg_sql.SQL("ALTER TABLE {tbl} CLUSTER ON {idx}").format(
+                        tbl=pg_sql.Identifier(table),
+                        idx=pg_sql.Identifier(idx_name),
+                    )
+                )
+            logging.warning(f"CREATED {table} INDEX")
+
+        for table in REPO_TABLES:
+            cur.execute(
+                pg_sql.SQL("CREATE INDEX IF NOT EXISTS {idx} ON {tbl} (repo_id)").format(
+                    idx=pg_sql.Identifier(f"{table}_repo_id_idx"),
+                    tbl=pg_sql.Identifier(table),
+                )
+            )
+            logging.warning(f"CREATED {table} INDEX")
+
+        # commit changes, all-or-nothing.
+        conn.commit()
+
+    logging.warning("ALL INDEXES COMMITTED SUCCESSFULLY")
+
+    if os.getenv("CACHE_CLUSTER_ON_INIT", "False") == "True":
+        with conn.cursor() as cur:
+            for table, time_col in EVENT_TIME_COLUMNS.items():
+                logging.warning(f"CLUSTERING {table} TABLE")
+                cur.execute(
+                    pg_sql.SQL("CLUSTER {tbl} USING {idx}").format(
+                        tbl=pg_sql.Identifier(table),
+                        idx=pg_sql.Identifier(f"{table}_repo_id_{time_col}_idx"),
+                    )
+                )
+                # refresh planner statistics after the table is rewritten.
+                cur.execute(pg_sql.SQL("ANALYZE {tbl}").format(tbl=pg_sql.Identifier(table)))
+                conn.commit()
+
+    conn.close()
+
+
 def db_init() -> int:
     try:
         # don't need to check return values- errors propogate as exceptions,
@@ -371,9 +845,18 @@ def db_init() -> int:
         # create augur_cache db if it doesn't already exist.
         _create_application_database()
 
+        # upgrade tables from an older version of the schema.
+        _migrate_application_tables()
+
         # add tables to augur_cache db if they don't already exist.
         _create_application_tables()
 
+        # (re)partition event tables to match CACHE_PARTITIONS.
+        _partition_application_tables()
+
+        # add indexes to tables if they don't already exist.
+        _create_application_indexes()
+
         logging.warning("db_init: POSTGRES CACHE SUCCESSFULLY INITIALIZED")
 
         return 0
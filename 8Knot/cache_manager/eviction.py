@@ -0,0 +1,292 @@
+"""
+Size-budgeted eviction for the Postgres cache database.
+
+Every repo a user explores is cached for every query, forever, unless
+something removes it. This module keeps the cached data within a budget
+by removing the (cache_func, repo_id) entries that haven't been read for
+the longest, as recorded in cache_bookkeeping.last_accessed.
+
+Postgres doesn't give tables' space back to the OS when rows are deleted,
+so the budget is enforced on an estimate of the size of the cached rows:
+each entry's row count (cache_bookkeeping.n_rows) times its table's average
+row size. Space freed by eviction is vacuumed, and then reused by new data,
+so the database's size on disk levels off near the budget.
+
+compact_bookkeeping keeps cache_bookkeeping itself small: it drops entries
+for tables that no longer exist and vacuums the dead rows left behind by
+the bookkeeping upserts and last_accessed updates.
+"""
+import logging
+from datetime import timedelta
+import psycopg2 as pg
+from psycopg2 import sql as pg_sql
+
+# requires relative import syntax, see cache_facade.
+from .cx_common import cache_cx_string, env_cache_max_bytes, env_evict_batch, env_evict_min_idle
+
+# bytes per cached row that aren't part of the row's values:
+# tuple header and line pointer in the table, and its index entries.
+_ROW_OVERHEAD_BYTES = 64
+
+# rows sampled per table to measure its average row size.
+_ROW_SAMPLE = 10000
+
+# entries evicted by this process.
+_evictions = 0
+
+
+def lock_entries(cache_cur, cache_func: str, repolist: list[int]) -> None:
+    """
+    Takes the transaction-level advisory lock of each (cache_func, repo_id)
+    entry of {repolist}. Writers of an entry's rows and bookkeeping take it
+    before writing, and eviction before deleting them, so neither sees the
+    other's uncommitted changes. Locks are taken in repo order to avoid deadlocks.
+    """
+    cache_cur.execute(
+        "SELECT pg_advisory_xact_lock(hashtext(%s), r) FROM unnest(%s::int[]) AS r",
+        (cache_func, sorted(set(repolist))),
+    )
+
+
+def _row_bytes(cache_cur) -> dict[str, float]:
+    """
+    Estimates the average size of a row in each table that has
+    bookkeeping entries.
+
+    Returns:
+        dict[str, float]: table name -> bytes per row
+    """
+    cache_cur.execute("SELECT DISTINCT cache_func FROM cache_bookkeeping WHERE to_regclass(cache_func) IS NOT NULL")
+    tables = [t for (t,) in cache_cur.fetchall()]
+
+    row_bytes = {}
+    for table in tables:
+        cache_cur.execute(
+            pg_sql.SQL("SELECT avg(pg_column_size(t.*)) FROM (SELECT * FROM {tbl} LIMIT %s) t").format(
+                tbl=pg_sql.Identifier(table)
+            ),
+            (_ROW_SAMPLE,),
+        )
+        (width,) = cache_cur.fetchone()
+        row_bytes[table] = float(width or 0) + _ROW_OVERHEAD_BYTES
+    return row_bytes
+
+
+def _entries(cache_cur, row_bytes: dict[str, float]) -> list[tuple]:
+    """
+    Lists bookkeeping entries, least recently read first.
+
+    Returns:
+        list[tuple]: (cache_func, repo_id, last_accessed, n_rows, estimated bytes) per entry
+    """
+    cache_cur.execute(
+        """
+        SELECT cb.cache_func, cb.repo_id, cb.last_accessed, coalesce(cb.n_rows, 0)
+        FROM cache_bookkeeping cb
+        ORDER BY cb.last_accessed, cb.cache_func, cb.repo_id
+        """
+    )
+    return [(f, r, a, n, n * row_bytes.get(f, 0.0)) for (f, r, a, n) in cache_cur.fetchall()]
+
+
+def cache_footprint() -> dict:
+    """
+    Reports the size of the cache.
+
+    Returns:
+        dict: entries, estimated_bytes (cached rows), database_bytes (on disk),
+                max_bytes (budget) and evictions (by this process)
+    """
+    cache_conn = pg.connect(cache_cx_string)
+    try:
+        with cache_conn:
+            with cache_conn.cursor() as cache_cur:
+                entries = _entries(cache_cur, _row_bytes(cache_cur))
+                cache_cur.execute("SELECT pg_database_size(current_database())")
+                (database_bytes,) = cache_cur.fetchone()
+    finally:
+        cache_conn.close()
+
+    return {
+        "entries": len(entries),
+        "estimated_bytes": int(sum(e[4] for e in entries)),
+        "database_bytes": database_bytes,
+        "max_bytes": env_cache_max_bytes,
+        "evictions": _evictions,
+    }
+
+
+def evict(
+    max_bytes: int = env_cache_max_bytes,
+    batch_size: int = env_evict_batch,
+    min_idle: timedelta = timedelta(seconds=env_evict_min_idle),
+) -> dict:
+    """
+    Evicts the least recently read (cache_func, repo_id) entries until the
+    estimated size of the cached rows fits in {max_bytes}.
+
+    Each batch of {batch_size} entries is deleted from the cache tables and
+    cache_bookkeeping in its own transaction, holding the entries' locks
+    so that rows a query is writing aren't deleted. Entries read or cached
+    within {min_idle} are never evicted, even if the cache stays over budget,
+    including ones read or cached while earlier batches were evicted. The
+    evicted entries' hot tier blobs are removed. In-process DataFrame caches
+    are keyed by the bookkeeping versions that eviction deletes, so they
+    never serve evicted data. Tables, or for partitioned tables only the
+    partitions, that had rows deleted are vacuumed afterwards.
+
+    Returns:
+        dict: evicted (entries), evicted_rows, estimated_bytes before and after, max_bytes
+    """
+    global _evictions
+
+    # cache_facade imports this module.
+    from . import cache_facade as cf
+
+    cache_conn = pg.connect(cache_cx_string)
+    try:
+        with cache_conn:
+            with cache_conn.cursor() as cache_cur:
+                entries = _entries(cache_cur, _row_bytes(cache_cur))
+                cache_cur.execute("SELECT LOCALTIMESTAMP")
+                (now,) = cache_cur.fetchone()
+
+        before = sum(e[4] for e in entries)
+        excess = before - max_bytes
+        logging.warning(f"CACHE EVICTION - ESTIMATED {before:.0f} BYTES CACHED, BUDGET {max_bytes}")
+
+        # coldest entries first, until enough space would be freed.
+        victims = []
+        for entry in entries:
+            if excess <= 0 or entry[2] > now - min_idle:
+                break
+            victims.append(entry)
+            excess -= entry[4]
+
+        touched = set()
+        evicted = []
+        for i in range(0, len(victims), batch_size):
+            batch = victims[i : i + batch_size]
+
+            entries_by_func = {}
+            for entry in sorted(batch):
+                entries_by_func.setdefault(entry[0], {})[entry[1]] = entry
+
+            # repo_id -> ts_cached of the entries deleted, per table.
+            versions_by_func = {}
+            with cache_conn:
+                with cache_conn.cursor() as cache_cur:
+                    for f, func_entries in entries_by_func.items():
+                        # waits for queries writing these entries, see lock_entries.
+                        lock_entries(cache_cur, f, list(func_entries))
+
+                        # entries read or cached again since they were listed are kept.
+                        cache_cur.execute(
+                            """
+                            SELECT cb.repo_id, cb.ts_cached
+                            FROM cache_bookkeeping cb
+                            WHERE
+                                cb.cache_func = %s
+                                AND cb.repo_id IN %s
+                                AND cb.last_accessed <= LOCALTIMESTAMP - %s
+                                AND cb.ts_cached <= LOCALTIMESTAMP - %s
+                            """,
+                            (f, tuple(func_entries), min_idle, min_idle),
+                        )
+                        versions = dict(cache_cur.fetchall())
+                        if not versions:
+                            continue
+                        repos = sorted(versions)
+
+                        # the table, or the partitions of it, that hold these repos' rows.
+                        cache_cur.execute(
+                            pg_sql.SQL(
+                                """
+                                SELECT DISTINCT p.rel
+                                FROM unnest(%s::int[]) AS r (repo_id),
+                                LATERAL (
+                                    SELECT t.tableoid::regclass::text AS rel
+                                    FROM {tbl} t
+                                    WHERE t.repo_id = r.repo_id
+                                    LIMIT 1
+                                ) p
+                                """
+                            ).format(tbl=pg_sql.Identifier(f)),
+                            (repos,),
+                        )
+                        touched |= {rel for (rel,) in cache_cur.fetchall()}
+
+                        cache_cur.execute(
+                            pg_sql.SQL("DELETE FROM {tbl} WHERE repo_id IN %s").format(tbl=pg_sql.Identifier(f)),
+                            (tuple(repos),),
+                        )
+                        cache_cur.execute(
+                            "DELETE FROM cache_bookkeeping WHERE cache_func = %s AND repo_id IN %s",
+                            (f, tuple(repos)),
+                        )
+                        versions_by_func[f] = versions
+
+            # the hot tier's blobs of the deleted data can't be read anymore, free their space now.
+            for f, versions in versions_by_func.items():
+                cf.drop_hot_tier(f, versions)
+                evicted.extend(entries_by_func[f][r] for r in versions)
+
+            n_evicted = sum(len(v) for v in versions_by_func.values())
+            _evictions += n_evicted
+            logging.warning(
+                f"CACHE EVICTION - EVICTED {n_evicted} ENTRIES FROM {sorted(versions_by_func)}, "
+                f"KEPT {len(batch) - n_evicted} READ OR CACHED SINCE"
+            )
+
+        # VACUUM can't run in a transaction.
+        cache_conn.autocommit = True
+        with cache_conn.cursor() as cache_cur:
+            for rel in sorted(touched):
+                # rel is already quoted by regclass output.
+                cache_cur.execute(pg_sql.SQL("VACUUM (ANALYZE) {rel}").format(rel=pg_sql.SQL(rel)))
+                logging.warning(f"CACHE EVICTION - VACUUMED {rel}")
+    finally:
+        cache_conn.close()
+
+    after = before - sum(e[4] for e in evicted)
+    logging.warning(f"CACHE EVICTION - EVICTED {len(evicted)} ENTRIES, ESTIMATED {after:.0f} BYTES CACHED")
+
+    return {
+        "evicted": len(evicted),
+        "evicted_rows": sum(e[3] for e in evicted),
+        "estimated_bytes_before": int(before),
+        "estimated_bytes_after": int(after),
+        "max_bytes": max_bytes,
+    }
+
+
+def compact_bookkeeping() -> dict:
+    """
+    Removes cache_bookkeeping entries of queries whose cache table
+    no longer exists, then vacuums cache_bookkeeping.
+
+    Plain VACUUM makes dead rows' space reusable without locking out
+    the readers and writers of cache_bookkeeping, unlike VACUUM FULL.
+
+    Returns:
+        dict: removed (orphaned entries) and entries (remaining)
+    """
+    cache_conn = pg.connect(cache_cx_string)
+    try:
+        with cache_conn:
+            with cache_conn.cursor() as cache_cur:
+                cache_cur.execute("DELETE FROM cache_bookkeeping WHERE to_regclass(cache_func) IS NULL")
+                removed = cache_cur.rowcount
+                cache_cur.execute("SELECT count(*) FROM cache_bookkeeping")
+                (entries,) = cache_cur.fetchone()
+
+        # VACUUM can't run in a transaction.
+        cache_conn.autocommit = True
+        with cache_conn.cursor() as cache_cur:
+            cache_cur.execute("VACUUM (ANALYZE) cache_bookkeeping")
+    finally:
+        cache_conn.close()
+
+    logging.warning(f"CACHE BOOKKEEPING COMPACTED - REMOVED {removed} ORPHANED ENTRIES, {entries} REMAIN")
+
+    return {"removed": removed, "entries": entries}
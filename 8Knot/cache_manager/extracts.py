@@ -0,0 +1,256 @@
+"""
+Grouped extraction of queries that read the same Augur source.
+
+Some queries scan the same base relation for the same repos, e.g.
+contributors_query and affiliation_query both read
+explorer_contributor_actions, and prs_query, pr_file_query and
+cntrb_per_file_query all read pull_requests. Run as separate jobs,
+each scans the primary database on its own.
+
+An extract group declares that shared source once:
+
+    base: a SELECT on Augur for the repos in %s, streamed once into a
+        temporary table on the cache named extract_<group>.
+
+    lookups: SELECTs on Augur for rows related to the base rows, keyed
+        by one of its columns, e.g. the files of its pull requests. Each
+        is given the distinct keys as an array in %s and streamed into a
+        temporary table named extract_<lookup>. A lookup is only run if
+        a member that's being collected uses it.
+
+    members: per member query, the SELECT on the cache that builds its
+        cache table's rows for the repos in %s from the temporary tables,
+        the lookups it uses, and the column whose per-repo max is recorded
+        as its bookkeeping watermark (its REFRESH_POLICY time_column).
+
+When a member collects repos that aren't cached, cache_facade.caching_wrapper
+collects them for every member of its group that hasn't cached them in the
+same transaction, see cache_facade._extract_group. Stale repos are still
+refreshed by each query on its own, following its REFRESH_POLICY.
+
+Each member's SELECT must return exactly what its query in 'queries/'
+returns, in the same order, so change them together. tests/test_extracts.py
+checks that they do.
+"""
+
+# group -> {"base": {...}, "lookups": {name: {...}}, "members": {query: {...}}}
+# base and lookups: "columns" of the temporary table and the Augur "query" that fills it.
+EXTRACTS = {
+    "contributor_actions": {
+        "base": {
+            "columns": """
+                repo_id bigint,
+                repo_name text,
+                cntrb_id uuid,
+                created_at timestamp,
+                login text,
+                action text,
+                rank bigint
+            """,
+            "query": """
+                SELECT
+                    ca.repo_id,
+                    ca.repo_name,
+                    ca.cntrb_id,
+                    timezone('utc', ca.created_at) AS created_at,
+                    ca.login,
+                    ca.action,
+                    ca.rank
+                FROM
+                    explorer_contributor_actions ca
+                WHERE
+                    ca.repo_id in %s
+                    and timezone('utc', ca.created_at) < now() -- created_at is a timestamptz value
+            """,
+        },
+        "lookups": {
+            # one row per (contributor, alias), the contributor's company repeated.
+            "contributor_aliases": {
+                "key": "cntrb_id",
+                "columns": """
+                    cntrb_id uuid,
+                    cntrb_company text,
+                    alias_email text
+                """,
+                "query": """
+                    SELECT
+                        ca.cntrb_id,
+                        con.cntrb_company,
+                        ca.alias_email
+                    FROM
+                        contributors_aliases ca
+                    JOIN contributors con
+                        ON ca.cntrb_id = con.cntrb_id
+                    WHERE
+                        ca.cntrb_id = ANY(%s::uuid[])
+                """,
+            },
+        },
+        "members": {
+            "contributors_query": {
+                "select": """
+                    SELECT
+                        c.repo_id,
+                        c.repo_name,
+                        left(c.cntrb_id::text, 15) as cntrb_id,
+                        c.created_at,
+                        c.login,
+                        c.action,
+                        c.rank
+                    FROM extract_contributor_actions c
+                    WHERE c.repo_id IN %s
+                """,
+                "lookups": [],
+                "watermark_column": "created_at",
+            },
+            "affiliation_query": {
+                "select": """
+                    SELECT
+                        left(c.cntrb_id::text, 15),
+                        c.created_at,
+                        c.repo_id,
+                        c.login,
+                        c.action,
+                        c.rank,
+                        a.cntrb_company,
+                        string_agg(a.alias_email, ' , ' order by a.alias_email) as email_list
+                    FROM extract_contributor_actions c
+                    JOIN extract_contributor_aliases a
+                        ON c.cntrb_id = a.cntrb_id
+                    WHERE c.repo_id IN %s
+                    GROUP BY c.cntrb_id, c.created_at, c.repo_id, c.login, c.action, c.rank, a.cntrb_company
+                    ORDER BY c.created_at
+                """,
+                "lookups": ["contributor_aliases"],
+                "watermark_column": "created_at",
+            },
+        },
+    },
+    "pull_requests": {
+        "base": {
+            "columns": """
+                pull_request_id bigint,
+                repo_id bigint,
+                repo_name text,
+                pr_src_number bigint,
+                pr_augur_contributor_id uuid,
+                pr_created_at timestamp,
+                pr_closed_at timestamp,
+                pr_merged_at timestamp,
+                settled boolean
+            """,
+            "query": """
+                SELECT
+                    pr.pull_request_id,
+                    r.repo_id,
+                    r.repo_name,
+                    pr.pr_src_number,
+                    pr.pr_augur_contributor_id,
+                    -- values are timestamp not timestamptz
+                    pr.pr_created_at,
+                    pr.pr_closed_at,
+                    pr.pr_merged_at,
+                    -- prs_query only keeps PRs whose events are all in the past, by Augur's clock.
+                    pr.pr_created_at < now()
+                        and (pr.pr_closed_at < now() or pr.pr_closed_at IS NULL)
+                        and (pr.pr_merged_at < now() or pr.pr_merged_at IS NULL) AS settled
+                FROM
+                    repo r,
+                    pull_requests pr
+                WHERE
+                    r.repo_id = pr.repo_id AND
+                    r.repo_id in %s
+            """,
+        },
+        "lookups": {
+            "pr_files": {
+                "key": "pull_request_id",
+                "columns": """
+                    pull_request_id bigint,
+                    pr_file_path text
+                """,
+                "query": """
+                    SELECT
+                        prf.pull_request_id,
+                        prf.pr_file_path
+                    FROM
+                        pull_request_files prf
+                    WHERE
+                        prf.pull_request_id = ANY(%s::bigint[])
+                """,
+            },
+            # only used for distinct reviewers, so duplicates aren't kept.
+            "pr_reviewers": {
+                "key": "pull_request_id",
+                "columns": """
+                    pull_request_id bigint,
+                    cntrb_id uuid
+                """,
+                "query": """
+                    SELECT DISTINCT
+                        prr.pull_request_id,
+                        prr.cntrb_id
+                    FROM
+                        pull_request_reviews prr
+                    WHERE
+                        prr.pull_request_id = ANY(%s::bigint[])
+                """,
+            },
+        },
+        "members": {
+            "prs_query": {
+                "select": """
+                    SELECT
+                        pr.repo_id,
+                        pr.repo_name,
+                        pr.pull_request_id AS pull_request,
+                        pr.pr_src_number,
+                        left(pr.pr_augur_contributor_id::text, 15) as cntrb_id,
+                        pr.pr_created_at AS created,
+                        pr.pr_closed_at AS closed,
+                        pr.pr_merged_at AS merged
+                    FROM extract_pull_requests pr
+                    WHERE pr.repo_id IN %s AND pr.settled
+                    ORDER BY pr.pr_created_at
+                """,
+                "lookups": [],
+                "watermark_column": None,
+            },
+            "pr_file_query": {
+                "select": """
+                    SELECT
+                        prf.pr_file_path as file_path,
+                        pr.pull_request_id AS pull_request,
+                        pr.repo_id as id
+                    FROM extract_pull_requests pr
+                    JOIN extract_pr_files prf
+                        ON pr.pull_request_id = prf.pull_request_id
+                    WHERE pr.repo_id IN %s
+                """,
+                "lookups": ["pr_files"],
+                "watermark_column": None,
+            },
+            "cntrb_per_file_query": {
+                "select": """
+                    SELECT
+                        pr.repo_id as repo_id,
+                        prf.pr_file_path as file_path,
+                        string_agg(DISTINCT CAST(pr.pr_augur_contributor_id AS varchar(15)), ',') AS cntrb_ids,
+                        string_agg(DISTINCT CAST(prr.cntrb_id AS varchar(15)), ',') AS reviewer_ids
+                    FROM extract_pull_requests pr
+                    JOIN extract_pr_files prf
+                        ON pr.pull_request_id = prf.pull_request_id
+                    JOIN extract_pr_reviewers prr
+                        ON pr.pull_request_id = prr.pull_request_id
+                    WHERE pr.repo_id IN %s
+                    GROUP BY prf.pr_file_path, pr.repo_id
+                """,
+                "lookups": ["pr_files", "pr_reviewers"],
+                "watermark_column": None,
+            },
+        },
+    },
+}
+
+# member query -> its extract group.
+EXTRACT_GROUPS = {member: group for group, spec in EXTRACTS.items() for member in spec["members"]}
@@ -0,0 +1,124 @@
+"""
+In-process LRU cache of DataFrames retrieved from the Postgres cache.
+
+Many visualizations on a page read the same table for the same repos,
+and read it again whenever one of their controls changes. Keeping recently
+retrieved DataFrames in the worker's memory skips the database round trip
+and the DataFrame construction for those repeat reads.
+
+Entries are keyed by (tablename, frozenset(repos), read spec, bookkeeping
+version), where the read spec is the projection and date range requested.
+The version changes whenever bookkeeping for those repos changes, so new
+data is never hidden behind a stale entry.
+"""
+import threading
+from collections import OrderedDict
+import pandas as pd
+
+
+class FrameCache:
+    """
+    Memory-bounded LRU cache of DataFrames.
+
+    Callers receive shallow copies that share their values with the stored
+    DataFrame, so neither a hit nor a miss holds the data twice. Callers may
+    add, replace, drop or rename the columns and rows of the DataFrames they
+    receive, but must not modify values in place, e.g. with .loc assignment
+    or fillna(inplace=True). Callers that do copy the DataFrame first.
+
+    Attributes
+    ----------
+        max_bytes (int): budget for the sum of stored DataFrames' sizes.
+
+    Methods
+    -------
+        get(key):
+            Returns a shallow copy of the DataFrame at key, None if absent.
+
+        put(key, df):
+            Stores a shallow copy of df at key, evicting least-recently-used
+            entries to stay within max_bytes. Returns df.
+
+        stats():
+            Returns hit/miss/eviction counters and current footprint.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (DataFrame, size in bytes), least recently used first.
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key) -> pd.DataFrame | None:
+        """
+        Returns a shallow copy of the DataFrame stored at key, or None if absent.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            df = entry[0]
+        return df.copy(deep=False)
+
+    def put(self, key, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Stores a shallow copy of df at key, so the caller's changes to df's
+        columns and rows don't change the stored DataFrame. Entries for the
+        same (tablename, repos) with a different bookkeeping version are
+        dropped, then least-recently-used entries are evicted until the cache
+        fits in max_bytes.
+
+        DataFrames larger than max_bytes aren't stored.
+
+        Returns:
+            pd.DataFrame: df, for the caller to use.
+        """
+        # deep=True counts the strings in object columns, not just pointers.
+        size = int(df.memory_usage(index=True, deep=True).sum())
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            for k in [k for k in self._entries if k[:2] == key[:2] and k[-1] != key[-1]]:
+                self._remove(k)
+
+            if size <= self.max_bytes:
+                self._entries[key] = (df.copy(deep=False), size)
+                self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+        return df
+
+    def _remove(self, key):
+        _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: hits, misses, evictions, entries, bytes and max_bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
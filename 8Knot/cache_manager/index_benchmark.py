@@ -0,0 +1,209 @@
+"""
+Measures how much db_init's indexes speed up cache lookups.
+
+Fills temporary copies of cache_bookkeeping and an event table with
+synthetic data for <repos> repos, then times the lookups every
+visualization makes, for a few repos at a time:
+
+    uncached:   get_uncached_many's bookkeeping lookup for every cached query
+    versions:   retrieve_from_cache's bookkeeping version lookup
+    rows:       retrieve_from_cache's SELECT of the repos' rows
+    rows range: the same, limited to a year of the rows
+
+on the tables as they are without indexes, with db_init's indexes, and
+after the event table is clustered on its index (CACHE_CLUSTER_ON_INIT).
+The temporary tables shadow the real ones in this session only, the
+cache's own tables aren't read or changed.
+
+Usage, from the directory containing cache_manager/ with the app's
+environment variables set:
+    python -m cache_manager.index_benchmark [<repos> [<rows per repo> [<lookups>]]]
+"""
+import sys
+import time
+import numpy as np
+import psycopg2 as pg
+from psycopg2 import sql as pg_sql
+from .cx_common import cache_cx_string
+from . import cache_facade as cf
+
+# event table whose rows are looked up, and its time column, see db_init.EVENT_TIME_COLUMNS.
+# db_init runs as a script, it can't be imported from here.
+_TABLE = "prs_query"
+_TIME_COLUMN = "created_at"
+
+# queries with bookkeeping entries, as many as db_init indexes.
+_QUERIES = [_TABLE] + [f"query_{i}" for i in range(19)]
+
+# repos selected per lookup.
+_REPOS_PER_LOOKUP = 10
+
+
+def _fill(cache_conn, n_repos: int, rows_per_repo: int) -> None:
+    """
+    Creates the temporary tables, every query cached for every repo and
+    the event table's rows in random order, as they'd land from many collections.
+    """
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute(
+            """
+            CREATE TEMPORARY TABLE cache_bookkeeping(
+                cache_func text NOT NULL,
+                repo_id int NOT NULL,
+                ts_cached timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                watermark timestamptz,
+                last_accessed timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                n_rows bigint
+            )
+            """
+        )
+        cache_cur.execute(
+            """
+            INSERT INTO cache_bookkeeping (cache_func, repo_id, n_rows)
+            SELECT f, r, %s
+            FROM unnest(%s::text[]) AS f, generate_series(1, %s) AS r
+            ORDER BY random()
+            """,
+            (rows_per_repo, _QUERIES, n_repos),
+        )
+
+        cache_cur.execute(
+            pg_sql.SQL(
+                """
+                CREATE TEMPORARY TABLE {tbl}(
+                    repo_id int,
+                    repo_name text,
+                    pull_request_id int,
+                    pr_src_number int,
+                    cntrb_id text,
+                    created_at timestamptz,
+                    closed_at timestamptz,
+                    merged_at timestamptz
+                )
+                """
+            ).format(tbl=pg_sql.Identifier(_TABLE))
+        )
+        cache_cur.execute(
+            pg_sql.SQL(
+                """
+                INSERT INTO {tbl}
+                SELECT r, 'repo-' || r, r * %s + i, i, md5(i::text), c, c + interval '3 days', NULL
+                FROM (
+                    SELECT r, i, timestamptz '2024-01-01' - random() * interval '3650 days' AS c
+                    FROM generate_series(1, %s) AS r, generate_series(1, %s) AS i
+                ) AS prs
+                ORDER BY random()
+                """
+            ).format(tbl=pg_sql.Identifier(_TABLE)),
+            (rows_per_repo, n_repos, rows_per_repo),
+        )
+        cache_cur.execute("ANALYZE cache_bookkeeping")
+        cache_cur.execute(pg_sql.SQL("ANALYZE {tbl}").format(tbl=pg_sql.Identifier(_TABLE)))
+    cache_conn.commit()
+
+
+def _index(cache_conn) -> None:
+    """
+    Adds db_init's indexes to the temporary tables.
+    """
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute("ALTER TABLE cache_bookkeeping ADD PRIMARY KEY (cache_func, repo_id)")
+        cache_cur.execute(
+            pg_sql.SQL("CREATE INDEX {idx} ON {tbl} (repo_id, {col})").format(
+                idx=pg_sql.Identifier(f"{_TABLE}_repo_id_{_TIME_COLUMN}_idx"),
+                tbl=pg_sql.Identifier(_TABLE),
+                col=pg_sql.Identifier(_TIME_COLUMN),
+            )
+        )
+        cache_cur.execute("ANALYZE cache_bookkeeping")
+        cache_cur.execute(pg_sql.SQL("ANALYZE {tbl}").format(tbl=pg_sql.Identifier(_TABLE)))
+    cache_conn.commit()
+
+
+def _cluster(cache_conn) -> None:
+    """
+    Re-orders the event table on its index, like CACHE_CLUSTER_ON_INIT.
+    """
+    with cache_conn.cursor() as cache_cur:
+        cache_cur.execute(
+            pg_sql.SQL("CLUSTER {tbl} USING {idx}").format(
+                tbl=pg_sql.Identifier(_TABLE),
+                idx=pg_sql.Identifier(f"{_TABLE}_repo_id_{_TIME_COLUMN}_idx"),
+            )
+        )
+        cache_cur.execute(pg_sql.SQL("ANALYZE {tbl}").format(tbl=pg_sql.Identifier(_TABLE)))
+    cache_conn.commit()
+
+
+def _time_lookups(cache_conn, n_repos: int, n_lookups: int, seed: int = 0) -> dict[str, float]:
+    """
+    Returns:
+        dict[str, float]: lookup -> median milliseconds over n_lookups random repo selections
+    """
+    rng = np.random.default_rng(seed)
+
+    def rows(repolist, start_date=None):
+        select, select_vars = cf._select_from_cache(_TABLE, repolist, None, _TIME_COLUMN, start_date, None)
+        with cache_conn.cursor() as cache_cur:
+            cache_cur.execute(select, select_vars)
+            cache_cur.fetchall()
+
+    lookups = {
+        "uncached": lambda repolist: cf._uncached_many(cache_conn, _QUERIES, repolist),
+        "versions": lambda repolist: cf._bookkeeping_versions(cache_conn, _TABLE, repolist),
+        "rows": lambda repolist: rows(repolist),
+        "rows range": lambda repolist: rows(repolist, "2023-01-01"),
+    }
+
+    timings = {}
+    for name, lookup in lookups.items():
+        elapsed = []
+        for _ in range(n_lookups):
+            repolist = [int(r) for r in rng.choice(n_repos, _REPOS_PER_LOOKUP, replace=False) + 1]
+            start = time.perf_counter()
+            lookup(repolist)
+            elapsed.append(time.perf_counter() - start)
+        cache_conn.rollback()
+        timings[name] = float(np.median(elapsed)) * 1000
+    return timings
+
+
+def benchmark(n_repos: int, rows_per_repo: int, n_lookups: int) -> list[dict]:
+    """
+    Returns:
+        list[dict]: per stage of indexing- stage, and the median milliseconds of each lookup
+    """
+    cache_conn = pg.connect(cache_cx_string)
+    try:
+        _fill(cache_conn, n_repos, rows_per_repo)
+
+        results = [{"stage": "no indexes", **_time_lookups(cache_conn, n_repos, n_lookups)}]
+        _index(cache_conn)
+        results.append({"stage": "indexed", **_time_lookups(cache_conn, n_repos, n_lookups)})
+        _cluster(cache_conn)
+        results.append({"stage": "clustered", **_time_lookups(cache_conn, n_repos, n_lookups)})
+    finally:
+        # temporary tables are dropped with the session.
+        cache_conn.close()
+
+    return results
+
+
+def main(argv: list[str]) -> None:
+    n_repos = int(argv[0]) if len(argv) > 0 else 10_000
+    rows_per_repo = int(argv[1]) if len(argv) > 1 else 100
+    n_lookups = int(argv[2]) if len(argv) > 2 else 200
+
+    print(
+        f"{n_repos} repos, {n_repos * len(_QUERIES)} bookkeeping rows, {n_repos * rows_per_repo} {_TABLE} rows, "
+        f"median of {n_lookups} lookups of {_REPOS_PER_LOOKUP} repos, in ms"
+    )
+    results = benchmark(n_repos, rows_per_repo, n_lookups)
+    names = [k for k in results[0] if k != "stage"]
+    print(f"{'stage':<14}" + "".join(f"{n:>12}" for n in names))
+    for r in results:
+        print(f"{r['stage']:<14}" + "".join(f"{r[n]:>12.2f}" for n in names))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,145 @@
+"""
+Redis registry of the query jobs collecting (query, repo) data for the cache.
+
+When two users, or two tabs, select overlapping repos at the same time, both
+find the same repos uncached and would each schedule a job to collect them,
+doing the Augur work twice and caching the rows twice. Before scheduling,
+a job claims a lease on each (query, repo) it will collect; repos already
+leased by another job are left to that job, and the caller waits on it instead.
+
+A job's leases are released once its rows are committed, see
+queries/sharded_collection.py collection_complete. Leases expire after
+CACHE_INFLIGHT_LEASE seconds, so a job lost with a crashed worker doesn't
+hold its repos forever. Leases held by jobs that have finished, e.g.
+failed ones, can be taken over with reclaim.
+"""
+import os
+import redis
+from .cx_common import env_inflight_lease
+
+# takes over the leases in KEYS that are still held by ARGV[1], giving them to ARGV[2].
+_RECLAIM = """
+local taken = {}
+for i, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[1] then
+        redis.call('SET', key, ARGV[2], 'EX', ARGV[3])
+        table.insert(taken, i)
+    end
+end
+return taken
+"""
+
+# drops the leases in KEYS that are held by ARGV[1].
+_RELEASE = """
+local n = 0
+for _, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[1] then
+        n = n + redis.call('DEL', key)
+    end
+end
+return n
+"""
+
+
+class InflightRegistry:
+    """
+    Leases on (func, repo) collections, held by the id of the job collecting them.
+
+    Attributes
+    ----------
+        _redis : (private) Redis object
+
+    Methods
+    -------
+        claim(func_name, [repo], job_id):
+            Leases the unleased repos to job_id, returns each repo's lease holder.
+
+        reclaim(func_name, [repo], old_job_id, job_id):
+            Moves the repos' leases held by old_job_id to job_id.
+
+        release(func_name, [repo], job_id):
+            Drops the repos' leases held by job_id.
+    """
+
+    def __init__(self, lease_seconds=env_inflight_lease):
+        # same Redis as the CacheManager and the celery broker.
+        self._redis = redis.StrictRedis(
+            host=os.getenv("REDIS_SERVICE_HOST", "redis-cache"),
+            port=os.getenv("REDIS_SERVICE_PORT", "6379"),
+            password=os.getenv("REDIS_PASSWORD", ""),
+            decode_responses=True,
+        )
+        self._lease_seconds = lease_seconds
+        self._reclaim = self._redis.register_script(_RECLAIM)
+        self._release = self._redis.register_script(_RELEASE)
+
+    @staticmethod
+    def _key(func_name, repo):
+        return f"8knot:inflight:{func_name}:{repo}"
+
+    def claim(self, func_name, repos, job_id):
+        """
+        Leases each repo in repos that isn't already leased to job_id.
+
+        Args:
+            func_name (str): name of the query
+            repos (list[int]): repo_ids to collect
+            job_id (str): id of the job that would collect them
+
+        Returns:
+            dict[int, str]: repo_id -> id of the job holding its lease,
+                            job_id for the repos claimed here.
+        """
+        keys = [self._key(func_name, r) for r in repos]
+
+        # SET NX only succeeds for unleased keys; GET reads the holder either way.
+        pipe = self._redis.pipeline()
+        for key in keys:
+            pipe.set(key, job_id, nx=True, ex=self._lease_seconds)
+            pipe.get(key)
+        results = pipe.execute()
+
+        # a lease could expire between the SET and GET, leaving no holder.
+        # the caller will collect the repo itself in that case.
+        holders = results[1::2]
+        return {r: h or job_id for r, h in zip(repos, holders)}
+
+    def reclaim(self, func_name, repos, old_job_id, job_id):
+        """
+        Moves the leases of repos held by old_job_id to job_id.
+
+        Args:
+            func_name (str): name of the query
+            repos (list[int]): repo_ids leased to old_job_id
+            old_job_id (str): id of the job whose leases are taken over
+            job_id (str): id of the job taking them over
+
+        Returns:
+            list[int]: repo_ids now leased to job_id
+        """
+        if not repos:
+            return []
+
+        keys = [self._key(func_name, r) for r in repos]
+        taken = self._reclaim(keys=keys, args=[old_job_id, job_id, self._lease_seconds])
+
+        # lua tables are 1-indexed.
+        return [repos[i - 1] for i in taken]
+
+    def release(self, func_name, repos, job_id):
+        """
+        Drops the leases of repos held by job_id.
+
+        Args:
+            func_name (str): name of the query
+            repos (list[int]): repo_ids leased to job_id
+            job_id (str): id of the job holding the leases
+
+        Returns:
+            int: number of leases dropped
+        """
+        if not repos:
+            return 0
+
+        keys = [self._key(func_name, r) for r in repos]
+        return self._release(keys=keys, args=[job_id])
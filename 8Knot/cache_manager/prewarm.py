@@ -0,0 +1,65 @@
+"""
+Pre-warms the cache by hand, e.g. before a demo or after the cache was reset.
+
+Collects the data of every query in QUERIES that isn't cached or is stale
+for the given repos and orgs, or for CACHE_PREWARM_REPOS and the repos users
+selected recently if none are given, see queries/cache_prewarm.py. At most
+--max-jobs batches are collected at a time, and progress is printed as
+they finish.
+
+Usage, from the directory containing cache_manager/ with the app's
+environment variables set and the query workers running:
+    python -m cache_manager.prewarm [--max-jobs N] [--batch N] [--no-recent] [<repo_id or org> ...]
+"""
+import sys
+import time
+import argparse
+from .cx_common import env_prewarm_batch, env_prewarm_max_queued
+
+# seconds between checks on the running batches.
+_POLL_SECONDS = 2.0
+
+
+def main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="python -m cache_manager.prewarm", usage=__doc__)
+    parser.add_argument("targets", nargs="*", help="repo_ids and org names")
+    parser.add_argument("--max-jobs", type=int, default=env_prewarm_max_queued, help="batches collected at a time")
+    parser.add_argument("--batch", type=int, default=env_prewarm_batch, help="repos per batch")
+    parser.add_argument("--no-recent", action="store_true", help="don't include recently selected repos")
+    args = parser.parse_args(argv)
+
+    # importing the queries starts the app, connecting to Augur.
+    from celery.result import AsyncResult
+    from queries.cache_prewarm import prewarm_repos, plan_prewarm, dispatch_prewarm
+
+    repos = prewarm_repos(args.targets or None, recent=not args.no_recent)
+    batches = plan_prewarm(repos, batch_size=args.batch)
+    total = len(batches)
+    print(f"{len(repos)} repos, {total} batches to collect")
+
+    running = []
+    done = failed = 0
+    while batches or running:
+        for ids in dispatch_prewarm(batches, args.max_jobs - len(running)):
+            running.append([AsyncResult(j) for j in ids])
+
+        time.sleep(_POLL_SECONDS)
+
+        still_running = []
+        for results in running:
+            if not all(r.ready() for r in results):
+                still_running.append(results)
+            elif all(r.successful() for r in results):
+                done += 1
+            else:
+                failed += 1
+        if len(still_running) < len(running):
+            print(f"{done + failed}/{total} batches finished, {failed} failed, {len(still_running)} running")
+        running = still_running
+
+    if failed:
+        sys.exit(f"{failed} of {total} batches failed, see the query workers' logs")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
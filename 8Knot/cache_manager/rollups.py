@@ -0,0 +1,94 @@
+"""
+Rollup tables, pre-aggregated from a query's cached rows.
+
+Many visualizations re-aggregate the same raw event stream on every
+callback, e.g. counting contributors_query events per month. A rollup
+materializes that aggregate per repo when the source query caches or
+refreshes the repo, so those visualizations read a much smaller table.
+
+Each rollup is a cache table of its own, created in db_init, with its
+own cache_bookkeeping entries. cache_facade.caching_wrapper rebuilds a
+repo's rollups after caching it, and cache_facade.ensure_rollup rebuilds
+any that are missing, e.g. after eviction, before they're read.
+
+To add a rollup, create its table in db_init (and add it to REPO_TABLES),
+then add its SELECT to ROLLUPS under its source table. The SELECT reads
+the source table's rows for the repos in %s and returns the rollup
+table's columns in order.
+"""
+
+
+def _open_events(source: str) -> str:
+    """
+    Builds the open/close events of the PRs or issues in {source}, with each
+    repo's running count of open items after each event's timestamp.
+
+    An item opens at created_at and closes at closed_at, or at created_at
+    if it was closed before it was created. Closing events carry the item's
+    created_at too, so that open items can be counted by age.
+    See pages/utils/interval_utils.py.
+    """
+    return f"""
+        WITH items AS (
+            SELECT
+                t.repo_id,
+                t.created_at,
+                CASE WHEN t.closed_at IS NOT NULL THEN greatest(t.closed_at, t.created_at) END AS closed_at
+            FROM {source} t
+            WHERE t.repo_id IN %s AND t.created_at IS NOT NULL
+        ),
+        events AS (
+            SELECT i.repo_id, i.created_at AS ts, 1 AS delta, i.created_at FROM items i
+            UNION ALL
+            SELECT i.repo_id, i.closed_at AS ts, -1 AS delta, i.created_at FROM items i WHERE i.closed_at IS NOT NULL
+        )
+        SELECT
+            e.repo_id,
+            e.ts,
+            e.delta,
+            e.created_at,
+            -- includes every event at the same ts.
+            sum(e.delta) OVER (PARTITION BY e.repo_id ORDER BY e.ts) AS n_open
+        FROM events e
+    """
+
+
+# source table -> {rollup table: SELECT building the rollup's rows for repo_id IN %s}
+ROLLUPS = {
+    "contributors_query": {
+        # events per (repo, month, action, contributor).
+        # date_trunc uses the session time zone, cache connections run in UTC.
+        "contributors_monthly_rollup": """
+            SELECT
+                c.repo_id,
+                date_trunc('month', c.created_at) AS month,
+                c.action,
+                c.cntrb_id,
+                count(*) AS n_events
+            FROM contributors_query c
+            WHERE c.repo_id IN %s
+            GROUP BY 1, 2, 3, 4
+        """,
+        # first and most recent event per (repo, contributor).
+        "contributors_span_rollup": """
+            SELECT
+                c.repo_id,
+                c.cntrb_id,
+                min(c.created_at) AS first_seen,
+                max(c.created_at) AS last_seen,
+                count(*) AS n_events
+            FROM contributors_query c
+            WHERE c.repo_id IN %s
+            GROUP BY 1, 2
+        """,
+    },
+    "prs_query": {
+        "prs_open_events_rollup": _open_events("prs_query"),
+    },
+    "issues_query": {
+        "issues_open_events_rollup": _open_events("issues_query"),
+    },
+}
+
+# rollup table -> its source table.
+ROLLUP_SOURCES = {rollup: source for source, rollups in ROLLUPS.items() for rollup in rollups}
@@ -0,0 +1,76 @@
+"""
+Redis log of the repos users select, which the cache pre-warmer
+collects ahead of time, see queries/cache_prewarm.py.
+
+Each repo is kept in a sorted set scored by the last time it was selected,
+so recently selected repos can be read back most recent first. Repos
+that haven't been selected for CACHE_PREWARM_RECENT_DAYS are dropped.
+"""
+import os
+import time
+import redis
+from .cx_common import env_prewarm_recent_days
+
+# sorted set of repo_id, scored by the time it was last selected.
+_SELECTIONS_KEY = "8knot:usage:repos"
+
+
+class UsageLog:
+    """
+    When each repo was last selected.
+
+    Attributes
+    ----------
+        _redis : (private) Redis object
+        max_age (float): seconds a selection is remembered
+
+    Methods
+    -------
+        record([repo]):
+            Records that the repos were selected now.
+
+        recent(limit):
+            Returns the repos selected within max_age, most recent first.
+    """
+
+    def __init__(self, max_age=env_prewarm_recent_days * 86400):
+        # same Redis as the CacheManager and the celery broker.
+        self._redis = redis.StrictRedis(
+            host=os.getenv("REDIS_SERVICE_HOST", "redis-cache"),
+            port=os.getenv("REDIS_SERVICE_PORT", "6379"),
+            password=os.getenv("REDIS_PASSWORD", ""),
+            decode_responses=True,
+        )
+        self.max_age = max_age
+
+    def record(self, repos):
+        """
+        Records that repos were selected now.
+
+        Args:
+            repos (list[int]): selected repo_ids
+        """
+        if not repos:
+            return
+
+        now = time.time()
+        pipe = self._redis.pipeline()
+        pipe.zadd(_SELECTIONS_KEY, {r: now for r in repos})
+        # forget repos that haven't been selected in a while.
+        pipe.zremrangebyscore(_SELECTIONS_KEY, "-inf", now - self.max_age)
+        pipe.execute()
+
+    def recent(self, limit=None):
+        """
+        Args:
+            limit (int, optional): most repos to return
+
+        Returns:
+            list[int]: repo_ids selected within max_age, most recent first
+        """
+        since = time.time() - self.max_age
+        if limit is None:
+            repos = self._redis.zrevrangebyscore(_SELECTIONS_KEY, "+inf", since)
+        else:
+            repos = self._redis.zrevrangebyscore(_SELECTIONS_KEY, "+inf", since, start=0, num=limit)
+        return [int(r) for r in repos]
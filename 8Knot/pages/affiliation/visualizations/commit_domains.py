@@ -133,9 +133,7 @@ def toggle_popover(n, is_open):
 )
 def commit_domains_graph(repolist, num, start_date, end_date):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=cmq.__name__, repolist=repolist):
-        logging.warning(f"COMMITS_OVER_TIME_VIZ - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=cmq.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
@@ -163,9 +161,6 @@ def commit_domains_graph(repolist, num, start_date, end_date):
 def process_data(df: pd.DataFrame, num, start_date, end_date):
     # TODO: create docstring
 
-    # convert to datetime objects rather than strings
-    df["author_timestamp"] = pd.to_datetime(df["author_timestamp"], utc=True)
-
     # order values chronologically by author_timestamp date earliest to latest
     df = df.sort_values(by="author_timestamp", axis=0, ascending=True)
 
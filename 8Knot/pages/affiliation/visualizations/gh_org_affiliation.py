@@ -132,9 +132,7 @@ def toggle_popover(n, is_open):
 )
 def gh_org_affiliation_graph(repolist, num, start_date, end_date, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=aq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=aq.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
@@ -143,6 +141,10 @@ def gh_org_affiliation_graph(repolist, num, start_date, end_date, bot_switch):
     df = cf.retrieve_from_cache(
         tablename=aq.__name__,
         repolist=repolist,
+        columns=["cntrb_id", "created_at", "cntrb_company"],
+        date_column="created_at",
+        start_date=start_date,
+        end_date=end_date,
     )
     # test if there is data
     if df.empty:
@@ -167,9 +169,6 @@ def process_data(df: pd.DataFrame, num, start_date, end_date):
     The output of this function is the data you intend to create a visualization with,
     requiring no further processing."""
 
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-
     # order values chronologically by COLUMN_TO_SORT_BY date
     df = df.sort_values(by="created_at", axis=0, ascending=True)
 
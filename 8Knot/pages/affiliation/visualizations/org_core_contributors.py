@@ -180,9 +180,7 @@ def compay_associated_activity_graph(
     bot_switch,
 ):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=aq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=aq.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
@@ -191,6 +189,10 @@ def compay_associated_activity_graph(
     df = cf.retrieve_from_cache(
         tablename=aq.__name__,
         repolist=repolist,
+        columns=["cntrb_id", "created_at", "email_list"],
+        date_column="created_at",
+        start_date=start_date,
+        end_date=end_date,
     )
 
     # test if there is data
@@ -212,9 +214,6 @@ def compay_associated_activity_graph(
 
 
 def process_data(df: pd.DataFrame, contributions, contributors, start_date, end_date, email_filter):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-
     # order values chronologically by COLUMN_TO_SORT_BY date
     df = df.sort_values(by="created_at", axis=0, ascending=True)
 
@@ -167,18 +167,18 @@ def toggle_popover(n, is_open):
 )
 def cntrib_pr_assignment_graph(repolist, interval, assign_req, start_date, end_date, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=praq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID} - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=praq.__name__, repolist=repolist)
 
     # data ready.
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
 
     # GET ALL DATA FROM POSTGRES CACHE
+    # assign_req is counted over all history, so the date range is applied in process_data.
     df = cf.retrieve_from_cache(
         tablename=praq.__name__,
         repolist=repolist,
+        columns=["created_at", "closed_at", "assign_date", "assignment_action", "assignee"],
     )
 
     start = time.perf_counter()
@@ -207,11 +207,6 @@ def cntrib_pr_assignment_graph(repolist, interval, assign_req, start_date, end_d
 
 
 def process_data(df: pd.DataFrame, interval, assign_req, start_date, end_date):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    df["closed_at"] = pd.to_datetime(df["closed_at"], utc=True)
-    df["assign_date"] = pd.to_datetime(df["assign_date"], utc=True)
-
     # order values chronologically by created date
     df = df.sort_values(by="created_at", axis=0, ascending=True)
 
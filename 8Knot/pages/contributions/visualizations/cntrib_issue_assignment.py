@@ -167,9 +167,7 @@ def toggle_popover(n, is_open):
 )
 def cntrib_issue_assignment_graph(repolist, interval, assign_req, start_date, end_date, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=iaq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID} - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=iaq.__name__, repolist=repolist)
 
     # data ready.
     start = time.perf_counter()
@@ -204,11 +202,6 @@ def cntrib_issue_assignment_graph(repolist, interval, assign_req, start_date, en
 
 
 def process_data(df: pd.DataFrame, interval, assign_req, start_date, end_date):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    df["closed_at"] = pd.to_datetime(df["closed_at"], utc=True)
-    df["assign_date"] = pd.to_datetime(df["assign_date"], utc=True)
-
     # order values chronologically by created date
     df = df.sort_values(by="created_at", axis=0, ascending=True)
 
@@ -115,9 +115,7 @@ def toggle_popover(n, is_open):
 )
 def commits_over_time_graph(repolist, interval):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=cmq.__name__, repolist=repolist):
-        logging.warning(f"COMMITS_OVER_TIME_VIZ - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=cmq.__name__, repolist=repolist)
 
     # data ready.
     start = time.perf_counter()
@@ -116,9 +116,7 @@ def toggle_popover(n, is_open):
 )
 def cntrib_issue_assignment_graph(repolist, interval, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=iaq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID} - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=iaq.__name__, repolist=repolist)
 
     # data ready.
     start = time.perf_counter()
@@ -137,6 +135,8 @@ def cntrib_issue_assignment_graph(repolist, interval, bot_switch):
 
     # remove assignment data if assigned to a bot
     if bot_switch:
+        # assignments are cleared in place, don't change the cached data.
+        df = df.copy()
         df["bot"] = df["assignee"].isin(app.bots_list)
         df.loc[df.bot == True, "assign_date"] = None
         df.loc[df.bot == True, "assignment_action"] = None
@@ -151,11 +151,6 @@ def cntrib_issue_assignment_graph(repolist, interval, bot_switch):
 
 
 def process_data(df: pd.DataFrame, interval):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    df["closed_at"] = pd.to_datetime(df["closed_at"], utc=True)
-    df["assign_date"] = pd.to_datetime(df["assign_date"], utc=True)
-
     # order values chronologically by created date
     df = df.sort_values(by="created_at", axis=0, ascending=True)
 
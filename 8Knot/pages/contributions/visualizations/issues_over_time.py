@@ -8,6 +8,7 @@ import pandas as pd
 import logging
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from pages.utils.job_utils import nodata_graph
+from pages.utils.interval_utils import open_counts
 from queries.issues_query import issues_query as iq
 import time
 import cache_manager.cache_facade as cf
@@ -140,9 +141,7 @@ def toggle_popover(n, is_open):
 )
 def issues_over_time_graph(repolist, interval, start_date, end_date):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=iq.__name__, repolist=repolist):
-        logging.warning(f"ISSUES OVER TIME - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=iq.__name__, repolist=repolist)
 
     # data ready.
     start = time.perf_counter()
@@ -170,9 +169,10 @@ def issues_over_time_graph(repolist, interval, start_date, end_date):
 
 
 def process_data(df: pd.DataFrame, interval, start_date, end_date):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=False)
-    df["closed_at"] = pd.to_datetime(df["closed_at"], utc=False)
+    # cache hands back UTC timestamps. drop the timezone so that
+    # comparisons with the date picker's naive dates still work.
+    df["created_at"] = df["created_at"].dt.tz_localize(None)
+    df["closed_at"] = df["closed_at"].dt.tz_localize(None)
 
     # order values chronologically by creation date
     df = df.sort_values(by="created_at", axis=0, ascending=True)
@@ -222,8 +222,8 @@ def process_data(df: pd.DataFrame, interval, start_date, end_date):
     # df for open issues for time interval
     df_open = dates.to_frame(index=False, name="Date")
 
-    # aplies function to get the amount of open issues for each day
-    df_open["Open"] = df_open.apply(lambda row: get_open(df, row.Date), axis=1)
+    # number of open issues at each date, from the running count of opened and closed issues
+    df_open["Open"] = open_counts(df["created_at"], df["closed_at"], dates)
 
     # formatting for graph generation
     if interval == "M":
@@ -288,19 +288,3 @@ def create_figure(df_created: pd.DataFrame, df_closed: pd.DataFrame, df_open: pd
     )
 
     return fig
-
-
-# for each day, this function calculates the amount of open issues
-def get_open(df, date):
-    # drop rows that are more recent than the date limit
-    df_lim = df[df["created_at"] <= date]
-
-    # drops rows that have been closed after date
-    df_open = df_lim[df_lim["closed_at"] > date]
-
-    # include issues that have not been close yet
-    df_open = pd.concat([df_open, df_lim[df_lim.closed_at.isnull()]])
-
-    # generates number of columns ie open issues
-    num_open = df_open.shape[0]
-    return num_open
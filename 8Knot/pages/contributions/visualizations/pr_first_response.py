@@ -13,6 +13,7 @@ import io
 from cache_manager.cache_manager import CacheManager as cm
 import cache_manager.cache_facade as cf
 from pages.utils.job_utils import nodata_graph
+from pages.utils.interval_utils import open_counts
 import time
 import app
 
@@ -112,17 +113,18 @@ def toggle_popover(n, is_open):
     background=True,
 )
 def pr_first_response_graph(repolist, num_days, bot_switch):
-    while not_cached := cf.get_uncached(func_name=prr.__name__, repolist=repolist):
-        logging.warning(f"PR_FIRST_RESPONSE - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=prr.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
 
     # GET ALL DATA FROM POSTGRES CACHE
-    df = cf.retrieve_from_cache(
+    # each PR's first response, kept in memory so that changing num_days doesn't rebuild it
+    df = cf.retrieve_derived(
         tablename=prr.__name__,
         repolist=repolist,
+        derivation=f"first_responses(bot_switch={bool(bot_switch)})",
+        build=lambda df: first_responses(df, bot_switch),
     )
 
     # test if there is data
@@ -130,10 +132,6 @@ def pr_first_response_graph(repolist, num_days, bot_switch):
         logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
-    # remove bot data
-    if bot_switch:
-        df = df[~df["cntrb_id"].isin(app.bots_list)]
-
     df = process_data(df, num_days)
 
     fig = create_figure(df, num_days)
@@ -142,11 +140,15 @@ def pr_first_response_graph(repolist, num_days, bot_switch):
     return fig
 
 
-def process_data(df: pd.DataFrame, num_days):
-    # convert to datetime objects rather than strings
-    df["msg_timestamp"] = pd.to_datetime(df["msg_timestamp"], utc=True)
-    df["pr_created_at"] = pd.to_datetime(df["pr_created_at"], utc=True)
-    df["pr_closed_at"] = pd.to_datetime(df["pr_closed_at"], utc=True)
+def first_responses(df: pd.DataFrame, bot_switch) -> pd.DataFrame:
+    """
+    Returns:
+        pd.DataFrame: one row per PR with a message from someone besides its creator, with the
+                        time of the first such message
+    """
+    # remove bot data
+    if bot_switch:
+        df = df[~df["cntrb_id"].isin(app.bots_list)]
 
     # drop messages from the pr creator
     df = df[df["cntrb_id"] != df["msg_cntrb_id"]]
@@ -155,6 +157,10 @@ def process_data(df: pd.DataFrame, num_days):
     df = df.sort_values(by="msg_timestamp", axis=0, ascending=True)
     df = df.drop_duplicates(subset="pull_request_id", keep="first")
 
+    return df[["pull_request_id", "pr_created_at", "pr_closed_at", "msg_timestamp"]].reset_index(drop=True)
+
+
+def process_data(df: pd.DataFrame, num_days):
     # first and last elements of the dataframe are the
     # earliest and latest events respectively
     earliest = df["pr_created_at"].min()
@@ -167,12 +173,13 @@ def process_data(df: pd.DataFrame, num_days):
     df_pr_responses = dates.to_frame(index=False, name="Date")
 
     # every day, count the number of PRs that are open on that day and the number of
-    # those that were responded to within num_days of their opening
-    df_pr_responses["Open"], df_pr_responses["Response"] = zip(
-        *df_pr_responses.apply(
-            lambda row: get_open_response(df, row.Date, num_days),
-            axis=1,
-        )
+    # those that were responded to within num_days of their opening.
+    # whether a PR was responded to in time doesn't depend on the day, so both are
+    # running counts of opened and closed PRs.
+    responded = df["msg_timestamp"] < df["pr_created_at"] + pd.DateOffset(days=num_days)
+    df_pr_responses["Open"] = open_counts(df["pr_created_at"], df["pr_closed_at"], dates)
+    df_pr_responses["Response"] = open_counts(
+        df.loc[responded, "pr_created_at"], df.loc[responded, "pr_closed_at"], dates
     )
 
     df_pr_responses["Date"] = df_pr_responses["Date"].dt.strftime("%Y-%m-%d")
@@ -210,47 +217,3 @@ def create_figure(df: pd.DataFrame, num_days):
     )
 
     return fig
-
-
-def get_open_response(df, date, num_days):
-    """
-    This function takes a date and determines how many
-    prs in that time interval are opened and if they have a response within num_days.
-
-    Args:
-    -----
-        df : Pandas Dataframe
-            Dataframe with pr assignment actions of the assignees
-
-        date : Datetime Timestamp
-            Timestamp of the date
-
-        num_days : int
-            number of days that a response should be within
-
-    Returns:
-    --------
-        int, int: Number of opened and responded to prs within num_days on the day
-    """
-    # drop rows that are more recent than the date limit
-    df_created = df[df["pr_created_at"] <= date]
-
-    # drops rows that have been closed after date
-    df_open = df_created[df_created["pr_closed_at"] > date]
-
-    # include prs that have not been close yet
-    df_open = pd.concat([df_open, df_created[df_created.pr_closed_at.isnull()]])
-
-    # column to hold date num_days after the pr_creation date for comparision
-    df_open["response_by"] = df_open["pr_created_at"] + pd.DateOffset(days=num_days)
-
-    # Inlcude only the prs that msg timestamp is before the responded by time
-    df_response = df_open[df_open["msg_timestamp"] < df_open["response_by"]]
-
-    # generates number of columns ie open prs
-    num_open = df_open.shape[0]
-
-    # number of prs that had response in time interval
-    num_response = df_response.shape[0]
-
-    return num_open, num_response
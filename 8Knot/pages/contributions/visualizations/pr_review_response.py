@@ -10,6 +10,7 @@ import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from queries.pr_response_query import pr_response_query as prr
 from pages.utils.job_utils import nodata_graph
+from pages.utils.interval_utils import open_counts, interval_counts
 import time
 import app
 import cache_manager.cache_facade as cf
@@ -111,17 +112,18 @@ def toggle_popover(n, is_open):
     background=True,
 )
 def pr_review_response_graph(repolist, num_days, bot_switch):
-    while not_cached := cf.get_uncached(func_name=prr.__name__, repolist=repolist):
-        logging.warning(f"PR_FIRST_RESPONSE - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=prr.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
 
     # GET ALL DATA FROM POSTGRES CACHE
-    df = cf.retrieve_from_cache(
+    # each PR's most recent message, kept in memory so that changing num_days doesn't rebuild it
+    df = cf.retrieve_derived(
         tablename=prr.__name__,
         repolist=repolist,
+        derivation=f"last_messages(bot_switch={bool(bot_switch)})",
+        build=lambda df: last_messages(df, bot_switch),
     )
 
     # test if there is data
@@ -129,10 +131,6 @@ def pr_review_response_graph(repolist, num_days, bot_switch):
         logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return nodata_graph
 
-    # remove bot data
-    if bot_switch:
-        df = df[~df["cntrb_id"].isin(app.bots_list)]
-
     df = process_data(df, num_days)
 
     fig = create_figure(df, num_days)
@@ -141,11 +139,15 @@ def pr_review_response_graph(repolist, num_days, bot_switch):
     return fig
 
 
-def process_data(df: pd.DataFrame, num_days):
-    # convert to datetime objects rather than strings
-    df["msg_timestamp"] = pd.to_datetime(df["msg_timestamp"], utc=True)
-    df["pr_created_at"] = pd.to_datetime(df["pr_created_at"], utc=True)
-    df["pr_closed_at"] = pd.to_datetime(df["pr_closed_at"], utc=True)
+def last_messages(df: pd.DataFrame, bot_switch) -> pd.DataFrame:
+    """
+    Returns:
+        pd.DataFrame: one row per PR, with the time and author of its most recent message,
+                        or no message if the PR has any without a time
+    """
+    # remove bot data
+    if bot_switch:
+        df = df[~df["cntrb_id"].isin(app.bots_list)]
 
     # sort in ascending earlier and only get ealiest value
     df = df.sort_values(by="msg_timestamp", axis=0, ascending=True)
@@ -153,6 +155,12 @@ def process_data(df: pd.DataFrame, num_days):
     # 1 row per pr with either null msg date or most recent if one exists
     df = df.drop_duplicates(subset="pull_request_id", keep="last")
 
+    return df[
+        ["pull_request_id", "cntrb_id", "pr_created_at", "pr_closed_at", "msg_timestamp", "msg_cntrb_id"]
+    ].reset_index(drop=True)
+
+
+def process_data(df: pd.DataFrame, num_days):
     # first and last elements of the dataframe are the
     # earliest and latest events respectively
     earliest = df["pr_created_at"].min()
@@ -165,19 +173,47 @@ def process_data(df: pd.DataFrame, num_days):
     df_pr_responses = dates.to_frame(index=False, name="Date")
 
     # every day, count the number of PRs that are open on that day and the number of
-    # those that were responded to within num_days of their opening
-    df_pr_responses["Open"], df_pr_responses["Response"] = zip(
-        *df_pr_responses.apply(
-            lambda row: get_open_response(df, row.Date, num_days),
-            axis=1,
-        )
-    )
+    # those whose most recent message, before that day, was within num_days of it
+    # or by someone other than the pr creator.
+    df_pr_responses["Open"] = open_counts(df["pr_created_at"], df["pr_closed_at"], dates)
+    df_pr_responses["Response"] = interval_counts(*response_intervals(df, num_days), dates)
 
     df_pr_responses["Date"] = df_pr_responses["Date"].dt.strftime("%Y-%m-%d")
 
     return df_pr_responses
 
 
+def response_intervals(df: pd.DataFrame, num_days):
+    """
+    The days a PR counts as responded to: while it's open and after its most recent message,
+    until num_days after the message if the pr creator wrote it, as long as it's open otherwise.
+
+    Args:
+    -----
+        df : Pandas Dataframe
+            one row per PR, see last_messages
+
+        num_days : int
+            number of days that a response should be within
+
+    Returns:
+    --------
+        pd.Series, pd.Series: start and end of each PR's [start, end) interval, the start is
+                                missing for PRs without a message
+    """
+    # the message counts from the first moment after it was sent
+    after_message = df["msg_timestamp"] + pd.Timedelta(1, unit="ns")
+    start = after_message.where(after_message > df["pr_created_at"], df["pr_created_at"])
+    start = start.where(df["msg_timestamp"].notnull())
+
+    # a message by the pr creator only counts for num_days
+    by_other = df["msg_cntrb_id"] != df["cntrb_id"]
+    deadline = df["msg_timestamp"] + pd.DateOffset(days=num_days)
+    end = df["pr_closed_at"].where(by_other | (df["pr_closed_at"] < deadline), deadline)
+
+    return start, end
+
+
 def create_figure(df: pd.DataFrame, num_days):
     fig = go.Figure(
         [
@@ -208,65 +244,3 @@ def create_figure(df: pd.DataFrame, num_days):
     )
 
     return fig
-
-
-def get_open_response(df, date, num_days):
-    """
-    This function takes a date and determines how many prs in that time interval are
-    open and if they have a response within num_days or waiting on pr openers response.
-
-    Args:
-    -----
-        df : Pandas Dataframe
-            Dataframe with pr assignment actions of the assignees
-
-        date : Datetime Timestamp
-            Timestamp of the date
-
-        num_days : int
-            number of days that a response should be within
-
-    Returns:
-    --------
-        int, int: number of open prs, and number of prs responded to within num_days or waiting on pr openers response
-    """
-
-    # drop rows with prs that have been created after the date
-    df_created = df[df["pr_created_at"] <= date]
-
-    # drops rows that have been closed before date
-    df_open_at_date = df_created[df_created["pr_closed_at"] > date]
-
-    # include prs that have not been close yet
-    df_open_at_date = pd.concat([df_open_at_date, df_created[df_created.pr_closed_at.isnull()]])
-
-    # number of columns in df ie number of open prs
-    num_open = df_open_at_date.shape[0]
-
-    # get all prs that have atleast one response
-    df_response = df_open_at_date[df_open_at_date["msg_timestamp"].notnull()]
-
-    # if no messages for any of the open prs, return num_open and 0
-    if len(df_response.index) == 0:
-        return num_open, 0
-
-    # drop messages that happen after date considered
-    df_messages_in_range = df_open_at_date[df_open_at_date["msg_timestamp"] < date]
-
-    # order messages from earliest to latest by timestamp
-    df_messages_in_range = df_messages_in_range.sort_values(by="msg_timestamp", axis=0, ascending=True)
-
-    # threshold of when the last response would need to be by
-    before_date_by_num_days = date - pd.DateOffset(days=num_days)
-
-    # checks if the most recent message was within the date requirement or by someone other than
-    # the pr creator
-    df_responded_to_by_deadline = df_messages_in_range[
-        (df_messages_in_range["msg_timestamp"] > before_date_by_num_days)
-        | (df_messages_in_range["msg_cntrb_id"] != df_messages_in_range["cntrb_id"])
-    ]
-
-    # generates number of columns ie prs with a response within num_days or waiting on pr openers response
-    n_met_response_criteria = df_responded_to_by_deadline.shape[0]
-
-    return num_open, n_met_response_criteria
@@ -6,10 +6,11 @@ from dash.dependencies import Input, Output, State
 import plotly.graph_objects as go
 import pandas as pd
 import logging
-from dateutil.relativedelta import *  # type: ignore
+from datetime import timedelta
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from pages.utils.job_utils import nodata_graph
+from pages.utils.interval_utils import OpenIntervalIndex
 from queries.prs_query import prs_query as prq
 import time
 import cache_manager.cache_facade as cf
@@ -170,17 +171,19 @@ def new_staling_prs_graph(repolist, interval, staling_interval, stale_interval):
         return dash.no_update, dash.no_update
 
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=prq.__name__, repolist=repolist):
-        logging.warning(f"PULL REQUESTS STALENESS - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=prq.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning("PULL REQUEST STALENESS - START")
 
+    # open/close events rolled up when the PRs were cached, see cache_manager/rollups.py.
+    cf.ensure_rollup("prs_open_events_rollup", repolist)
+
     # GET ALL DATA FROM POSTGRES CACHE
     df = cf.retrieve_from_cache(
-        tablename=prq.__name__,
+        tablename="prs_open_events_rollup",
         repolist=repolist,
+        columns=["ts", "delta", "created_at"],
     )
 
     # test if there is data
@@ -198,18 +201,13 @@ def new_staling_prs_graph(repolist, interval, staling_interval, stale_interval):
 
 
 def process_data(df: pd.DataFrame, interval, staling_interval, stale_interval):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    df["merged_at"] = pd.to_datetime(df["merged_at"], utc=True)
-    df["closed_at"] = pd.to_datetime(df["closed_at"], utc=True)
-
-    # order values chronologically by creation date
-    df = df.sort_values(by="created_at", axis=0, ascending=True)
+    # earliest and latest events, every item opens at its created_at
+    # and closes no earlier than that.
+    earliest = df["ts"].min()
+    latest = df["ts"].max()
 
-    # first and last elements of the dataframe are the
-    # earliest and latest events respectively
-    earliest = df["created_at"].min()
-    latest = max(df["created_at"].max(), df["closed_at"].max())
+    # open/close events sorted once, counted at every date with binary searches
+    open_index = OpenIntervalIndex(df)
 
     # generating buckets beginning to the end of time by the specified interval
     dates = pd.date_range(start=earliest, end=latest, freq=interval, inclusive="both")
@@ -217,12 +215,9 @@ def process_data(df: pd.DataFrame, interval, staling_interval, stale_interval):
     # df for new, staling, and stale prs for time interval
     df_status = dates.to_frame(index=False, name="Date")
 
-    # dynamically apply the function to all dates defined in the date_range to create df_status
-    df_status["New"], df_status["Staling"], df_status["Stale"] = zip(
-        *df_status.apply(
-            lambda row: get_new_staling_stale_up_to(df, row.Date, staling_interval, stale_interval),
-            axis=1,
-        )
+    # counts for all dates defined in the date_range at once to create df_status
+    df_status["New"], df_status["Staling"], df_status["Stale"] = get_new_staling_stale(
+        open_index, dates, staling_interval, stale_interval
     )
 
     # formatting for graph generation
@@ -292,30 +287,21 @@ def create_figure(df_status: pd.DataFrame, interval):
     return fig
 
 
-def get_new_staling_stale_up_to(df, date, staling_interval, stale_interval):
-    # drop rows that are more recent than the date limit
-    df_created = df[df["created_at"] <= date]
-
-    # drop rows that have been closed before date
-    df_in_range = df_created[df_created["closed_at"] > date]
-
-    # include rows that have a null closed value
-    df_in_range = pd.concat([df_in_range, df_created[df_created.closed_at.isnull()]])
+def get_new_staling_stale(open_index: OpenIntervalIndex, dates, staling_interval, stale_interval):
+    # PRs still open at each date
+    numTotal = open_index.open_at_many(dates)
 
-    # time difference for the amount of days before the threshold date
-    staling_days = date - relativedelta(days=+staling_interval)
+    # num of open PRs that were created in the staling_interval days before each date
+    numNew = open_index.open_by_age_many(dates, timedelta(days=0), timedelta(days=staling_interval))
 
-    # time difference for the amount of days before the threshold date
-    stale_days = date - relativedelta(days=+stale_interval)
-
-    # PRs still open at the specified date
-    numTotal = df_in_range.shape[0]
-
-    # num of currently open PRs that have been create in the last staling_value amount of days
-    numNew = df_in_range[df_in_range["created_at"] >= staling_days].shape[0]
-
-    staling = df_in_range[df_in_range["created_at"] > stale_days]
-    numStaling = staling[staling["created_at"] < staling_days].shape[0]
+    # num of open PRs created more than staling_interval and less than stale_interval days before each date
+    numStaling = open_index.open_by_age_many(
+        dates,
+        timedelta(days=staling_interval),
+        timedelta(days=stale_interval),
+        include_min=False,
+        include_max=False,
+    )
 
     numStale = numTotal - (numNew + numStaling)
 
@@ -4,15 +4,15 @@ import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output, State
 import plotly.graph_objects as go
 import pandas as pd
+import numpy as np
 import logging
-from dateutil.relativedelta import *  # type: ignore
 import plotly.express as px
 from pages.utils.graph_utils import get_graph_time_values, color_seq
 from pages.utils.job_utils import nodata_graph
 import time
 import app
 from queries.contributors_query import contributors_query as ctq
-import pages.utils.preprocessing_utils as preproc_utils
+from pages.utils.interval_utils import activity_intervals, last_activity_counts
 import cache_manager.cache_facade as cf
 
 PAGE = "contributors"
@@ -172,30 +172,27 @@ def active_drifting_contributors_graph(repolist, interval, drift_interval, away_
         return dash.no_update, True
 
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=ctq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=ctq.__name__, repolist=repolist)
 
     logging.warning(f"{VIZ_ID} - START")
     start = time.perf_counter()
 
     # GET ALL DATA FROM POSTGRES CACHE
-    df = cf.retrieve_from_cache(
+    # index of each contributor's activity, kept in memory so that changing the
+    # date interval or the drifting and away months doesn't rebuild it
+    df = cf.retrieve_derived(
         tablename=ctq.__name__,
         repolist=repolist,
+        derivation=f"activity_intervals(bot_switch={bool(bot_switch)})",
+        build=lambda df: contributor_activity(df, bot_switch),
+        columns=["cntrb_id", "created_at"],
     )
 
-    df = preproc_utils.contributors_df_action_naming(df)
-
     # test if there is data
     if df.empty:
         logging.warning("ACTIVE_DRIFTING_CONTRIBUTOR_GROWTH - NO DATA AVAILABLE")
         return nodata_graph, False
 
-    # remove bot data
-    if bot_switch:
-        df = df[~df["cntrb_id"].isin(app.bots_list)]
-
     # function for all data pre processing
     df_status = process_data(df, interval, drift_interval, away_interval)
 
@@ -205,14 +202,22 @@ def active_drifting_contributors_graph(repolist, interval, drift_interval, away_
     return fig, False
 
 
-def process_data(df: pd.DataFrame, interval, drift_interval, away_interval):
-    # convert to datetime objects with consistent column name
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    # df.rename(columns={"created_at": "created"}, inplace=True)
+def contributor_activity(df: pd.DataFrame, bot_switch) -> pd.DataFrame:
+    """
+    Returns:
+        pd.DataFrame: activity_intervals of the contributors' contributions
+    """
+    # contributor ids to strings, as contributors_df_action_naming does
+    df = df.assign(cntrb_id=df["cntrb_id"].astype(str))
+
+    # remove bot data
+    if bot_switch:
+        df = df[~df["cntrb_id"].isin(app.bots_list)]
 
-    # order from beginning of time to most recent
-    df = df.sort_values("created_at", axis=0, ascending=True)
+    return activity_intervals(df, "cntrb_id", "created_at")
 
+
+def process_data(df: pd.DataFrame, interval, drift_interval, away_interval):
     # first and last elements of the dataframe are the
     # earliest and latest events respectively
     earliest, latest = df["created_at"].min(), df["created_at"].max()
@@ -223,13 +228,26 @@ def process_data(df: pd.DataFrame, interval, drift_interval, away_interval):
     # df for active, driving, and away contributors for time interval
     df_status = dates.to_frame(index=False, name="Date")
 
-    # dynamically apply the function to all dates defined in the date_range to create df_status
-    df_status["Active"], df_status["Drifting"], df_status["Away"] = zip(
-        *df_status.apply(
-            lambda row: get_active_drifting_away_up_to(df, row.Date, drift_interval, away_interval),
-            axis=1,
-        )
-    )
+    # time difference, drifting_months and away_months before each threshold date
+    drift_mos = dates - pd.DateOffset(months=drift_interval)
+    away_mos = dates - pd.DateOffset(months=away_interval)
+
+    # number of total contributors up until each date
+    numTotal = last_activity_counts(df, "created_at", dates)
+
+    # number of 'active' contributors, people whose last contribution is after the drift time
+    numActive = last_activity_counts(df, "created_at", dates, since=drift_mos)
+
+    # number of contributors whose last contribution is after the away time, but before the drift time
+    numDrifting = last_activity_counts(df, "created_at", dates, since=away_mos, include_since=False) - numActive
+
+    # the drift and away times are the same if drifting_months equals away_months, no one is drifting then
+    numDrifting = np.maximum(numDrifting, 0)
+
+    # difference of the total to get the away value
+    df_status["Active"] = numActive
+    df_status["Drifting"] = numDrifting
+    df_status["Away"] = numTotal - (numActive + numDrifting)
 
     # formatting for graph generation
     if interval == "M":
@@ -296,34 +314,3 @@ def create_figure(df_status: pd.DataFrame, interval):
     )
 
     return fig
-
-
-def get_active_drifting_away_up_to(df, date, drift_interval, away_interval):
-    # drop rows that are more recent than the date limit
-    df_lim = df[df["created_at"] <= date]
-
-    # keep more recent contribution per ID
-    df_lim = df_lim.drop_duplicates(subset="cntrb_id", keep="last")
-
-    # time difference, drifting_months before the threshold date
-    drift_mos = date - relativedelta(months=+drift_interval)
-
-    # time difference, away_months before the threshold date
-    away_mos = date - relativedelta(months=+away_interval)
-
-    # number of total contributors up until date
-    numTotal = df_lim.shape[0]
-
-    # number of 'active' contributors, people with contributions before the drift time
-    numActive = df_lim[df_lim["created_at"] >= drift_mos].shape[0]
-
-    # set of contributions that are before the away time
-    drifting = df_lim[df_lim["created_at"] > away_mos]
-
-    # number of the set of contributions that are after the drift time, but before away
-    numDrifting = drifting[drifting["created_at"] < drift_mos].shape[0]
-
-    # difference of the total to get the away value
-    numAway = numTotal - (numActive + numDrifting)
-
-    return [numActive, numDrifting, numAway]
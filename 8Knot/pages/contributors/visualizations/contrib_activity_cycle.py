@@ -113,9 +113,7 @@ def toggle_popover(n, is_open):
 )
 def contrib_activity_cycle_graph(repolist, interval):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=cmq.__name__, repolist=repolist):
-        logging.warning(f"COMMITS_OVER_TIME_VIZ - WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=cmq.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
@@ -141,14 +139,10 @@ def contrib_activity_cycle_graph(repolist, interval):
 
 
 def process_data(df: pd.DataFrame, interval):
-    # for this usecase we want the datetimes to be in their local values
-    # tricking pandas to keep local values when UTC conversion is required for to_datetime
-    df["author_timestamp"] = df["author_timestamp"].astype("str").str[:-6]
-    df["committer_timestamp"] = df["committer_timestamp"].astype("str").str[:-6]
-
-    # convert to datetime objects rather than strings
-    df["author_timestamp"] = pd.to_datetime(df["author_timestamp"], utc=True)
-    df["committer_timestamp"] = pd.to_datetime(df["committer_timestamp"], utc=True)
+    # timestamps are already UTC datetimes from the cache. truncate to the hour,
+    # which is all that's graphed and what the author/committer comparison below uses.
+    df["author_timestamp"] = df["author_timestamp"].dt.floor("h")
+    df["committer_timestamp"] = df["committer_timestamp"].dt.floor("h")
     # removes duplicate values when the author and committer is the same
     df.loc[df["author_timestamp"] == df["committer_timestamp"], "author_timestamp"] = None
 
@@ -17,11 +17,15 @@ import time
 import datetime as dt
 import app
 import pages.utils.preprocessing_utils as preproc_utils
+from pages.utils.lottery_utils import cntrb_prolificacy_over_time
 import cache_manager.cache_facade as cf
 
 PAGE = "contributors"
 VIZ_ID = "lottery-factor-over-time"
 
+# action types whose lottery factor is graphed, in the order cntrb_prolificacy_over_time returns them
+ACTIONS = ["Commit", "Issue Opened", "Issue Comment", "Issue Closed", "PR Opened", "PR Comment", "PR Review"]
+
 gc_lottery_factor_over_time = dbc.Card(
     [
         dbc.CardBody(
@@ -189,25 +193,22 @@ def graph_title(window_width):
 )
 def create_contrib_prolificacy_over_time_graph(repolist, threshold, window_width, step_size, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=ctq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=ctq.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID} - START")
 
     # GET ALL DATA FROM POSTGRES CACHE
-    df = cf.retrieve_from_cache(
+    # contributions in time order, kept in memory so that changing the threshold,
+    # window width or step size doesn't rebuild them
+    df = cf.retrieve_derived(
         tablename=ctq.__name__,
         repolist=repolist,
+        derivation=f"contributions(bot_switch={bool(bot_switch)})",
+        build=lambda df: contributions(df, bot_switch),
+        columns=["cntrb_id", "created_at", "action"],
     )
 
-    df = preproc_utils.contributors_df_action_naming(df)
-
-    # remove bot data
-    if bot_switch:
-        df = df[~df["cntrb_id"].isin(app.bots_list)]
-
     # test if there is data
     if df.empty:
         logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
@@ -225,13 +226,25 @@ def create_contrib_prolificacy_over_time_graph(repolist, threshold, window_width
     return fig, False
 
 
-def process_data(df, threshold, window_width, step_size):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
+def contributions(df, bot_switch):
+    """
+    Returns:
+        pd.DataFrame: created_at, Action and cntrb_id of each contribution in order of created_at,
+                        Action and cntrb_id as categoricals
+    """
+    df = preproc_utils.contributors_df_action_naming(df)
 
-    # order values chronologically by created_at date
-    df = df.sort_values(by="created_at", ascending=True)
+    # remove bot data
+    if bot_switch:
+        df = df[~df["cntrb_id"].isin(app.bots_list)]
+
+    # order values chronologically by created_at date, contributions without one are never in a window
+    df = df[df["created_at"].notna()].sort_values(by="created_at", ascending=True, ignore_index=True)
+
+    return df[["created_at", "Action", "cntrb_id"]].astype({"Action": "category", "cntrb_id": "category"})
 
+
+def process_data(df, threshold, window_width, step_size):
     # get start and end date from created column
     start_date = df["created_at"].min()
     end_date = df["created_at"].max()
@@ -246,7 +259,7 @@ def process_data(df, threshold, window_width, step_size):
     # calculate the end of each interval and store the values in a column named period_from
     df_final["period_to"] = df_final["period_from"] + pd.DateOffset(months=window_width)
 
-    # dynamically calculate the contributor prolificacy over time for each of the action times and store results in df_final
+    # calculate the contributor prolificacy over time for each of the action types and store results in df_final
     (
         df_final["Commit"],
         df_final["Issue Opened"],
@@ -255,12 +268,7 @@ def process_data(df, threshold, window_width, step_size):
         df_final["PR Opened"],
         df_final["PR Comment"],
         df_final["PR Review"],
-    ) = zip(
-        *df_final.apply(
-            lambda row: cntrb_prolificacy_over_time(df, row.period_from, row.period_to, window_width, threshold),
-            axis=1,
-        )
-    )
+    ) = cntrb_prolificacy_over_time(df, df_final["period_from"], df_final["period_to"], threshold, ACTIONS)
 
     return df_final
 
@@ -388,72 +396,3 @@ def create_figure(df_final, threshold, step_size):
     )
 
     return fig
-
-
-def cntrb_prolificacy_over_time(df, period_from, period_to, window_width, threshold):
-    # subset df such that the rows correspond to the window of time defined by period from and period to
-    time_mask = (df["created_at"] >= period_from) & (df["created_at"] <= period_to)
-    df_in_range = df.loc[time_mask]
-
-    # initialize varibles to store contributor prolificacy accoding to action type
-    commit, issueOpened, issueComment, issueClosed, prOpened, prReview, prComment = (
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-        None,
-    )
-
-    # count the number of contributions each contributor has made according each action type
-    df_count_cntrbs = df_in_range.groupby(["Action", "cntrb_id"])["cntrb_id"].count().to_frame()
-    df_count_cntrbs = df_count_cntrbs.rename(columns={"cntrb_id": "count"}).reset_index()
-
-    # pivot df such that the column names correspond to the different action types, index is the cntrb_ids, and the values are the number of contributions of each contributor
-    df_count_cntrbs = df_count_cntrbs.pivot(index="cntrb_id", columns="Action", values="count")
-
-    commit = calc_lottery_factor(df_count_cntrbs, "Commit", threshold)
-    issueOpened = calc_lottery_factor(df_count_cntrbs, "Issue Opened", threshold)
-    issueComment = calc_lottery_factor(df_count_cntrbs, "Issue Comment", threshold)
-    issueClosed = calc_lottery_factor(df_count_cntrbs, "Issue Closed", threshold)
-    prOpened = calc_lottery_factor(df_count_cntrbs, "PR Opened", threshold)
-    prReview = calc_lottery_factor(df_count_cntrbs, "PR Review", threshold)
-    prComment = calc_lottery_factor(df_count_cntrbs, "PR Comment", threshold)
-
-    return commit, issueOpened, issueComment, issueClosed, prOpened, prReview, prComment
-
-
-def calc_lottery_factor(df, action_type, threshold):
-    # if the df is empty return None
-    if df.empty:
-        return None
-
-    # if the specified action type is not in the dfs' cols return None
-    if action_type not in df.columns:
-        return None
-
-    # sort rows in df based on number of contributions from greatest to least
-    df = df.sort_values(by=action_type, ascending=False)
-
-    # calculate the threshold amount of contributions
-    thresh_cntrbs = df[action_type].sum() * threshold
-
-    # drop rows where the cntrb_id is None
-    mask = df.index.get_level_values("cntrb_id") == None
-    df = df[~mask]
-
-    # initilize running sum of contributors who make up contributor prolificacy
-    lottery_factor = 0
-
-    # initialize running sum of contributions
-    running_sum = 0
-
-    for _, row in df.iterrows():
-        running_sum += row[action_type]  # update the running sum by the number of contributions a contributor has made
-        lottery_factor += 1  # update contributor prolificacy
-        # if the running sum of contributions is greater than or equal to the threshold amount, break
-        if running_sum >= thresh_cntrbs:
-            break
-
-    return lottery_factor
@@ -208,9 +208,7 @@ def graph_title(k, action_type):
 )
 def create_top_k_cntrbs_graph(repolist, action_type, top_k, start_date, end_date, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=ctq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=ctq.__name__, repolist=repolist)
 
     logging.warning(f"{VIZ_ID} - START")
     start = time.perf_counter()
@@ -219,6 +217,10 @@ def create_top_k_cntrbs_graph(repolist, action_type, top_k, start_date, end_date
     df = cf.retrieve_from_cache(
         tablename=ctq.__name__,
         repolist=repolist,
+        columns=["cntrb_id", "created_at", "action"],
+        date_column="created_at",
+        start_date=start_date,
+        end_date=end_date,
     )
 
     df = preproc_utils.contributors_df_action_naming(df)
@@ -247,9 +249,6 @@ def create_top_k_cntrbs_graph(repolist, action_type, top_k, start_date, end_date
 
 
 def process_data(df: pd.DataFrame, action_type, top_k, start_date, end_date):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-
     # order values chronologically by created_at date
     df = df.sort_values(by="created_at", ascending=True)
 
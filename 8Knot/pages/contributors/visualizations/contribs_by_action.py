@@ -169,17 +169,20 @@ def toggle_popover(n, is_open):
 )
 def contribs_by_action_graph(repolist, interval, action, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=ctq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=ctq.__name__, repolist=repolist)
 
     logging.warning(f"{VIZ_ID} - START")
     start = time.perf_counter()
 
+    # every interval is a whole number of months, so the monthly event counts
+    # rolled up from contributors_query are enough. see cache_manager/rollups.py.
+    cf.ensure_rollup("contributors_monthly_rollup", repolist)
+
     # GET ALL DATA FROM POSTGRES CACHE
     df = cf.retrieve_from_cache(
-        tablename=ctq.__name__,
+        tablename="contributors_monthly_rollup",
         repolist=repolist,
+        columns=["month", "action", "cntrb_id", "n_events"],
     )
 
     df = preproc_utils.contributors_df_action_naming(df)
@@ -207,11 +210,12 @@ def contribs_by_action_graph(repolist, interval, action, bot_switch):
 
 
 def process_data(df: pd.DataFrame, interval, action):
-    # convert to datetime objects rather than strings
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-
     # order values chronologically by COLUMN_TO_SORT_BY date
-    df = df.sort_values(by="created_at", axis=0, ascending=True)
+    df = df.sort_values(by="month", axis=0, ascending=True)
+
+    # place each month's events mid-month so that they fall
+    # inside of the histogram's month-aligned bins.
+    df["month"] = df["month"] + pd.Timedelta(days=14)
 
     # drop all contributions that are not the selected action
     df = df[df["Action"].str.contains(action)]
@@ -224,7 +228,7 @@ def create_figure(df: pd.DataFrame, interval, action):
     x_r, x_name, hover, period = get_graph_time_values(interval)
 
     # create plotly express histogram
-    fig = px.histogram(df, x="created_at", color_discrete_sequence=[color_seq[3]])
+    fig = px.histogram(df, x="month", y="n_events", histfunc="sum", color_discrete_sequence=[color_seq[3]])
 
     # creates bins with interval size and customizes the hover value for the bars
     fig.update_traces(
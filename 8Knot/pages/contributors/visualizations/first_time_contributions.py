@@ -3,7 +3,6 @@ import dash
 import dash_bootstrap_components as dbc
 from dash import callback
 from dash.dependencies import Input, Output, State
-import pandas as pd
 import logging
 import plotly.express as px
 from pages.utils.graph_utils import color_seq
@@ -81,9 +80,7 @@ def toggle_popover(n, is_open):
 )
 def create_first_time_contributors_graph(repolist, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=ctq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=ctq.__name__, repolist=repolist)
 
     logging.warning(f"{VIZ_ID} - START")
     start = time.perf_counter()
@@ -115,8 +112,6 @@ def create_first_time_contributors_graph(repolist, bot_switch):
 
 
 def process_data(df):
-    # convert to datetime objects with consistent column name
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
     # df.rename(columns={"created_at": "created"}, inplace=True)
 
     # selection for 1st contribution only
@@ -11,7 +11,6 @@ from queries.contributors_query import contributors_query as ctq
 from pages.utils.job_utils import nodata_graph
 import time
 import app
-import pages.utils.preprocessing_utils as preproc_utils
 import cache_manager.cache_facade as cf
 
 PAGE = "contributors"
@@ -128,21 +127,21 @@ def graph_title(view):
 )
 def new_contributor_graph(repolist, interval, bot_switch):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=ctq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=ctq.__name__, repolist=repolist)
 
     logging.warning(f"{VIZ_ID} - START")
     start = time.perf_counter()
 
+    # per-contributor spans rolled up from contributors_query, see cache_manager/rollups.py.
+    cf.ensure_rollup("contributors_span_rollup", repolist)
+
     # GET ALL DATA FROM POSTGRES CACHE
     df = cf.retrieve_from_cache(
-        tablename=ctq.__name__,
+        tablename="contributors_span_rollup",
         repolist=repolist,
+        columns=["cntrb_id", "last_seen"],
     )
 
-    df = preproc_utils.contributors_df_action_naming(df)
-
     # test if there is data
     if df.empty:
         logging.warning("TOTAL_CONTRIBUTOR_GROWTH_VIZ - NO DATA AVAILABLE")
@@ -162,22 +161,19 @@ def new_contributor_graph(repolist, interval, bot_switch):
 
 
 def process_data(df, interval):
-    # convert to datetime objects with consistent column name
-    df["created_at"] = pd.to_datetime(df["created_at"], utc=True)
-    # df.rename(columns={"created_at": "created"}, inplace=True)
+    # a contributor's rank-1 contribution to a repo is their most recent one,
+    # so its date is the rollup's last_seen.
+    df = df.rename(columns={"last_seen": "created_at"})
 
     # order from beginning of time to most recent
     df = df.sort_values("created_at", axis=0, ascending=True)
 
     """
         Assume that the cntrb_id values are unique to individual contributors.
-        Find the first rank-1 contribution of the contributors, saving the created
-        date.
+        The rollup has one last_seen date per contributor and repo. Keep each
+        contributor's earliest one, saving it as the created date.
     """
 
-    # keep only first contributions
-    df = df[df["rank"] == 1]
-
     # get all of the unique entries by contributor ID
     df.drop_duplicates(subset=["cntrb_id"], inplace=True)
     df.reset_index(inplace=True)
@@ -12,6 +12,7 @@ from dash.dependencies import Input, Output, State
 from app import augur
 from flask_login import current_user
 from cache_manager.cache_manager import CacheManager as cm
+from cache_manager.usage import UsageLog
 import cache_manager.cache_facade as cf
 from queries.issues_query import issues_query as iq
 from queries.commits_query import commits_query as cq
@@ -30,6 +31,7 @@ from queries.package_version_query import package_version_query as pvq
 from queries.repo_releases_query import repo_releases_query as rrq
 from queries.ossf_score_query import ossf_score_query as osq
 from queries.repo_info_query import repo_info_query as riq
+from queries.sharded_collection import dispatch_single_flight
 import redis
 import flask
 
@@ -356,8 +358,9 @@ def wait_queries(job_ids):
     # default 'result_expires' for celery config is 86400 seconds.
     # so we don't have to check if the jobs exist. if this tasks
     # is enqueued 24 hours after the query-worker tasks finish
-    # then we have a big problem. However, we should 'forget' all
-    # results before we exit.
+    # then we have a big problem. Results aren't 'forgotten' here,
+    # jobs can be shared with other users' sessions that are still
+    # waiting on them, see queries/sharded_collection.py.
 
     while True:
         logging.warning([(j.name, j.status) for j in jobs])
@@ -365,27 +368,10 @@ def wait_queries(job_ids):
         # jobs are either all ready
         if all(j.successful() for j in jobs):
             logging.warning([(j.name, j.status) for j in jobs])
-            jobs = [j.forget() for j in jobs]
             return "Data Ready", "#b5b683"
 
         # or one of them has failed
         if any(j.failed() for j in jobs):
-            # if a job fails, we need to wait for the others to finish before
-            # we can 'forget' them. otherwise to-be-successful jobs will always
-            # be forgotten if one fails.
-
-            # tasks need to have either failed or succeeded before being forgotten.
-            while True:
-                num_succeeded = [j.successful() for j in jobs].count(True)
-                num_failed = [j.failed() for j in jobs].count(True)
-                num_total = num_failed + num_succeeded
-
-                if num_total == len(jobs):
-                    break
-
-                time.sleep(4.0)
-
-            jobs = [j.forget() for j in jobs]
             return "Data Incomplete- Retry", "danger"
 
         # pause to let something change
@@ -411,20 +397,36 @@ def run_queries(repos):
     # list of queries to process
     funcs = QUERIES
 
-    # list of job promises
+    # remember the selection, so that the cache pre-warmer keeps these repos warm.
+    # see queries/cache_prewarm.py.
+    try:
+        UsageLog().record(repos)
+    except redis.exceptions.RedisError as e:
+        logging.error(f"RUN-QUERIES: Could not record repo selection: {e}")
+
+    # list of job ids
     jobs = []
 
+    # estimated size of each repo, used to split large collections into shards.
+    # only looked up if something needs to be collected.
+    estimates = None
+
+    # look up which repos are cached for every query in one round trip
+    uncached = cf.get_uncached_many([f.__name__ for f in funcs], repos)
+
     for f in funcs:
         # only download repos that aren't currently in cache
-        not_ready = cf.get_uncached(f.__name__, repos)
+        not_ready = uncached[f.__name__]
         if len(not_ready) == 0:
             logging.warning(f"{f.__name__} - NO DISPATCH - ALL REPOS IN CACHE")
             continue
 
-        # add job to queue
-        j = f.apply_async(args=[not_ready], queue="data")
+        if estimates is None:
+            estimates = cf.estimate_repo_rows(repos)
 
-        # add job promise to local promise list
-        jobs.append(j)
+        # add job to queue, split into parallel shards if it's large.
+        # repos that another user's job is already collecting aren't queued
+        # again, that job is waited on instead.
+        jobs.extend(dispatch_single_flight(f, not_ready, estimates))
 
-    return [j.id for j in jobs]
+    return jobs
@@ -128,9 +128,7 @@ def graph_title(view):
 )
 def code_languages_graph(repolist, view):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=rlq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=rlq.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
@@ -156,6 +154,8 @@ def code_languages_graph(repolist, view):
 
 
 def process_data(df: pd.DataFrame):
+    # code_lines is changed in place, don't change the cached data.
+    df = df.copy()
 
     # SVG files give one line of code per file
     df.loc[df["programming_language"] == "SVG", "code_lines"] = df["files"]
@@ -95,9 +95,7 @@ def toggle_popover(n, is_open):
 )
 def ossf_scorecard(repo):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=osq.__name__, repolist=[repo]):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=osq.__name__, repolist=[repo])
 
     logging.warning(f"{VIZ_ID} - START")
     start = time.perf_counter()
@@ -113,6 +111,9 @@ def ossf_scorecard(repo):
         logging.warning(f"{VIZ_ID} - NO DATA AVAILABLE")
         return dbc.Table.from_dataframe(df, striped=True, bordered=True, hover=True), dbc.Label("No data")
 
+    # names are changed in place below, don't change the cached data.
+    df = df.copy()
+
     # repo id not needed for table
     df.drop(["repo_id"], axis=1, inplace=True)
 
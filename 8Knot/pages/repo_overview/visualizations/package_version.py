@@ -92,9 +92,7 @@ def toggle_popover(n, is_open):
 )
 def package_version_graph(repolist):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=pvq.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=pvq.__name__, repolist=repolist)
 
     start = time.perf_counter()
     logging.warning(f"{VIZ_ID}- START")
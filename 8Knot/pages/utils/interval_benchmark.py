@@ -0,0 +1,169 @@
+"""
+Compares ways of counting open PRs at every date, as the PR and issue
+over time charts do, and New, Staling and Stale PRs at every date, as
+the staleness charts do, on synthetic PRs.
+
+    scan:   filters all PRs for each date, the charts' original approach.
+    sweep:  open_counts, or OpenIntervalIndex.open_at_many and
+            open_by_age_many for staleness, all dates at once.
+
+The scans are only timed on a sample of the dates, they're too slow to run
+on all of them, and their totals are extrapolated. The sweeps' counts are
+checked against the scans' on the sampled dates.
+
+Both are run on PRs with random timestamps, and on PRs created and closed
+at midnight, some closed before they were created, as Augur data can be.
+Those tie with the daily dates and fall exactly on the staleness age
+cutoffs, where an off-by-one in the sweeps would show.
+
+Usage, from the directory containing pages/:
+    python -m pages.utils.interval_benchmark [<n_prs> [<years> [<sampled dates>]]]
+"""
+import sys
+import time
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from .interval_utils import OpenIntervalIndex, open_counts
+
+STALING_DAYS = 7
+STALE_DAYS = 30
+
+
+def synthetic_prs(n_prs: int, years: int, seed: int = 0, day_aligned: bool = False) -> pd.DataFrame:
+    """
+    Returns:
+        pd.DataFrame: created_at and closed_at of n_prs PRs opened over the last {years} years.
+                        most are closed within weeks, some stay open. if {day_aligned},
+                        both are at midnight and some PRs are closed before they were created.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp("2024-01-01", tz="UTC")
+    span = int(timedelta(days=365 * years).total_seconds())
+
+    created = end - pd.to_timedelta(rng.integers(0, span, n_prs), unit="s")
+    closed = created + pd.to_timedelta(rng.exponential(14 * 86400, n_prs).astype(np.int64), unit="s")
+    if day_aligned:
+        # ties with the daily dates and the staleness cutoffs, and closes before creation.
+        created = created.floor("D")
+        closed = closed.floor("D")
+        closed = closed.where(rng.random(n_prs) > 0.02, created - pd.to_timedelta(rng.integers(1, 30, n_prs), unit="D"))
+    closed = closed.where(rng.random(n_prs) > 0.1)
+
+    return pd.DataFrame({"created_at": created, "closed_at": closed})
+
+
+def open_events(prs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns:
+        pd.DataFrame: the PRs' open/close events, like cache_manager/rollups.py builds them.
+    """
+    closed = prs[prs["closed_at"].notna()]
+    return pd.DataFrame(
+        {
+            "ts": pd.concat([prs["created_at"], closed[["closed_at", "created_at"]].max(axis=1)]),
+            "delta": np.r_[np.ones(len(prs), dtype=int), -np.ones(len(closed), dtype=int)],
+            "created_at": pd.concat([prs["created_at"], closed["created_at"]]),
+        }
+    )
+
+
+def scan_open(prs: pd.DataFrame, date) -> int:
+    # created by then and closed after then, or not closed.
+    df_created = prs[prs["created_at"] <= date]
+    df_open = df_created[df_created["closed_at"] > date]
+    df_open = pd.concat([df_open, df_created[df_created.closed_at.isnull()]])
+    return df_open.shape[0]
+
+
+def scan(prs: pd.DataFrame, date) -> list[int]:
+    # open at date: created by then and not closed by then.
+    df_in_range = prs[(prs["created_at"] <= date) & ~(prs["closed_at"] <= date)]
+
+    staling_days = date - timedelta(days=STALING_DAYS)
+    stale_days = date - timedelta(days=STALE_DAYS)
+
+    numTotal = df_in_range.shape[0]
+    numNew = df_in_range[df_in_range["created_at"] >= staling_days].shape[0]
+    staling = df_in_range[df_in_range["created_at"] > stale_days]
+    numStaling = staling[staling["created_at"] < staling_days].shape[0]
+
+    return [numNew, numStaling, numTotal - (numNew + numStaling)]
+
+
+def sweep(open_index: OpenIntervalIndex, dates) -> np.ndarray:
+    numTotal = open_index.open_at_many(dates)
+    numNew = open_index.open_by_age_many(dates, timedelta(days=0), timedelta(days=STALING_DAYS))
+    numStaling = open_index.open_by_age_many(
+        dates, timedelta(days=STALING_DAYS), timedelta(days=STALE_DAYS), include_min=False, include_max=False
+    )
+    return np.column_stack([numNew, numStaling, numTotal - (numNew + numStaling)])
+
+
+def benchmark(n_prs: int, years: int, n_sampled: int, day_aligned: bool = False) -> list[dict]:
+    """
+    Returns:
+        list[dict]: per count and approach- count, approach, seconds for all dates
+                    (extrapolated for scans) and whether its counts match the scan's
+                    on the sampled dates
+    """
+    prs = synthetic_prs(n_prs, years, day_aligned=day_aligned)
+    events = open_events(prs)
+    dates = pd.date_range(start=events["ts"].min(), end=events["ts"].max(), freq="D", inclusive="both")
+    sampled = dates[:: max(1, len(dates) // n_sampled)]
+    picked = dates.get_indexer(sampled)
+
+    start = time.perf_counter()
+    expected_open = np.array([scan_open(prs, d) for d in sampled])
+    scan_open_s = (time.perf_counter() - start) * len(dates) / len(sampled)
+
+    start = time.perf_counter()
+    counted_open = open_counts(prs["created_at"], prs["closed_at"], dates)
+    open_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = np.array([scan(prs, d) for d in sampled])
+    scan_s = (time.perf_counter() - start) * len(dates) / len(sampled)
+
+    start = time.perf_counter()
+    open_index = OpenIntervalIndex(events)
+    sweep_counts = sweep(open_index, dates)
+    sweep_s = time.perf_counter() - start
+
+    return [
+        {"count": "open", "approach": "scan", "seconds": scan_open_s, "dates": len(dates), "matches": True},
+        {
+            "count": "open",
+            "approach": "sweep",
+            "seconds": open_s,
+            "dates": len(dates),
+            "matches": bool((counted_open[picked] == expected_open).all()),
+        },
+        {"count": "staleness", "approach": "scan", "seconds": scan_s, "dates": len(dates), "matches": True},
+        {
+            "count": "staleness",
+            "approach": "sweep",
+            "seconds": sweep_s,
+            "dates": len(dates),
+            "matches": bool((sweep_counts[picked] == expected).all()),
+        },
+    ]
+
+
+def main(argv: list[str]) -> None:
+    n_prs = int(argv[0]) if len(argv) > 0 else 100_000
+    years = int(argv[1]) if len(argv) > 1 else 10
+    n_sampled = int(argv[2]) if len(argv) > 2 else 100
+
+    print(f"{n_prs} PRs over {years} years, daily buckets, scan sampled on {n_sampled} dates")
+    print(f"{'timestamps':<12}{'count':<12}{'approach':<12}{'dates':>8}{'seconds':>12}{'matches scan':>14}")
+    for timestamps, day_aligned in [("random", False), ("midnight", True)]:
+        for r in benchmark(n_prs, years, n_sampled, day_aligned):
+            print(
+                f"{timestamps:<12}{r['count']:<12}{r['approach']:<12}{r['dates']:>8}"
+                f"{r['seconds']:>12.3f}{str(r['matches']):>14}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,255 @@
+"""
+Sweep-line counts over intervals of time, for the over time charts.
+
+The charts count, at every date of a range, how many PRs or issues were
+open, or how many contributors were last active within a window. Instead
+of filtering every row for every date, the helpers sort the rows' start
+and end events once and answer all dates with binary searches over their
+running sum:
+
+    interval_counts(starts, ends, dates): number of intervals [start, end)
+        containing each date.
+    open_counts(created, closed, dates): number of PRs or issues open at
+        each date, the intervals [created, closed).
+
+activity_intervals, last_activity_counts and OpenIntervalIndex follow
+the same approach for the contributor and staleness charts.
+
+Timestamps are compared in UTC. Naive datetimes, as Augur's are, are taken
+to be UTC; aware ones are converted to it. Dates are usually midnights, UTC,
+so rows created or closed at midnight tie with them. Intervals are half-open:
+an item created at exactly a date is open at it, one closed at exactly a
+date is not, as with the charts' original created <= date < closed filters.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _ns(values) -> np.ndarray:
+    # nanoseconds since the epoch, UTC. naive datetimes are taken as UTC.
+    return pd.to_datetime(values, utc=True).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+
+def _times(dates) -> np.ndarray:
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is None:
+        dates = dates.tz_localize("UTC")
+    return dates.tz_convert("UTC").asi8
+
+
+def _running_count_at(ts: np.ndarray, running: np.ndarray, t: np.ndarray) -> np.ndarray:
+    # running[i] is the count after the events at sorted ts[:i + 1].
+    # the count at t includes every event at exactly t.
+    if len(ts) == 0:
+        return np.zeros(len(t), dtype=np.int64)
+    i = np.searchsorted(ts, t, side="right")
+    return np.where(i > 0, running[np.maximum(i - 1, 0)], 0)
+
+
+def interval_counts(starts, ends, dates) -> np.ndarray:
+    """
+    Number of intervals [start, end) that contain each of dates.
+
+    Intervals without a start are never counted, ones without an end never
+    end, and ones that end before they start are empty.
+
+    Each interval adds +1 at its start and -1 at its end. The events are
+    sorted together once and their cumulative sum is looked up for every
+    date with a binary search, instead of filtering every interval for every date.
+
+    Args:
+        starts (array-like of datetimes): start of each interval
+        ends (array-like of datetimes): end of each interval, missing if it doesn't end
+        dates (array-like of datetimes): dates to count at
+
+    Returns:
+        np.ndarray: count per date
+    """
+    starts = pd.to_datetime(pd.Series(starts), utc=True)
+    ends = pd.to_datetime(pd.Series(ends), utc=True)
+
+    started = starts.notna().to_numpy()
+    ended = started & ends.notna().to_numpy()
+
+    s = _ns(starts)
+    ts = np.concatenate([s[started], np.maximum(_ns(ends)[ended], s[ended])])
+    delta = np.concatenate([np.ones(started.sum(), dtype=np.int64), -np.ones(ended.sum(), dtype=np.int64)])
+
+    order = np.argsort(ts, kind="stable")
+    return _running_count_at(ts[order], np.cumsum(delta[order]), _times(dates))
+
+
+def open_counts(created, closed, dates) -> np.ndarray:
+    """
+    Number of PRs or issues open at each of dates, i.e. with
+    created_at <= date and no closed_at, or closed_at > date.
+    An item closed before it was created is never open.
+
+    Args:
+        created (array-like of datetimes): created_at of each item
+        closed (array-like of datetimes): closed_at of each item, missing if it's open
+        dates (array-like of datetimes): dates to count at
+
+    Returns:
+        np.ndarray: count per date
+    """
+    return interval_counts(created, closed, dates)
+
+
+def activity_intervals(df: pd.DataFrame, key_column: str, time_column: str) -> pd.DataFrame:
+    """
+    Index of each key's activity, e.g. each contributor's contributions.
+
+    A key's last activity at or before a time t is the one with
+    time <= t < next, so the rows split time into intervals during
+    which each key's last activity doesn't change.
+
+    Args:
+        df (pd.DataFrame): one row per activity
+        key_column (str): column of who or what was active, missing values are one key
+        time_column (str): column of when
+
+    Returns:
+        pd.DataFrame: one row per key and distinct time, sorted by key and time, with the
+                        key's next distinct time in "next", missing for its last activity
+    """
+    df = df.loc[df[time_column].notna(), [key_column, time_column]]
+    df = df.drop_duplicates().sort_values([key_column, time_column], ignore_index=True)
+    df["next"] = df.groupby(key_column, dropna=False, sort=False)[time_column].shift(-1)
+    return df
+
+
+def last_activity_counts(
+    intervals: pd.DataFrame, time_column: str, dates, since=None, include_since=True
+) -> np.ndarray:
+    """
+    Number of keys whose last activity at or before each of dates was at
+    or after since, e.g. contributors that contributed in the last month.
+
+    Each interval of activity_intervals counts at the dates in [time, next),
+    and only while since <= time, which is a prefix of dates because since
+    doesn't decrease. So each interval counts at one range of dates' positions,
+    found with binary searches, and the counts are a running sum over them.
+
+    Args:
+        intervals (pd.DataFrame): rows of activity_intervals
+        time_column (str): column of the activity times
+        dates (array-like of datetimes): sorted dates to count at
+        since (array-like of datetimes, optional): per date, the earliest last activity
+                    that's counted, non-decreasing. Every key active by then if None
+        include_since (bool): count last activity at exactly since
+
+    Returns:
+        np.ndarray: count per date
+    """
+    t = _times(dates)
+    at = _ns(intervals[time_column])
+    ends = intervals["next"].notna().to_numpy()
+    next_at = np.where(ends, _ns(intervals["next"]), np.iinfo(np.int64).max)
+
+    # positions of the dates in [time, next)
+    lo = np.searchsorted(t, at, side="left")
+    hi = np.searchsorted(t, next_at, side="left")
+
+    # positions of the dates whose since is before the activity, or at it if include_since
+    if since is not None:
+        hi = np.minimum(hi, np.searchsorted(_times(since), at, side="right" if include_since else "left"))
+
+    counted = lo < hi
+    starts = np.bincount(lo[counted], minlength=len(t) + 1)
+    stops = np.bincount(hi[counted], minlength=len(t) + 1)
+    return np.cumsum(starts - stops)[: len(t)]
+
+
+class OpenIntervalIndex:
+    """
+    Answers how many PRs or issues were open at a time, and how many of
+    those were created within a time window, with binary searches over the
+    open/close events rolled up when the PRs or issues are cached.
+    See prs_open_events_rollup and issues_open_events_rollup in
+    cache_manager/rollups.py.
+
+    Events of several repos are merged into one sorted sequence.
+
+    Methods
+    -------
+        open_at_many(dates):
+            Number of items with created_at <= date that weren't closed by date, for every date in dates.
+
+        open_by_age_many(dates, min_age, max_age, include_min, include_max):
+            Number of items open at each date whose age at that date is between min_age and max_age.
+    """
+
+    def __init__(self, events: pd.DataFrame):
+        """
+        Args:
+            events (pd.DataFrame): rows of an open events rollup, at least ts, delta and created_at.
+        """
+        ts = _ns(events["ts"])
+        delta = events["delta"].to_numpy(dtype=np.int64)
+        created = _ns(events["created_at"])
+
+        # running count of open items after each event, across repos.
+        order = np.argsort(ts, kind="stable")
+        self._ts = ts[order]
+        self._open = np.cumsum(delta[order])
+
+        # creation times of all items, sorted.
+        opens = delta > 0
+        self._created = np.sort(created[opens])
+
+        # creation and closing times of closed items, sorted by creation time.
+        closes = ~opens
+        order = np.argsort(created[closes], kind="stable")
+        self._closed_created = created[closes][order]
+        self._closed_ts = ts[closes][order]
+
+    def open_at_many(self, dates) -> np.ndarray:
+        """
+        Number of items with created_at <= date that weren't closed by date,
+        for every date in dates, in one binary search per date.
+        """
+        return _running_count_at(self._ts, self._open, _times(dates))
+
+    def open_by_age_many(self, dates, min_age, max_age, include_min=True, include_max=True) -> np.ndarray:
+        """
+        Number of items open at each of dates whose age at that date,
+        date - created_at, is between min_age and max_age.
+
+        An item is counted at the dates in [created_at + min_age, created_at + max_age]
+        that it's open at, a single interval. So the count at a date is the number
+        of those intervals that started by then less the number that ended, which
+        is a binary search over their sorted starts and ends.
+
+        Args:
+            dates: dates to count at
+            min_age (timedelta-like): youngest age counted
+            max_age (timedelta-like): oldest age counted
+            include_min (bool): count items aged exactly min_age
+            include_max (bool): count items aged exactly max_age
+
+        Returns:
+            np.ndarray: count per date
+        """
+        t = _times(dates)
+
+        # the interval is [created_at + a, created_at + b), in nanoseconds.
+        a = max(0, pd.Timedelta(min_age).value + (0 if include_min else 1))
+        b = pd.Timedelta(max_age).value + (1 if include_max else 0)
+        if b <= a:
+            return np.zeros(len(t), dtype=np.int64)
+
+        started = np.searchsorted(self._created, t - a, side="right")
+
+        # items still open end at created_at + b. closed items end when they're
+        # closed if that's sooner, but never before they start.
+        closed_ends = np.sort(
+            np.maximum(self._closed_created + a, np.minimum(self._closed_ts, self._closed_created + b))
+        )
+        ended = (
+            np.searchsorted(self._created, t - b, side="right")
+            - np.searchsorted(self._closed_created, t - b, side="right")
+            + np.searchsorted(closed_ends, t, side="right")
+        )
+
+        return started - ended
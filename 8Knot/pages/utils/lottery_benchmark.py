@@ -0,0 +1,198 @@
+"""
+Compares ways of computing the lottery factor of each action type over
+sliding windows of time, as the contributor importance over time chart
+does, on synthetic contributions.
+
+    per window: groups, pivots and walks the contributions of every window
+                with iterrows(), the chart's original approach.
+    sliding:    lottery_utils.cntrb_prolificacy_over_time, which updates
+                per-contributor counts as the window advances.
+
+prepare is the time to sort the contributions and make their action type
+and contributor categoricals, which the chart does once per data version.
+
+The sliding lottery factors are checked against the per window ones. The
+original chart returned PR Review's lottery factor as PR Comment's and the
+other way round; the sliding engine doesn't, so they're compared with those
+two series of the original exchanged.
+
+Usage, from the directory containing pages/:
+    python -m pages.utils.lottery_benchmark [<n_actions> [<years>]]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from .lottery_utils import cntrb_prolificacy_over_time
+
+# action types graphed, in the chart's column order.
+ACTIONS = ["Commit", "Issue Opened", "Issue Comment", "Issue Closed", "PR Opened", "PR Comment", "PR Review"]
+
+# the order the original returned them in, PR Review before PR Comment.
+ORIGINAL_ORDER = ["Commit", "Issue Opened", "Issue Comment", "Issue Closed", "PR Opened", "PR Review", "PR Comment"]
+
+# (threshold %, window width months, step size months), the chart's defaults first.
+SETTINGS = [(50, 6, 6), (95, 12, 1)]
+
+
+def synthetic_contributions(n_actions: int, years: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Returns:
+        pd.DataFrame: created_at, Action and cntrb_id of n_actions contributions over the last
+                        {years} years, as contributors_df_action_naming returns them. a few
+                        contributors make most of the contributions, some action types aren't graphed.
+    """
+    rng = np.random.default_rng(seed)
+    end = pd.Timestamp("2024-01-01", tz="UTC")
+    span = int(pd.Timedelta(days=365 * years).total_seconds())
+    n_cntrbs = max(1, n_actions // 50)
+
+    action_types = ACTIONS + ["PR Closed", "PR Merged"]
+    return pd.DataFrame(
+        {
+            "created_at": end - pd.to_timedelta(rng.integers(0, span, n_actions), unit="s"),
+            "Action": np.array(action_types, dtype=object)[rng.integers(0, len(action_types), n_actions)],
+            "cntrb_id": (rng.zipf(1.5, n_actions) % n_cntrbs).astype(str).astype(object),
+        }
+    )
+
+
+def windows(df: pd.DataFrame, window_width: int, step_size: int) -> pd.DataFrame:
+    # as the chart's process_data builds them.
+    period_from = pd.date_range(
+        start=df["created_at"].min(), end=df["created_at"].max(), freq=f"{step_size}m", inclusive="both"
+    )
+    df_final = period_from.to_frame(index=False, name="period_from")
+    df_final["period_to"] = df_final["period_from"] + pd.DateOffset(months=window_width)
+    return df_final
+
+
+def per_window(df: pd.DataFrame, df_final: pd.DataFrame, threshold: float) -> pd.DataFrame:
+    # the chart's original process_data, from its sorted contributions on.
+    df = df.sort_values(by="created_at", ascending=True)
+    df_final = df_final.copy()
+    (
+        df_final["Commit"],
+        df_final["Issue Opened"],
+        df_final["Issue Comment"],
+        df_final["Issue Closed"],
+        df_final["PR Opened"],
+        df_final["PR Comment"],
+        df_final["PR Review"],
+    ) = zip(
+        *df_final.apply(
+            lambda row: per_window_prolificacy(df, row.period_from, row.period_to, threshold),
+            axis=1,
+        )
+    )
+    return df_final
+
+
+def per_window_prolificacy(df, period_from, period_to, threshold):
+    time_mask = (df["created_at"] >= period_from) & (df["created_at"] <= period_to)
+    df_in_range = df.loc[time_mask]
+
+    df_count_cntrbs = df_in_range.groupby(["Action", "cntrb_id"])["cntrb_id"].count().to_frame()
+    df_count_cntrbs = df_count_cntrbs.rename(columns={"cntrb_id": "count"}).reset_index()
+    df_count_cntrbs = df_count_cntrbs.pivot(index="cntrb_id", columns="Action", values="count")
+
+    return tuple(per_window_lottery_factor(df_count_cntrbs, action, threshold) for action in ORIGINAL_ORDER)
+
+
+def per_window_lottery_factor(df, action_type, threshold):
+    if df.empty or action_type not in df.columns:
+        return None
+
+    df = df.sort_values(by=action_type, ascending=False)
+    thresh_cntrbs = df[action_type].sum() * threshold
+
+    mask = df.index.get_level_values("cntrb_id") == None
+    df = df[~mask]
+
+    lottery_factor = 0
+    running_sum = 0
+    for _, row in df.iterrows():
+        running_sum += row[action_type]
+        lottery_factor += 1
+        if running_sum >= thresh_cntrbs:
+            break
+
+    return lottery_factor
+
+
+def prepare(df: pd.DataFrame) -> pd.DataFrame:
+    # as the chart's contributions does.
+    df = df[df["created_at"].notna()].sort_values(by="created_at", ascending=True, ignore_index=True)
+    return df[["created_at", "Action", "cntrb_id"]].astype({"Action": "category", "cntrb_id": "category"})
+
+
+def _series(values) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def benchmark(n_actions: int, years: int) -> list[dict]:
+    """
+    Returns:
+        list[dict]: per setting- its threshold, window width and step size, number of windows,
+                    seconds of each approach, and whether the sliding lottery factors match
+                    the per window ones
+    """
+    df = synthetic_contributions(n_actions, years)
+
+    start = time.perf_counter()
+    contributions = prepare(df)
+    prepare_s = time.perf_counter() - start
+
+    results = []
+    for threshold, window_width, step_size in SETTINGS:
+        df_final = windows(df, window_width, step_size)
+
+        start = time.perf_counter()
+        expected = per_window(df, df_final, threshold / 100)
+        per_window_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lottery_factors = cntrb_prolificacy_over_time(
+            contributions, df_final["period_from"], df_final["period_to"], threshold / 100, ACTIONS
+        )
+        sliding_s = time.perf_counter() - start
+
+        # the original's PR Comment series is PR Review's lottery factor, and the other way round.
+        original = {"PR Comment": "PR Review", "PR Review": "PR Comment"}
+        matches = all(
+            np.array_equal(_series(lf), _series(expected[original.get(action, action)]), equal_nan=True)
+            for action, lf in zip(ACTIONS, lottery_factors)
+        )
+
+        results.append(
+            {
+                "setting": f"{threshold}% {window_width}m/{step_size}m",
+                "windows": len(df_final),
+                "prepare": prepare_s,
+                "per window": per_window_s,
+                "sliding": sliding_s,
+                "matches": matches,
+            }
+        )
+    return results
+
+
+def main(argv: list[str]) -> None:
+    n_actions = int(argv[0]) if len(argv) > 0 else 1_000_000
+    years = int(argv[1]) if len(argv) > 1 else 10
+
+    print(f"{n_actions} contributions over {years} years, in seconds")
+    print(
+        f"{'threshold width/step':<22}{'windows':>8}{'prepare':>10}{'per window':>12}{'sliding':>10}"
+        f"{'speedup':>10}{'matches':>10}"
+    )
+    for r in benchmark(n_actions, years):
+        print(
+            f"{r['setting']:<22}{r['windows']:>8}{r['prepare']:>10.3f}{r['per window']:>12.3f}{r['sliding']:>10.3f}"
+            f"{r['per window'] / r['sliding']:>9.0f}x{str(r['matches']):>10}"
+        )
+    print("matches: with the original's PR Comment and PR Review series exchanged, see the module docstring")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,101 @@
+"""
+Lottery factor of contributions over sliding windows of time, for the
+contributor importance over time chart. See lottery_benchmark.py for its
+comparison with the chart's original per-window calculation.
+"""
+import numpy as np
+import pandas as pd
+
+
+def cntrb_prolificacy_over_time(df, period_from, period_to, threshold, action_types):
+    """
+    Lottery factor of each action type in each window of time [period_from, period_to].
+
+    The number of contributions of each (action type, contributor) pair is kept
+    in one array. Windows move forward in time, so from one window to the next
+    only the contributions that left the window are subtracted and the ones
+    that entered it are added.
+
+    Args:
+    -----
+        df : Pandas Dataframe
+            contributions, see contributions
+
+        period_from, period_to : Pandas Series
+            start and end of each window, both in ascending order
+
+        threshold : float
+            fraction of the contributions of an action type
+
+        action_types : list of str
+            action types to calculate the lottery factor of
+
+    Returns:
+    --------
+        tuple: per action type in action_types, the lottery factor of each window, None if
+                there were no contributions of that type in the window
+    """
+    # position of each contribution's (action type, contributor) pair in the counts,
+    # contributions without a contributor or an action type aren't counted
+    action_codes = df["Action"].cat.codes.to_numpy(dtype=np.int64)
+    cntrb_codes = df["cntrb_id"].cat.codes.to_numpy(dtype=np.int64)
+    actions, cntrbs = df["Action"].cat.categories, df["cntrb_id"].cat.categories
+    pairs = np.where((action_codes >= 0) & (cntrb_codes >= 0), action_codes * len(cntrbs) + cntrb_codes, -1)
+
+    # contributions in each window, positions [lo, hi) of the sorted contributions
+    created = pd.DatetimeIndex(df["created_at"])
+    los = created.searchsorted(period_from, side="left")
+    his = created.searchsorted(period_to, side="right")
+
+    # pairs of uncounted contributions are dropped, keeping the positions of the others
+    counted = pairs >= 0
+    pairs = pairs[counted]
+    positions = np.cumsum(np.r_[0, counted])
+    los, his = positions[los], positions[his]
+
+    counts = np.zeros(len(actions) * len(cntrbs), dtype=np.int64)
+    lottery_factors = {action: [] for action in action_types}
+    prev_lo = prev_hi = 0
+    for lo, hi in zip(los, his):
+        # remove contributions before the window and add the new ones at its end
+        np.subtract.at(counts, pairs[prev_lo : min(lo, prev_hi)], 1)
+        np.add.at(counts, pairs[max(lo, prev_hi) : hi], 1)
+        prev_lo, prev_hi = lo, hi
+
+        for action in action_types:
+            lottery_factor = None
+            if action in actions:
+                a = actions.get_loc(action)
+                action_counts = counts[a * len(cntrbs) : (a + 1) * len(cntrbs)]
+                action_counts = action_counts[action_counts > 0]
+                if action_counts.size > 0:
+                    lottery_factor = calc_lottery_factor(action_counts, threshold)
+            lottery_factors[action].append(lottery_factor)
+
+    return tuple(lottery_factors[action] for action in action_types)
+
+
+def calc_lottery_factor(counts, threshold):
+    """
+    Fewest contributors whose contributions add up to threshold of all contributions.
+
+    Args:
+    -----
+        counts : numpy array
+            number of contributions of each contributor, all positive
+
+        threshold : float
+            fraction of the contributions, at most 1
+
+    Returns:
+    --------
+        int: lottery factor
+    """
+    # running sum of contributions, from the contributor with the most to the one with the least
+    running_sum = np.cumsum(np.sort(counts)[::-1])
+
+    # calculate the threshold amount of contributions
+    thresh_cntrbs = running_sum[-1] * threshold
+
+    # number of contributors until the running sum is greater than or equal to the threshold amount
+    return int(np.searchsorted(running_sum, thresh_cntrbs, side="left")) + 1
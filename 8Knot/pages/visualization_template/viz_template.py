@@ -195,14 +195,14 @@ def toggle_popover(n, is_open):
 )
 def NAME_OF_VISUALIZATION_graph(repolist, interval):
     # wait for data to asynchronously download and become available.
-    while not_cached := cf.get_uncached(func_name=QUERY_INITIALS.__name__, repolist=repolist):
-        logging.warning(f"{VIZ_ID}- WAITING ON DATA TO BECOME AVAILABLE")
-        time.sleep(0.5)
+    cf.wait_until_cached(func_name=QUERY_INITIALS.__name__, repolist=repolist)
 
     logging.warning(f"{VIZ_ID} - START")
     start = time.perf_counter()
 
     # GET ALL DATA FROM POSTGRES CACHE
+    # pass columns=[...] to read only the columns your visualization uses, and
+    # date_column/start_date/end_date to read only rows in the selected date range.
     df = cf.retrieve_from_cache(
         tablename=QUERY_INITIALS.__name__,
         repolist=repolist,
@@ -234,9 +234,8 @@ def process_data(df: pd.DataFrame, interval):
     The output of this function is the data you intend to create a visualization with,
     requiring no further processing."""
 
-    # convert to datetime objects rather than strings
-    # ADD ANY OTHER COLUMNS WITH DATETIME
-    df["COLUMN_WITH_DATETIME"] = pd.to_datetime(df["COLUMN_WITH_DATETIME"], utc=True)
+    # timestamp columns are stored as timestamptz in the cache, so they're already
+    # datetime64[ns, UTC] here- no pd.to_datetime needed.
 
     # order values chronologically by COLUMN_TO_SORT_BY date
     df = df.sort_values(by="COLUMN_TO_SORT_BY", axis=0, ascending=True)
@@ -1,7 +1,10 @@
+from datetime import timedelta
 import logging
 from app import celery_app
 import cache_manager.cache_facade as cf
 
+REFRESH_POLICY = cf.RefreshPolicy(ttl=timedelta(days=1), mode="append", time_column="created_at")
+
 
 @celery_app.task(
     bind=True,
@@ -66,6 +69,7 @@ def affiliation_query(self, repos):
         func_name=func_name,
         query=query_string,
         repolist=repos,
+        refresh_policy=REFRESH_POLICY,
     )
     """
     Old post-processing steps:
@@ -0,0 +1,33 @@
+import logging
+from app import celery_app
+import cache_manager.eviction as ev
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    exponential_backoff=2,
+    retry_kwargs={"max_retries": 5},
+    retry_jitter=True,
+)
+def cache_evict(self):
+    """
+    (Worker Query)
+    Evicts the least recently read repos' data from the cache once it's
+    over its size budget, see cache_manager/eviction.py. Scheduled
+    periodically by celery beat. Waits on the advisory lock of each
+    (cache_func, repo_id) it evicts, which queries hold while writing
+    that repo's rows. cache_bookkeeping is compacted afterwards.
+
+    Returns:
+    --------
+        dict: eviction counts and the cache's estimated size before and after,
+                and the bookkeeping compaction counts
+    """
+    logging.warning(f"{cache_evict.__name__} - START")
+
+    stats = ev.evict()
+    stats["bookkeeping"] = ev.compact_bookkeeping()
+
+    logging.warning(f"{cache_evict.__name__} - END")
+    return stats
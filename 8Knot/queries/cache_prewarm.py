@@ -0,0 +1,179 @@
+import os
+import logging
+import itertools
+import redis
+from app import celery_app, augur
+import cache_manager.cache_facade as cf
+from cache_manager.usage import UsageLog
+from cache_manager.cx_common import (
+    env_prewarm_repos,
+    env_prewarm_max_repos,
+    env_prewarm_batch,
+    env_prewarm_max_queued,
+)
+from queries.sharded_collection import dispatch_single_flight
+from queries.cache_refresh import refreshed_queries
+from pages.index.index_callbacks import QUERIES
+
+"""
+Users mostly explore the same repos and orgs from day to day, and the first
+user to select a repo waits for every query to collect it from Augur.
+The pre-warmer collects those repos ahead of time: the repos and orgs listed
+in CACHE_PREWARM_REPOS and the repos users selected recently, see
+cache_manager/usage.py.
+
+Only (query, repo) data that isn't cached, or is older than the query's
+REFRESH_POLICY ttl, is collected, in batches of CACHE_PREWARM_BATCH repos.
+Batches are only scheduled while the 'data' queue is short, so a pre-warm
+never holds up users' own collections; whatever's left is scheduled on
+the next run.
+
+cache_prewarm runs periodically from celery beat. To pre-warm by hand:
+    python -m cache_manager.prewarm [<repo_id or org> ...]
+"""
+
+
+def resolve_repos(names: list) -> list[int]:
+    """
+    Args:
+        names (list[int | str]): repo_ids and org names
+
+    Returns:
+        list[int]: unique repo_ids of the repos and orgs' repos, in the order given
+    """
+    repos = []
+    for name in names:
+        name = str(name).strip()
+        if not name:
+            continue
+        if name.isdigit():
+            repos.append(int(name))
+        elif augur.is_org(name):
+            repos.extend(augur.org_to_repos(name))
+        else:
+            logging.warning(f"PREWARM - UNKNOWN REPO OR ORG {name}")
+
+    return list(dict.fromkeys(repos))
+
+
+def prewarm_repos(names: list | None = None, recent: bool = True) -> list[int]:
+    """
+    Args:
+        names (list[int | str], optional): repo_ids and org names, CACHE_PREWARM_REPOS if None
+        recent (bool): include the repos users selected recently
+
+    Returns:
+        list[int]: repos to keep warm, the given ones first, then most recently selected first
+    """
+    if names is None:
+        names = env_prewarm_repos.split(",")
+    repos = resolve_repos(names)
+
+    if recent:
+        try:
+            repos.extend(UsageLog().recent(limit=env_prewarm_max_repos))
+        except redis.exceptions.RedisError as e:
+            logging.error(f"PREWARM - COULDN'T READ RECENT SELECTIONS: {e}")
+
+    return list(dict.fromkeys(repos))
+
+
+def plan_prewarm(repos: list[int], batch_size: int = env_prewarm_batch) -> list[tuple]:
+    """
+    Finds the (query, repo) data in QUERIES that isn't cached or is stale.
+
+    Args:
+        repos (list[int]): repos to keep warm, most important first
+        batch_size (int): most repos per batch
+
+    Returns:
+        list[tuple]: (query, [repo_id]) batches to collect, the first batch of
+                        every query first so that whole repos are warmed early
+    """
+    if not repos:
+        return []
+
+    policies = {f.__name__: policy for f, policy in refreshed_queries()}
+    uncached = cf.get_uncached_many([f.__name__ for f in QUERIES], repos)
+
+    batches = []
+    for f in QUERIES:
+        todo = set(uncached[f.__name__])
+        if f.__name__ in policies:
+            todo.update(cf.get_stale(f.__name__, policies[f.__name__].ttl, repos))
+
+        todo = [r for r in repos if r in todo]
+        batches.append([(f, todo[i : i + batch_size]) for i in range(0, len(todo), batch_size)])
+
+    # interleave the queries' batches.
+    return [b for b in itertools.chain.from_iterable(itertools.zip_longest(*batches)) if b is not None]
+
+
+def dispatch_prewarm(batches: list[tuple], max_batches: int) -> list[list[str]]:
+    """
+    Schedules up to max_batches batches from the front of batches, removing them.
+
+    Returns:
+        list[list[str]]: per scheduled batch, the ids of the jobs collecting it
+    """
+    jobs = []
+    while batches and len(jobs) < max_batches:
+        f, repos = batches.pop(0)
+        # repos that users' jobs are already collecting are left to them.
+        jobs.append(dispatch_single_flight(f, repos, cf.estimate_repo_rows(repos)))
+    return jobs
+
+
+def queued_jobs() -> int:
+    """
+    Returns:
+        int: number of jobs waiting on the 'data' queue
+    """
+    # the redis broker keeps each queue's messages in a list named after it.
+    broker = redis.StrictRedis(
+        host=os.getenv("REDIS_SERVICE_HOST", "redis-cache"),
+        port=os.getenv("REDIS_SERVICE_PORT", "6379"),
+        password=os.getenv("REDIS_PASSWORD", ""),
+    )
+    return broker.llen("data")
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    exponential_backoff=2,
+    retry_kwargs={"max_retries": 5},
+    retry_jitter=True,
+)
+def cache_prewarm(self):
+    """
+    (Worker Query)
+    Collects the data of the configured and recently selected repos that
+    isn't cached or is stale, scheduling batches only while fewer than
+    CACHE_PREWARM_MAX_QUEUED jobs are waiting on the 'data' queue.
+    Scheduled periodically by celery beat.
+
+    Returns:
+    --------
+        dict: number of repos kept warm, batches scheduled and batches left for the next run,
+                and the ids of the scheduled jobs
+    """
+    logging.warning(f"{cache_prewarm.__name__} - START")
+
+    repos = prewarm_repos()
+    batches = plan_prewarm(repos)
+    total = len(batches)
+
+    jobs = dispatch_prewarm(batches, max(0, env_prewarm_max_queued - queued_jobs()))
+
+    logging.warning(
+        f"{cache_prewarm.__name__} - {len(repos)} REPOS, {total} BATCHES TO COLLECT, "
+        f"{len(jobs)} DISPATCHED, {len(batches)} LEFT"
+    )
+    logging.warning(f"{cache_prewarm.__name__} - END")
+    return {
+        "repos": len(repos),
+        "dispatched": len(jobs),
+        "remaining": len(batches),
+        "jobs": [j for ids in jobs for j in ids],
+    }
@@ -0,0 +1,50 @@
+import logging
+import inspect
+from app import celery_app
+import cache_manager.cache_facade as cf
+from queries.sharded_collection import dispatch_single_flight
+from pages.index.index_callbacks import QUERIES
+
+
+def refreshed_queries() -> list[tuple]:
+    """
+    Returns:
+        list[tuple]: (query, refresh policy) of every query in index_callbacks.QUERIES,
+                        with the REFRESH_POLICY declared by the query's module
+    """
+    # f.run is the query function itself, f is celery's task wrapping it.
+    return [(f, inspect.getmodule(f.run).REFRESH_POLICY) for f in QUERIES]
+
+
+@celery_app.task(
+    bind=True,
+    autoretry_for=(Exception,),
+    exponential_backoff=2,
+    retry_kwargs={"max_retries": 5},
+    retry_jitter=True,
+)
+def cache_refresh(self):
+    """
+    (Worker Query)
+    Finds cached repos whose data is older than their query's REFRESH_POLICY ttl
+    and schedules that query for them. The query refreshes stale repos
+    as described by its policy. Scheduled periodically by celery beat.
+
+    Returns:
+    --------
+        list[str]: ids of the scheduled query jobs
+    """
+    logging.warning(f"{cache_refresh.__name__} - START")
+
+    jobs = []
+    for f, policy in refreshed_queries():
+        stale = cf.get_stale(func_name=f.__name__, ttl=policy.ttl)
+        if not stale:
+            continue
+
+        logging.warning(f"{cache_refresh.__name__} - DISPATCH {f.__name__} FOR {len(stale)} STALE REPOS")
+        # stale repos whose refresh is still queued from the last run aren't scheduled again.
+        jobs.extend(dispatch_single_flight(f, stale, cf.estimate_repo_rows(stale)))
+
+    logging.warning(f"{cache_refresh.__name__} - END")
+    return jobs
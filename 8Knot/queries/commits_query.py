@@ -1,7 +1,16 @@
+from datetime import timedelta
 import logging
 from app import celery_app
 import cache_manager.cache_facade as cf
 
+REFRESH_POLICY = cf.RefreshPolicy(
+    ttl=timedelta(days=1),
+    mode="append",
+    time_column="author_timestamp",
+    # commits can reach Augur long after they were authored, e.g. when a branch is merged.
+    lookback=timedelta(days=30),
+)
+
 
 @celery_app.task(
     bind=True,
@@ -61,6 +70,7 @@ def commits_query(self, repos):
         func_name=func_name,
         query=query_string,
         repolist=repos,
+        refresh_policy=REFRESH_POLICY,
     )
 
     """
@@ -1,7 +1,10 @@
+from datetime import timedelta
 import logging
 from app import celery_app
 import cache_manager.cache_facade as cf
 
+REFRESH_POLICY = cf.RefreshPolicy(ttl=timedelta(days=7))
+
 
 @celery_app.task(
     bind=True,
@@ -42,7 +45,7 @@ def pr_file_query(self, repos):
                 """
 
     func_name = pr_file_query.__name__
-    cf.caching_wrapper(func_name=func_name, query=query_string, repolist=repos)
+    cf.caching_wrapper(func_name=func_name, query=query_string, repolist=repos, refresh_policy=REFRESH_POLICY)
 
     logging.warning(f"{func_name} COLLECTION - END")
     return 0
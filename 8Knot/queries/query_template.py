@@ -1,3 +1,4 @@
+from datetime import timedelta
 import logging
 from app import celery_app
 import cache_manager.cache_facade as cf
@@ -15,7 +16,11 @@ TODO:
     your custom "NAME_query". e.g. if your query is "num_stars_query" the table should have the same name. Detailed instructions regarding
     creating a table are in the db_init.py file.
 (5) Update the docstring of the query to reflect the intention of the data being collected.
-(6) Delete this list when completed
+(6) Choose a REFRESH_POLICY: how long cached results stay fresh, and whether stale repos are queried
+    again in full (mode="replace", the default) or only for their newest rows (mode="append", for
+    append-only event data), see cache_facade.RefreshPolicy. 8Knot/queries/cache_refresh.py refreshes
+    every query in the QUERIES list from step (3) with its REFRESH_POLICY.
+(7) Delete this list when completed
 
 NOTE: Querying data from Augur is a Postgres->Postgres transaction. Any data transformations that will always
     apply to visualization using the same data should either:
@@ -28,6 +33,8 @@ NOTE: Querying data from Augur is a Postgres->Postgres transaction. Any data tra
         If you choose this path, PLEASE DOCUMENT this behavior.
 """
 
+REFRESH_POLICY = cf.RefreshPolicy(ttl=timedelta(days=1))
+
 
 @celery_app.task(
     bind=True,
@@ -71,6 +78,7 @@ def NAME_query(self, repos):
         func_name=func_name,
         query=query_string,
         repolist=repos,
+        refresh_policy=REFRESH_POLICY,
     )
 
     logging.warning(f"{NAME_query.__name__} COLLECTION - END")
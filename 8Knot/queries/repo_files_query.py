@@ -1,3 +1,4 @@
+from datetime import timedelta
 import logging
 import pandas as pd
 from db_manager.augur_manager import AugurManager
@@ -8,6 +9,8 @@ import datetime as dt
 from sqlalchemy.exc import SQLAlchemyError
 import cache_manager.cache_facade as cf
 
+REFRESH_POLICY = cf.RefreshPolicy(ttl=timedelta(days=7))
+
 
 @celery_app.task(
     bind=True,
@@ -66,7 +69,9 @@ def repo_files_query(self, repos):
                 """
 
     func_name = repo_files_query.__name__
-    cf.caching_wrapper(func_name=func_name, query=query_string, repolist=repos, n_repolist_uses=2)
+    cf.caching_wrapper(
+        func_name=func_name, query=query_string, repolist=repos, n_repolist_uses=2, refresh_policy=REFRESH_POLICY
+    )
 
     logging.warning(f"{func_name} COLLECTION - END")
     return 0
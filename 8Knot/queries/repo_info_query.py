@@ -1,7 +1,10 @@
+from datetime import timedelta
 import logging
 import cache_manager.cache_facade as cf
 from app import celery_app
 
+REFRESH_POLICY = cf.RefreshPolicy(ttl=timedelta(days=1))
+
 
 @celery_app.task(
     bind=True,
@@ -58,6 +61,8 @@ def repo_info_query(self, repos):
     func_name = repo_info_query.__name__
 
     # raises Exception on failure. Returns nothing.
-    cf.caching_wrapper(func_name=func_name, query=query_string, repolist=repos, n_repolist_uses=2)
+    cf.caching_wrapper(
+        func_name=func_name, query=query_string, repolist=repos, n_repolist_uses=2, refresh_policy=REFRESH_POLICY
+    )
 
     logging.warning(f"{repo_info_query.__name__} COLLECTION - END")
@@ -1,7 +1,10 @@
+from datetime import timedelta
 import logging
 import cache_manager.cache_facade as cf
 from app import celery_app
 
+REFRESH_POLICY = cf.RefreshPolicy(ttl=timedelta(days=7))
+
 
 @celery_app.task(
     bind=True,
@@ -50,6 +53,7 @@ def repo_languages_query(self, repos):
         func_name=func_name,
         query=query_string,
         repolist=repos,
+        refresh_policy=REFRESH_POLICY,
     )
 
     logging.warning(f"{repo_languages_query.__name__} COLLECTION - END")
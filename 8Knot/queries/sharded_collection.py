@@ -0,0 +1,176 @@
+import heapq
+import logging
+import math
+import redis
+from celery import chord
+from celery.result import AsyncResult
+from celery.utils import uuid
+from app import celery_app
+from cache_manager.cx_common import env_shard_rows, env_shard_max, env_inflight_lease
+from cache_manager.inflight import InflightRegistry
+
+"""
+Collecting a large selection, like a whole org, for a query in a single
+job runs one enormous query serially and can hit the celery task_time_limit.
+dispatch_collection splits such repolists into shards of about equal
+estimated size and runs each as its own query job, so that the shards
+are collected in parallel across the workers consuming the 'data' queue.
+Each shard is cached, and committed, on its own.
+
+dispatch_single_flight schedules a collection only for the repos that no
+other job is already collecting, see cache_manager/inflight.py, so that
+users exploring the same repos at the same time share the work. The
+job's leases are released by collection_complete once its rows are committed.
+"""
+
+
+def shard_repolist(repolist: list[int], estimates: dict[int, int], n_shards: int) -> list[list[int]]:
+    """
+    Splits repolist into n_shards lists of about equal total estimated rows.
+
+    Repos are placed largest first, each into the shard with the fewest
+    estimated rows so far.
+
+    Args:
+        repolist (list[int]): repos to split
+        estimates (dict[int, int]): repo_id -> estimated rows
+        n_shards (int): number of shards
+
+    Returns:
+        list[list[int]]: non-empty shards
+    """
+    # (estimated rows, shard index, repos)
+    shards = [(0, i, []) for i in range(n_shards)]
+    for repo in sorted(repolist, key=lambda r: estimates.get(r, 0), reverse=True):
+        rows, i, repos = heapq.heappop(shards)
+        repos.append(repo)
+        heapq.heappush(shards, (rows + estimates.get(repo, 0), i, repos))
+
+    return [repos for _, _, repos in sorted(shards, key=lambda s: s[1]) if repos]
+
+
+def dispatch_collection(query, repolist: list[int], estimates: dict[int, int], task_id: str = None):
+    """
+    Schedules query for repolist on the 'data' queue.
+
+    If the estimated rows for repolist exceed CACHE_SHARD_ROWS, the repolist
+    is split into up to CACHE_SHARD_MAX shards that are scheduled as a chord
+    of query jobs. collection_complete runs once every shard has been cached,
+    as the chord's callback, or linked to the single query job otherwise.
+
+    Args:
+        query (celery task): query from 'queries/' to run
+        repolist (list[int]): repos to collect
+        estimates (dict[int, int]): repo_id -> estimated rows, from cache_facade.estimate_repo_rows
+        task_id (str, optional): id for the returned job, generated if None.
+                                 collection_complete releases the repos' leases held by task_id.
+
+    Returns:
+        AsyncResult: the query job, or the chord callback if sharded
+    """
+    total = sum(estimates.get(r, 0) for r in repolist)
+    n_shards = 1
+    if env_shard_rows > 0:
+        n_shards = min(env_shard_max, len(repolist), math.ceil(total / env_shard_rows))
+
+    if n_shards <= 1:
+        complete = collection_complete.si(query.__name__, 1, repolist, task_id).set(queue="data")
+        return query.apply_async(args=[repolist], queue="data", task_id=task_id, link=complete)
+
+    shards = shard_repolist(repolist, estimates, n_shards)
+    logging.warning(f"{query.__name__} - DISPATCH {len(repolist)} REPOS IN {len(shards)} SHARDS, ~{total} ROWS")
+
+    header = [query.si(shard).set(queue="data") for shard in shards]
+    complete = collection_complete.si(query.__name__, len(shards), repolist, task_id).set(queue="data")
+    return chord(header)(complete, task_id=task_id)
+
+
+def dispatch_single_flight(query, repolist: list[int], estimates: dict[int, int]) -> list[str]:
+    """
+    Schedules query for the repos in repolist that no other job is collecting,
+    and returns the ids of every job that repolist's data depends on.
+
+    The new job's leases are released once it has cached its repos. Repos
+    leased to a job that has finished, but whose data is still wanted,
+    e.g. because the job failed, are taken over by the new job.
+    If Redis can't be reached the whole repolist is scheduled.
+
+    Args:
+        query (celery task): query from 'queries/' to run
+        repolist (list[int]): uncached repos to collect
+        estimates (dict[int, int]): repo_id -> estimated rows, from cache_facade.estimate_repo_rows
+
+    Returns:
+        list[str]: id of the scheduled job, if any, then the ids of the jobs already collecting repos
+    """
+    func_name = query.__name__
+    job_id = uuid()
+
+    try:
+        registry = InflightRegistry()
+        holders = registry.claim(func_name, repolist, job_id)
+
+        for holder in set(holders.values()) - {job_id}:
+            if not AsyncResult(holder).ready():
+                continue
+            leased = [r for r, h in holders.items() if h == holder]
+            for r in registry.reclaim(func_name, leased, holder, job_id):
+                holders[r] = job_id
+    except redis.exceptions.RedisError as e:
+        logging.error(f"{func_name} - INFLIGHT REGISTRY UNAVAILABLE, DISPATCHING ALL REPOS: {e}")
+        registry = None
+        holders = {r: job_id for r in repolist}
+
+    claimed = [r for r in repolist if holders[r] == job_id]
+    attached = sorted(set(holders.values()) - {job_id})
+    if attached:
+        logging.warning(
+            f"{func_name} - {len(repolist) - len(claimed)} REPOS ALREADY IN FLIGHT, ATTACHING TO {len(attached)} JOBS"
+        )
+
+    if not claimed:
+        return attached
+
+    try:
+        dispatch_collection(query, claimed, estimates, task_id=job_id)
+    except Exception:
+        # nothing will collect the claimed repos, let the next request claim them.
+        if registry is not None:
+            registry.release(func_name, claimed, job_id)
+        raise
+
+    return [job_id] + attached
+
+
+@celery_app.task
+def collection_complete(func_name: str, n_shards: int, repolist: list[int] = None, job_id: str = None):
+    """
+    (Worker Query)
+    Runs once every shard of a collection has been cached, and its rows committed.
+    Releases the leases job_id holds on repolist, so that a later request for
+    those repos, e.g. after they're evicted, schedules its own collection.
+
+    Leases of failed collections aren't released here, they're taken over by
+    the next request for their repos, or expire.
+
+    Args:
+    -----
+        func_name (str): name of the query
+        n_shards (int): number of shards collected
+        repolist (list[int], optional): repos collected
+        job_id (str, optional): id of the job holding the repos' leases
+
+    Returns:
+    --------
+        dict: name of the query and number of shards collected
+    """
+    if n_shards > 1:
+        logging.warning(f"{func_name} COLLECTION - ALL {n_shards} SHARDS COMPLETE")
+
+    if job_id is not None and repolist:
+        try:
+            InflightRegistry().release(func_name, repolist, job_id)
+        except redis.exceptions.RedisError as e:
+            logging.error(f"{func_name} - INFLIGHT LEASES NOT RELEASED, EXPIRING IN {env_inflight_lease}s: {e}")
+
+    return {"func": func_name, "shards": n_shards}
@@ -0,0 +1,12 @@
+"""
+Tests run from the 8Knot directory, `python -m pytest tests`, with the
+app's environment variables set. Modules that only need them to be
+defined, like cache_manager.cx_common, get placeholders otherwise.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+for var in ["AUGUR_USERNAME", "AUGUR_PASSWORD", "AUGUR_HOST", "AUGUR_PORT", "AUGUR_DATABASE", "AUGUR_SCHEMA"]:
+    os.environ.setdefault(var, "")
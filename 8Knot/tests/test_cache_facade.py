@@ -0,0 +1,53 @@
+import pyarrow as pa
+import cache_manager.cache_facade as cf
+
+
+class _EmptyHotTier:
+    """
+    Hot tier without any blobs, that records the blobs written to it.
+    """
+
+    def __init__(self):
+        self.written = {}
+
+    def getm(self, func, versions):
+        return {}
+
+    def setm(self, func, tables):
+        self.written.update(tables)
+
+
+def _cold_read(monkeypatch, read_spec):
+    """
+    Reads two repos through the hot tier path with nothing in Redis,
+    returns the SELECTs sent to Postgres and the hot tier.
+    """
+    selects = []
+
+    def read_copy_table(cache_conn, tablename, select, select_vars):
+        selects.append((select, select_vars))
+        return pa.table({"repo_id": pa.array([], pa.int64())})
+
+    hot_tier = _EmptyHotTier()
+    monkeypatch.setattr(cf, "_hot_tier", hot_tier)
+    monkeypatch.setattr(cf, "_read_copy_table", read_copy_table)
+    cf._retrieve_hot(None, "prs_query", {1: "v1", 2: "v2"}, read_spec)
+    return selects, hot_tier
+
+
+def test_cold_projected_read_selects_requested_columns(monkeypatch):
+    read_spec = (("repo_id", "created_at"), "created_at", "2023-01-01", None)
+    selects, hot_tier = _cold_read(monkeypatch, read_spec)
+
+    assert selects == [
+        cf._select_from_cache("prs_query", [1, 2], ["repo_id", "created_at"], "created_at", "2023-01-01", None)
+    ]
+    # blobs hold whole repos, a projection can't be written as one.
+    assert hot_tier.written == {}
+
+
+def test_cold_full_read_fills_hot_tier(monkeypatch):
+    selects, hot_tier = _cold_read(monkeypatch, (None, None, None, None))
+
+    assert selects == [cf._select_from_cache("prs_query", [1, 2], None, None, None, None)]
+    assert sorted(hot_tier.written) == [1, 2]
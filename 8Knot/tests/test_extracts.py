@@ -0,0 +1,210 @@
+"""
+Checks that each extract group member's SELECT, see cache_manager/extracts.py,
+returns the same rows as its query in 'queries/' on fixture Augur data.
+
+Needs the cache db, CACHE_HOST and friends, and is skipped without it.
+The fixture Augur tables are temporary, nothing is written to the cache.
+"""
+import ast
+import glob
+import os
+from collections import Counter
+import psycopg2 as pg
+import pytest
+from cache_manager.cx_common import cache_cx_string
+from cache_manager.extracts import EXTRACTS
+import cache_manager.cache_facade as cf
+
+_QUERIES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "queries")
+
+# the Augur relations the queries read, and the fixture rows in them.
+_FIXTURES = [
+    """
+    CREATE TEMPORARY TABLE repo (repo_id bigint, repo_name text)
+    """,
+    """
+    INSERT INTO repo VALUES (1, 'one'), (2, 'two'), (3, 'three')
+    """,
+    """
+    CREATE TEMPORARY TABLE pull_requests (
+        pull_request_id bigint,
+        repo_id bigint,
+        pr_src_number bigint,
+        pr_augur_contributor_id uuid,
+        pr_created_at timestamp,
+        pr_closed_at timestamp,
+        pr_merged_at timestamp
+    )
+    """,
+    # every 7th PR is still open, every 5th was merged, the last of each repo is created in the future.
+    """
+    INSERT INTO pull_requests
+    SELECT
+        r * 100 + i,
+        r,
+        i,
+        md5((i % 4)::text)::uuid,
+        created,
+        CASE WHEN i % 7 = 0 THEN NULL ELSE created + interval '2 days' END,
+        CASE WHEN i % 5 = 0 THEN created + interval '2 days' END
+    FROM generate_series(1, 3) AS r, generate_series(1, 30) AS i,
+        LATERAL (
+            SELECT CASE WHEN i = 30 THEN now()::timestamp + interval '1 day'
+                ELSE timestamp '2023-01-01' + (i % 12) * interval '9 days' END AS created
+        ) AS c
+    """,
+    """
+    CREATE TEMPORARY TABLE pull_request_files (pull_request_id bigint, pr_file_path text)
+    """,
+    # PRs without files, files touched by several PRs.
+    """
+    INSERT INTO pull_request_files
+    SELECT pr.pull_request_id, 'src/file_' || f || '.py'
+    FROM pull_requests pr, generate_series(1, 3) AS f
+    WHERE (pr.pr_src_number + f) % 3 <> 0 AND pr.pr_src_number % 6 <> 0
+    """,
+    """
+    CREATE TEMPORARY TABLE pull_request_reviews (pull_request_id bigint, cntrb_id uuid)
+    """,
+    # PRs without reviews, reviewers reviewing one PR more than once.
+    """
+    INSERT INTO pull_request_reviews
+    SELECT pr.pull_request_id, md5((v % 3 + 10)::text)::uuid
+    FROM pull_requests pr, generate_series(1, 3) AS v
+    WHERE pr.pr_src_number % 4 <> 0
+    """,
+    """
+    CREATE TEMPORARY TABLE explorer_contributor_actions (
+        repo_id bigint,
+        repo_name text,
+        cntrb_id uuid,
+        created_at timestamptz,
+        login text,
+        action text,
+        rank bigint
+    )
+    """,
+    # one action of each repo is in the future.
+    """
+    INSERT INTO explorer_contributor_actions
+    SELECT
+        r,
+        'repo_' || r,
+        md5((i % 6)::text)::uuid,
+        CASE WHEN i = 20 THEN now() + interval '1 day'
+            ELSE timestamptz '2023-01-01 12:00+02' + i * interval '3 days' END,
+        'login_' || (i % 6),
+        (ARRAY['commit', 'issue_opened', 'pull_request_open'])[i % 3 + 1],
+        i
+    FROM generate_series(1, 3) AS r, generate_series(1, 20) AS i
+    """,
+    """
+    CREATE TEMPORARY TABLE contributors (cntrb_id uuid, cntrb_company text)
+    """,
+    """
+    INSERT INTO contributors
+    SELECT md5(c::text)::uuid, CASE WHEN c % 2 = 0 THEN 'company_' || c END
+    FROM generate_series(0, 5) AS c
+    """,
+    """
+    CREATE TEMPORARY TABLE contributors_aliases (cntrb_id uuid, alias_email text)
+    """,
+    # contributors without aliases, contributors with several.
+    """
+    INSERT INTO contributors_aliases
+    SELECT md5(c::text)::uuid, 'alias_' || a || '@' || c || '.example'
+    FROM generate_series(0, 4) AS c, generate_series(1, 3) AS a
+    WHERE a <= c % 3 + 1 AND c <> 3
+    """,
+]
+
+# repos collected, repo 3 is in the fixtures but not selected.
+_REPOS = (1, 2)
+
+# member -> column of the rows' order, for the queries that order them.
+_ORDERED_BY = {"affiliation_query": "created_at", "prs_query": "created"}
+
+
+def _query_string(member: str) -> str:
+    """
+    Finds the query_string of the query task named member in 'queries/'.
+    The modules import the celery app, so they're read rather than imported.
+    """
+    for path in glob.glob(os.path.join(_QUERIES_DIR, "*.py")):
+        with open(path) as f:
+            module = ast.parse(f.read())
+        for node in ast.walk(module):
+            if not (isinstance(node, ast.FunctionDef) and node.name == member):
+                continue
+            for stmt in ast.walk(node):
+                if isinstance(stmt, ast.Assign) and [t.id for t in stmt.targets] == ["query_string"]:
+                    # some are f-strings without any placeholders.
+                    value = stmt.value.values[0] if isinstance(stmt.value, ast.JoinedStr) else stmt.value
+                    return value.value
+    raise LookupError(f"no query_string for {member} in {_QUERIES_DIR}")
+
+
+@pytest.fixture
+def connections():
+    """
+    Yields (augur_conn, cache_conn), with the fixture Augur tables on augur_conn.
+    """
+    try:
+        augur_conn = pg.connect(cache_cx_string)
+        cache_conn = pg.connect(cache_cx_string)
+    except pg.OperationalError as e:
+        pytest.skip(f"cache db unavailable: {e}")
+
+    with augur_conn.cursor() as augur_cur:
+        for statement in _FIXTURES:
+            augur_cur.execute(statement)
+    try:
+        yield augur_conn, cache_conn
+    finally:
+        # temporary tables are dropped with the sessions.
+        augur_conn.close()
+        cache_conn.close()
+
+
+def _fetch(conn, query: str, vars: tuple) -> tuple[list[str], list[tuple]]:
+    with conn.cursor() as cur:
+        cur.execute(query, vars)
+        return [desc.name for desc in cur.description], cur.fetchall()
+
+
+def _extract(augur_conn, cache_conn, group: str, member: str) -> tuple[list[str], list[tuple]]:
+    """
+    Stages group's base and member's lookups as _extract_group does, then runs member's SELECT.
+    """
+    spec = EXTRACTS[group]
+    cf._stage_extract(augur_conn, cache_conn, f"extract_{group}", spec["base"], (_REPOS,))
+
+    for lookup in spec["members"][member]["lookups"]:
+        lookup_spec = spec["lookups"][lookup]
+        _, keys = _fetch(
+            cache_conn,
+            f"SELECT DISTINCT b.{lookup_spec['key']}::text FROM extract_{group} b WHERE b.repo_id IN %s",
+            (_REPOS,),
+        )
+        cf._stage_extract(augur_conn, cache_conn, f"extract_{lookup}", lookup_spec, ([k for k, in keys],))
+
+    return _fetch(cache_conn, spec["members"][member]["select"], (_REPOS,))
+
+
+@pytest.mark.parametrize(
+    "group, member",
+    [(group, member) for group, spec in EXTRACTS.items() for member in spec["members"]],
+)
+def test_member_select_matches_query(connections, group, member):
+    augur_conn, cache_conn = connections
+
+    columns, rows = _fetch(augur_conn, _query_string(member), (_REPOS,))
+    extract_columns, extract_rows = _extract(augur_conn, cache_conn, group, member)
+
+    assert rows, f"fixtures have no {member} rows"
+    assert extract_columns == columns
+    assert Counter(extract_rows) == Counter(rows)
+
+    if member in _ORDERED_BY:
+        i = columns.index(_ORDERED_BY[member])
+        assert [row[i] for row in extract_rows] == [row[i] for row in rows]